@@ -0,0 +1,47 @@
+#ifndef MB_SAMPLER_HPP_
+#define MB_SAMPLER_HPP_
+
+#include <esp_timer.h>
+
+#include <cstdint>
+
+#include "freertos/FreeRTOS.h"
+#include "freertos/queue.h"
+#include "freertos/task.h"
+#include "mpu9250.hpp"
+#include "telemetry.hpp"
+
+namespace mb {
+
+// Reads the IMU at a fixed rate into a queue of timestamped frames. A periodic
+// esp_timer wakes the sampling task, which does the I2C read, so that the rate
+// does not depend on the time taken to send the samples.
+class Sampler {
+ public:
+  Sampler(const char* tag, MPU9250* mpu, uint32_t rateHz, size_t queueLength);
+
+  int Start();
+
+  QueueHandle_t Queue() const { return queue_; }
+
+  // Samples not queued because the uploader fell behind; their sequence
+  // numbers are skipped, so that the twin counts them as lost.
+  uint32_t Dropped() const { return dropped_; }
+
+ private:
+  static void OnTimer(void* arg);
+  static void Task(void* arg);
+
+  const char* tag_{};
+  MPU9250* mpu_{};
+  uint32_t periodUs_{};
+  QueueHandle_t queue_{};
+  TaskHandle_t task_{};
+  esp_timer_handle_t timer_{};
+  uint32_t seq_{0};
+  uint32_t dropped_{0};
+};
+
+}  // namespace mb
+
+#endif  // MB_SAMPLER_HPP_
@@ -0,0 +1,53 @@
+#ifndef MB_TELEMETRY_HPP_
+#define MB_TELEMETRY_HPP_
+
+#include <lwip/sockets.h>
+
+#include <cstdint>
+
+#include "mpu9250.hpp"
+
+namespace mb {
+
+// One IMU sample on the wire, little-endian as on the ESP32. The twin parses
+// it as receiver.IMU_FRAME, which must stay in sync with this layout.
+struct __attribute__((packed)) ImuFrame {
+  uint16_t magic;         // kMagic
+  uint8_t version;        // kVersion
+  uint8_t flags;          // reserved, 0
+  uint32_t seq;           // incremented per frame, to count the lost ones
+  uint64_t timestampUs;   // esp_timer_get_time() at the read
+  float ax, ay, az;       // m/s²
+  float gx, gy, gz;       // rad/s
+};
+static_assert(sizeof(ImuFrame) == 40, "ImuFrame layout changed");
+
+ImuFrame MakeImuFrame(uint32_t seq, int64_t timestampUs,
+                      const MPU9250::SI& data);
+
+// Direct telemetry to the twin over UDP on the LAN, one datagram per sample,
+// without TLS nor the cloud round trip of Firebase::Send.
+class Telemetry {
+ public:
+  static constexpr uint16_t kMagic = 0x424D;  // "MB"
+  static constexpr uint8_t kVersion = 1;
+
+  Telemetry(const char* tag, const char* host, uint16_t port);
+
+  ~Telemetry();
+
+  int Open();
+
+  void Send(const ImuFrame& frame);
+
+ private:
+  const char* tag_{};
+  const char* host_{};
+  uint16_t port_{};
+  int sock_{-1};
+  sockaddr_in dest_{};
+};
+
+}  // namespace mb
+
+#endif  // MB_TELEMETRY_HPP_
@@ -0,0 +1,46 @@
+#ifndef MB_UPLOADER_HPP_
+#define MB_UPLOADER_HPP_
+
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+
+#include "firebase.hpp"
+#include "freertos/FreeRTOS.h"
+#include "freertos/queue.h"
+#include "telemetry.hpp"
+
+namespace mb {
+
+// Takes the sampled frames from the queue and uploads them in batches of up
+// to batchSize, or of what arrived within maxDelayMs of the first frame.
+// Through Firebase, a batch is one PUT of {"seq", "n", "frames"} to /batch,
+// with the frames as a base64 block of ImuFrame; through UDP telemetry, each
+// frame is still its own datagram.
+class Uploader {
+ public:
+  Uploader(const char* tag, QueueHandle_t queue, size_t batchSize,
+           uint32_t maxDelayMs, Firebase* rtdb, Telemetry* telemetry);
+
+  int Start();
+
+ private:
+  static void Task(void* arg);
+
+  void Upload(size_t n);
+
+  const char* tag_{};
+  QueueHandle_t queue_{};
+  size_t batchSize_{};
+  uint32_t maxDelayMs_{};
+  Firebase* rtdb_{};
+  Telemetry* telemetry_{};
+
+  std::unique_ptr<ImuFrame[]> frames_;
+  std::unique_ptr<char[]> payload_;
+  size_t payloadSize_{};
+};
+
+}  // namespace mb
+
+#endif  // MB_UPLOADER_HPP_
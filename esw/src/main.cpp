@@ -1,3 +1,5 @@
+#include <cstring>
+
 #include "driver/i2c.h"
 #include "esp_err.h"
 #include "esp_event.h"
@@ -11,15 +13,30 @@
 #include "freertos/task.h"
 #include "mpu9250.hpp"
 #include "nvs_flash.h"
+#include "sampler.hpp"
+#include "telemetry.hpp"
+#include "uploader.hpp"
 #include "wifi.hpp"
 
 const char* WifiSsid = CONFIG_WIFI_SSID;
 const char* WifiPass = CONFIG_WIFI_PASSWORD;
 const char* FirebaseHost = CONFIG_FIREBASE_HOST;
 const char* FirebaseApiKey = CONFIG_FIREBASE_API_KEY;
+const char* TelemetryHost = CONFIG_TELEMETRY_HOST;
+const uint16_t TelemetryPort = CONFIG_TELEMETRY_PORT;
+
+// The IMU is read at a fixed rate, and the samples uploaded in batches of up to
+// BatchSize, or of BatchDelayMs worth, whichever is first
+constexpr uint32_t SampleRateHz = 500;
+constexpr size_t SampleQueueLength = 256;
+constexpr size_t BatchSize = 50;
+constexpr uint32_t BatchDelayMs = 100;
 
 mb::Firebase* pRtdb = nullptr;
+mb::Telemetry* pTelemetry = nullptr;
 mb::MPU9250* pMpu = nullptr;
+mb::Sampler* pSampler = nullptr;
+mb::Uploader* pUploader = nullptr;
 
 int initializeNvs() {
   esp_err_t err = nvs_flash_init();
@@ -38,51 +55,19 @@ int initializeWifi() {
   return ESP_OK;
 }
 
-void processData() {
-  const char* tag = "app_process_data";
-
-  // Read data
-  mb::MPU9250::SI data;
-  if (pMpu->readSI(data) == ESP_OK) {
-    ESP_LOGI(tag,
-             "Accel [m/s²]: X=%.2f  Y=%.2f  Z=%.2f | "
-             "Gyro  [rad/s]: X=%.3f  Y=%.3f  Z=%.3f",
-             data.ax, data.ay, data.az, data.gx, data.gy, data.gz);
-  } else {
-    ESP_LOGE(tag, "Read failed");
-  }
-
-  // Send data
-  char payload[128];
-  int len = snprintf(payload, sizeof(payload),
-                     "{"
-                     "\"xdd\":{"
-                     "\"x\":%.2f,"
-                     "\"y\":%.2f,"
-                     "\"z\":%.2f"
-                     "},"
-                     "\"gd\":{"
-                     "\"x\":%.3f,"
-                     "\"y\":%.3f,"
-                     "\"z\":%.3f"
-                     "}"
-                     "}",
-                     data.ax, data.ay, data.az, data.gx, data.gy, data.gz);
-  if (len < 0 || len >= static_cast<int>(sizeof(payload))) {
-    ESP_LOGE(tag, "JSON payload truncated");
-  } else {
-    pRtdb->Send("raw", payload);
-  }
-}
-
 extern "C" void app_main(void) {
   const char* tag = "app";
   ESP_ERROR_CHECK(initializeNvs());
   ESP_ERROR_CHECK(initializeWifi());
 
-  // Firebase RTDB setup
-  pRtdb = new mb::Firebase("RTDB", FirebaseApiKey, FirebaseHost);
-  ESP_ERROR_CHECK(pRtdb->SignInAnonymously());
+  // UDP telemetry when a twin address is configured, Firebase RTDB otherwise
+  if (strlen(TelemetryHost) > 0) {
+    pTelemetry = new mb::Telemetry("TELEMETRY", TelemetryHost, TelemetryPort);
+    ESP_ERROR_CHECK(pTelemetry->Open());
+  } else {
+    pRtdb = new mb::Firebase("RTDB", FirebaseApiKey, FirebaseHost);
+    ESP_ERROR_CHECK(pRtdb->SignInAnonymously());
+  }
 
   // MPU9250 setup
   mb::MPU9250::AxisMap MpuAxisMap[3] = {
@@ -97,15 +82,10 @@ extern "C" void app_main(void) {
     return;
   }
 
-  xTaskCreatePinnedToCore(
-      [](void*) {
-        while (true) processData();
-        vTaskDelete(nullptr);  // Clean exit
-      },
-      "main_task_worker",
-      8192,  // stack size in bytes
-      nullptr,
-      5,  // priority
-      nullptr,
-      1);  // core 1 (or 0)
+  pSampler = new mb::Sampler("SAMPLER", pMpu, SampleRateHz, SampleQueueLength);
+  pUploader = new mb::Uploader("UPLOADER", pSampler->Queue(),
+                               pTelemetry ? 1 : BatchSize, BatchDelayMs, pRtdb,
+                               pTelemetry);
+  ESP_ERROR_CHECK(pUploader->Start());
+  ESP_ERROR_CHECK(pSampler->Start());
 }
\ No newline at end of file
@@ -0,0 +1,63 @@
+#include "sampler.hpp"
+
+#include <esp_log.h>
+#include <esp_timer.h>
+
+namespace mb {
+
+Sampler::Sampler(const char* tag, MPU9250* mpu, const uint32_t rateHz,
+                 const size_t queueLength)
+    : tag_{tag}, mpu_{mpu}, periodUs_{1000000 / rateHz} {
+  queue_ = xQueueCreate(queueLength, sizeof(ImuFrame));
+}
+
+int Sampler::Start() {
+  if (!queue_) {
+    ESP_LOGE(tag_, "Unable to create the sample queue.");
+    return ESP_FAIL;
+  }
+
+  // Above the uploader, so that a slow request never delays a read
+  if (xTaskCreatePinnedToCore(&Sampler::Task, "imu_sampler", 4096, this, 10,
+                              &task_, 1) != pdPASS) {
+    ESP_LOGE(tag_, "Unable to create the sampling task.");
+    return ESP_FAIL;
+  }
+
+  esp_timer_create_args_t args = {};
+  args.callback = &Sampler::OnTimer;
+  args.arg = this;
+  args.name = "imu_sampler";
+  ESP_ERROR_CHECK(esp_timer_create(&args, &timer_));
+  ESP_ERROR_CHECK(esp_timer_start_periodic(timer_, periodUs_));
+
+  ESP_LOGI(tag_, "Sampling every %lu us.", periodUs_);
+  return ESP_OK;
+}
+
+void Sampler::OnTimer(void* arg) {
+  auto* self = static_cast<Sampler*>(arg);
+  xTaskNotifyGive(self->task_);
+}
+
+void Sampler::Task(void* arg) {
+  auto* self = static_cast<Sampler*>(arg);
+
+  while (true) {
+    ulTaskNotifyTake(pdTRUE, portMAX_DELAY);
+
+    const int64_t timestampUs = esp_timer_get_time();
+    MPU9250::SI data;
+    if (self->mpu_->readSI(data) != ESP_OK) {
+      ESP_LOGE(self->tag_, "Read failed");
+      continue;
+    }
+
+    const ImuFrame frame = MakeImuFrame(self->seq_++, timestampUs, data);
+    if (xQueueSend(self->queue_, &frame, 0) != pdTRUE) {
+      self->dropped_++;
+    }
+  }
+}
+
+}  // namespace mb
@@ -0,0 +1,64 @@
+#include "telemetry.hpp"
+
+#include <esp_log.h>
+#include <lwip/inet.h>
+#include <lwip/sockets.h>
+
+#include <cstring>
+
+namespace mb {
+
+ImuFrame MakeImuFrame(const uint32_t seq, const int64_t timestampUs,
+                      const MPU9250::SI& data) {
+  ImuFrame frame{};
+  frame.magic = Telemetry::kMagic;
+  frame.version = Telemetry::kVersion;
+  frame.seq = seq;
+  frame.timestampUs = static_cast<uint64_t>(timestampUs);
+  frame.ax = data.ax;
+  frame.ay = data.ay;
+  frame.az = data.az;
+  frame.gx = data.gx;
+  frame.gy = data.gy;
+  frame.gz = data.gz;
+  return frame;
+}
+
+Telemetry::Telemetry(const char* tag, const char* host, const uint16_t port)
+    : tag_{tag}, host_{host}, port_{port} {}
+
+Telemetry::~Telemetry() {
+  if (sock_ >= 0) close(sock_);
+}
+
+int Telemetry::Open() {
+  dest_.sin_family = AF_INET;
+  dest_.sin_port = htons(port_);
+  if (inet_pton(AF_INET, host_, &dest_.sin_addr) != 1) {
+    ESP_LOGE(tag_, "Invalid telemetry host %s.", host_);
+    return ESP_FAIL;
+  }
+
+  sock_ = socket(AF_INET, SOCK_DGRAM, IPPROTO_IP);
+  if (sock_ < 0) {
+    ESP_LOGE(tag_, "Unable to create socket: errno %d", errno);
+    return ESP_FAIL;
+  }
+
+  ESP_LOGI(tag_, "Sending telemetry to %s:%u.", host_, port_);
+  return ESP_OK;
+}
+
+void Telemetry::Send(const ImuFrame& frame) {
+  if (sock_ < 0) return;
+
+  // A lost datagram is only counted by the twin, from the sequence numbers
+  const int err = sendto(sock_, &frame, sizeof(frame), 0,
+                         reinterpret_cast<const sockaddr*>(&dest_),
+                         sizeof(dest_));
+  if (err < 0) {
+    ESP_LOGW(tag_, "Send failed: errno %d", errno);
+  }
+}
+
+}  // namespace mb
@@ -0,0 +1,97 @@
+#include "uploader.hpp"
+
+#include <esp_log.h>
+#include <mbedtls/base64.h>
+
+#include <cstdio>
+
+#include "freertos/task.h"
+
+namespace mb {
+
+Uploader::Uploader(const char* tag, QueueHandle_t queue,
+                   const size_t batchSize, const uint32_t maxDelayMs,
+                   Firebase* rtdb, Telemetry* telemetry)
+    : tag_{tag},
+      queue_{queue},
+      batchSize_{batchSize},
+      maxDelayMs_{maxDelayMs},
+      rtdb_{rtdb},
+      telemetry_{telemetry} {
+  frames_ = std::make_unique<ImuFrame[]>(batchSize_);
+
+  // The JSON envelope, and the base64 block of 4 characters per 3 bytes
+  payloadSize_ = 64 + 4 * ((batchSize_ * sizeof(ImuFrame) + 2) / 3) + 1;
+  payload_ = std::make_unique<char[]>(payloadSize_);
+}
+
+int Uploader::Start() {
+  if (xTaskCreatePinnedToCore(&Uploader::Task, "imu_uploader", 8192, this, 5,
+                              nullptr, 1) != pdPASS) {
+    ESP_LOGE(tag_, "Unable to create the upload task.");
+    return ESP_FAIL;
+  }
+  return ESP_OK;
+}
+
+void Uploader::Task(void* arg) {
+  auto* self = static_cast<Uploader*>(arg);
+
+  while (true) {
+    // The first frame of a batch is awaited without limit, the next ones up
+    // to the batch deadline
+    if (xQueueReceive(self->queue_, &self->frames_[0], portMAX_DELAY) !=
+        pdTRUE)
+      continue;
+    size_t n = 1;
+
+    const TickType_t start = xTaskGetTickCount();
+    const TickType_t maxDelay = pdMS_TO_TICKS(self->maxDelayMs_);
+    while (n < self->batchSize_) {
+      const TickType_t elapsed = xTaskGetTickCount() - start;
+      if (elapsed >= maxDelay) break;
+      if (xQueueReceive(self->queue_, &self->frames_[n], maxDelay - elapsed) !=
+          pdTRUE)
+        break;
+      n++;
+    }
+
+    self->Upload(n);
+  }
+}
+
+void Uploader::Upload(const size_t n) {
+  if (telemetry_) {
+    for (size_t i = 0; i < n; i++) telemetry_->Send(frames_[i]);
+    return;
+  }
+  if (!rtdb_) return;
+
+  int len = snprintf(payload_.get(), payloadSize_,
+                     "{\"seq\":%lu,\"n\":%u,\"frames\":\"",
+                     static_cast<unsigned long>(frames_[0].seq),
+                     static_cast<unsigned>(n));
+
+  size_t encoded = 0;
+  if (mbedtls_base64_encode(
+          reinterpret_cast<unsigned char*>(payload_.get() + len),
+          payloadSize_ - len, &encoded,
+          reinterpret_cast<const unsigned char*>(frames_.get()),
+          n * sizeof(ImuFrame)) != 0) {
+    ESP_LOGE(tag_, "Batch payload truncated");
+    return;
+  }
+  len += encoded;
+
+  if (len + 3 > static_cast<int>(payloadSize_)) {
+    ESP_LOGE(tag_, "Batch payload truncated");
+    return;
+  }
+  payload_[len++] = '"';
+  payload_[len++] = '}';
+  payload_[len] = '\0';
+
+  rtdb_->Send("batch", payload_.get());
+}
+
+}  // namespace mb
@@ -1 +1 @@
-from .solver import Solver, SolverOde, SolverLcp
+from .solver import ModelParams, Solver, SolverOde, SolverLcp
@@ -0,0 +1,308 @@
+import dataclasses
+import importlib.util
+import time
+import numpy as np
+
+import kernels
+import reference
+import solver as sv
+
+
+dof = 5
+
+
+def drop_scenario():
+    """
+    Cart released above the ground with the pole tilted and spinning wheels, so that both the wheel-ground and the
+    tip-ground constraints are activated during the run.
+    """
+    t_span = (0.0, 2.0)
+
+    f0 = np.zeros(2 * dof)
+    f0[4] = 5.0e-2
+    f0[6] = 3.0e-1
+
+    fv = [1.0, -1.0]
+    dt = 1.0e-3
+
+    return t_span, f0, fv, dt
+
+
+def balance_scenario():
+    """
+    The 10 s scenario of test.py: the pole released almost upright with the wheels stopped.
+    """
+    t_span = (0.0, 10.0)
+
+    f0 = np.zeros(2 * dof)
+    f0[6] = 1.0e-8
+
+    fv = [0.0, 0.0]
+
+    return t_span, f0, fv
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return time.perf_counter() - t0, out
+
+
+def bench_lcp(n_samples=2000, seed=0):
+    print("LCP solver")
+
+    # Contact LCPs built from the model at random states, checked against quadprog
+    rng = np.random.default_rng(seed)
+    solver = sv.SolverLcp(dof)
+    fq = rng.normal(size=(n_samples, 2 * dof))
+    fv = rng.normal(size=(n_samples, 2))
+    M = solver.fn_M_batch(0.0, fq, fv)
+    J = solver.fn_Cons_gradq_batch(0.0, fq, fv)
+    A = J @ np.linalg.solve(M, J.transpose(0, 2, 1))
+    b = rng.normal(size=(n_samples, 2))
+
+    err = 0.0
+    for k in range(n_samples):
+        for act in ([0], [1], [0, 1]):
+            lam_enum = sv.SolverLcp.solve_lcp_enum(A[k][np.ix_(act, act)], b[k, act])
+            lam_qp = sv.SolverLcp.solve_lcp_qp(A[k][np.ix_(act, act)], b[k, act])
+            err = max(err, np.max(np.abs(lam_enum - lam_qp)) / max(1.0, np.max(np.abs(lam_qp))))
+    print(f"  max relative |λ_enum - λ_qp|: {err:.3e}")
+    assert err < 1.0e-6
+
+    # Steps per second on the drop-and-contact scenario
+    t_span, f0, fv, dt = drop_scenario()
+    n_steps = int((t_span[1] - t_span[0]) / dt)
+
+    sol = {}
+    for method in ('qp', 'enum'):
+        wall, (_, sol[method]) = timed(sv.SolverLcp(dof, lcp_method=method).solve, t_span, f0, fv, dt)
+        print(f"  {method:>4}: {n_steps / wall:10.0f} steps/s")
+    print(f"  max trajectory difference: {np.max(np.abs(sol['enum'] - sol['qp'])):.3e}")
+
+
+def bench_lcp_batch(n_batches=(4, 16, 64), seed=0):
+    print("Batched Moreau-Jean")
+
+    # Drops from perturbed initial states, so that the rows activate their contacts at different steps
+    t_span, f0, fv, dt = drop_scenario()
+    n_steps = int((t_span[1] - t_span[0]) / dt)
+    rng = np.random.default_rng(seed)
+    spread = np.array([0.1, 0.1, 0.1, 0.1, 0.02, 0.1, 0.2, 0.5, 0.5, 0.5])
+    solver = sv.SolverLcp(dof)
+
+    # The batch only pays off once its per-step overhead is shared by enough rows
+    for n_batch in n_batches:
+        F0 = f0 + spread * rng.uniform(-1.0, 1.0, size=(n_batch, 2 * dof))
+        FV = fv + rng.uniform(-1.0, 1.0, size=(n_batch, 2))
+        wall_batch, (sol_t_batch, sol_batch) = timed(solver.solve_batch, t_span, F0, FV, dt)
+
+        wall = 0.0
+        err = 0.0
+        for k in range(n_batch):
+            wall_k, (sol_t, sol) = timed(solver.solve, t_span, F0[k], FV[k], dt)
+            wall += wall_k
+            assert np.array_equal(sol_t, sol_t_batch)
+            err = max(err, np.max(np.abs(sol_batch[k] - sol.T)))
+
+        print(f"  B = {n_batch:3d}: sequential {n_batch * n_steps / wall:8.0f} steps/s,"
+              f" batched {n_batch * n_steps / wall_batch:8.0f} steps/s, max trajectory difference {err:.3e}")
+        assert err < 1.0e-9
+
+
+def bench_kernels(n_samples=2000, seed=0):
+    print("Generated kernels")
+
+    # Regression against the values of the original hand-written Solver.fn_* methods
+    solver = sv.SolverLcp(dof)
+    err = 0.0
+    for (fq_ref, fv_ref), values in zip(reference.STATES, reference.VALUES):
+        for name, value in values.items():
+            err = max(err, np.max(np.abs(getattr(solver, f'fn_{name}')(0.0, *fq_ref, *fv_ref) - np.array(value))))
+            batch = getattr(solver, f'fn_{name}_batch')(0.0, [fq_ref], fv_ref)[0]
+            err = max(err, np.max(np.abs(batch - np.array(value))))
+    print(f"  {'reference':>10}: max |kernel - original fn_*| = {err:.3e}")
+    assert err < 1.0e-12
+
+    # Consistency of the scalar and batch kernels behind the Solver.fn_* methods
+    rng = np.random.default_rng(seed)
+    fq = rng.normal(size=(n_samples, 2 * dof))
+    fv = rng.normal(size=(n_samples, 2))
+
+    names = ('M', 'H', 'Cons', 'Cons_gradq', 'Xo', 'Xo_dot', 'Xc', 'Xc_dot', 'U')
+    for name in names:
+        out = getattr(solver, f'fn_{name}_batch')(0.0, fq, fv)
+        err = max(np.max(np.abs(out[i] - getattr(solver, f'fn_{name}')(0.0, *fq[i], *fv[i]))) for i in range(n_samples))
+        print(f"  {name:>10}: max |batch - scalar| = {err:.3e}")
+        assert err < 1.0e-10
+
+    # The parameters are runtime inputs: the derived constants change with them, and so do the dynamics
+    params = sv.ModelParams(hb=0.4, dw=0.2)
+    wall, k = timed(kernels.derive, **dataclasses.asdict(params))
+    print(f"  {'derive':>10}: {wall * 1.0e6:10.1f} µs")
+    assert not np.allclose(sv.SolverLcp(dof, params=params).fn_U_batch(0.0, fq, fv), solver.fn_U_batch(0.0, fq, fv))
+
+    # Evaluations per second of M, H and the constraints for a single state
+    def separate():
+        for i in range(n_samples):
+            f = (*fq[i], *fv[i])
+            solver.fn_M(0.0, *f), solver.fn_H(0.0, *f), solver.fn_Cons(0.0, *f), solver.fn_Cons_gradq(0.0, *f)
+
+    def fused():
+        for i in range(n_samples):
+            solver.fn_all(0.0, *fq[i], *fv[i])
+
+    for label, fn in (('fn_*', separate), ('fn_all', fused)):
+        wall, _ = timed(fn)
+        print(f"  {label:>10}: {n_samples / wall:10.0f} evaluations/s")
+
+
+def bench_lcp_step():
+    print("Moreau-Jean step")
+
+    t_span, f0, fv, dt = drop_scenario()
+    n_steps = int((t_span[1] - t_span[0]) / dt)
+    solver = sv.SolverLcp(dof)
+
+    # Reference loop with the allocating step
+    def allocating():
+        sol_y = np.zeros((n_steps + 1, 2 * dof))
+        sol_y[0] = f0
+        for i in range(1, n_steps + 1):
+            sol_y[i] = solver.dynamics_constrained_reference(dt, sol_y[i - 1], fv)
+        return sol_y.T
+
+    wall_ref, sol_ref = timed(allocating)
+    wall, (_, sol) = timed(solver.solve, t_span, f0, fv, dt)
+    print(f"  allocating: {n_steps / wall_ref:10.0f} steps/s")
+    print(f"   workspace: {n_steps / wall:10.0f} steps/s")
+    print(f"  max trajectory difference: {np.max(np.abs(sol - sol_ref)):.3e}")
+    assert np.allclose(sol, sol_ref, rtol=1.0e-9, atol=1.0e-12)
+
+
+def bench_lcp_adaptive():
+    print("Adaptive Moreau-Jean")
+
+    scenarios = {
+        'balance': balance_scenario(),
+        'drop': drop_scenario()[:3],
+    }
+    for name, (t_span, f0, fv) in scenarios.items():
+        t_span = (0.0, 10.0)
+        ref_t, ref = sv.SolverLcp(dof).solve(t_span, f0, fv, 1.0e-4)
+
+        def report(label, wall, sol_t, sol_y, stats):
+            # Error of the final state, and of the positions over the whole run on the reference grid, as the
+            # velocities jump at the impacts
+            err_end = np.max(np.abs(sol_y[:, -1] - ref[:, -1]))
+            err_q = max(np.max(np.abs(np.interp(ref_t, sol_t, y) - y_ref)) for y, y_ref in zip(sol_y[0::2], ref[0::2]))
+            rejected = f" ({stats['rejected']} rejected)" if 'rejected' in stats else ''
+            print(f"  {name:>7} {label:>18}: {wall:6.2f} s, {sol_t.size - 1:6d} steps{rejected}, "
+                  f"{stats['lcp_solves']:6d} LCP solves, final state error {err_end:.3e}, "
+                  f"max position error {err_q:.3e}")
+            return err_q
+
+        # Work against accuracy of the uniform grid and of the adaptive steps
+        for dt in (2.0e-3, 1.0e-3, 5.0e-4):
+            solver = sv.SolverLcp(dof)
+            solver._ws.lcp_solves = 0
+            wall, (sol_t, sol_y) = timed(solver.solve, t_span, f0, fv, dt)
+            report(f"uniform dt={dt:.0e}", wall, sol_t, sol_y, {'lcp_solves': solver._ws.lcp_solves})
+
+        # A tighter tolerance must give a smaller error, with an absolute one under the initial tilt of the balance
+        errors = []
+        for rtol in (1.0e-3, 1.0e-4, 1.0e-5):
+            solver = sv.SolverLcp(dof, adaptive=True, rtol=rtol, atol=1.0e-12)
+            wall, (sol_t, sol_y) = timed(solver.solve, t_span, f0, fv, 1.0e-3)
+            errors.append(report(f"adaptive rtol={rtol:.0e}", wall, sol_t, sol_y, solver.stats))
+        assert errors == sorted(errors, reverse=True), f"{name}: the error does not shrink with the tolerance"
+
+
+def bench_ode_jacobian(repeat=3):
+    print("ODE Jacobian")
+
+    t_span, f0, fv = balance_scenario()
+
+    for backend in sv.SolverOde.BACKENDS:
+        sundials = backend.startswith('sundials-')
+        if sundials and importlib.util.find_spec('sksundae') is None:
+            print(f"  {backend:>14}: skipped, sksundae is not installed")
+            continue
+
+        sol = {}
+        for jac in ('fd', 'analytic') if sundials else ('fd', 'sparse', 'analytic'):
+            solver = sv.SolverOde(dof, backend=backend, jac=jac)
+
+            # Count every RHS call, as SciPy's nfev leaves out the finite-difference columns
+            n_rhs = 0
+            dynamics_ode = solver.dynamics_ode
+
+            def counted(*args):
+                nonlocal n_rhs
+                n_rhs += 1
+                return dynamics_ode(*args)
+
+            solver.dynamics_ode = counted
+
+            # Best of a few runs, as the differences are within the noise of one
+            wall = np.inf
+            for _ in range(repeat):
+                n_rhs = 0
+                wall_k, (_, sol[jac]) = timed(solver.solve, t_span, f0, fv)
+                wall = min(wall, wall_k)
+            n_rhs = solver.stats['nfev'] if sundials else n_rhs
+            default = ' (default)' if jac == sv.SolverOde.JAC_DEFAULTS[backend] else ''
+            print(f"  {backend:>14} {jac:>8}: {n_rhs:6d} RHS evaluations, {solver.stats['njev']:4d} Jacobians, "
+                  f"{wall:6.3f} s{default}")
+        err = np.max(np.abs(sol['analytic'][:, -1] - sol['fd'][:, -1]))
+        print(f"  {backend:>14} final state difference: {err:.3e}")
+
+
+def bench_ode_backends():
+    print("ODE backends")
+
+    t_span, f0, fv = balance_scenario()
+    f0 = f0.copy()
+    f0[6] = 3.0e-1
+
+    _, ref = sv.SolverOde(dof, backend='scipy-radau', rtol=1.0e-12, atol=1.0e-12).solve(t_span, f0, fv)
+
+    for backend in sv.SolverOde.BACKENDS:
+        if backend.startswith('sundials-') and importlib.util.find_spec('sksundae') is None:
+            print(f"  {backend:>14}: skipped, sksundae is not installed")
+            continue
+
+        solver = sv.SolverOde(dof, backend=backend)
+        wall, (sol_t, sol_y) = timed(solver.solve, t_span, f0, fv)
+        err = np.max(np.abs(sol_y[:, -1] - ref[:, -1]))
+        print(f"  {backend:>14}: {wall:6.2f} s, {sol_t.size:6d} steps, final state error {err:.3e}")
+
+
+def bench_ode_contacts():
+    print("ODE contact events")
+
+    t_span, f0, fv, dt = drop_scenario()
+    t_span = (0.0, 10.0)
+    n_steps = int((t_span[1] - t_span[0]) / dt)
+
+    solver_lcp = sv.SolverLcp(dof)
+    wall, (_, ref) = timed(solver_lcp.solve, t_span, f0, fv, dt)
+    print(f"  {'lcp':>11}: {wall:6.2f} s, {n_steps:6d} steps")
+
+    for backend in ('scipy-radau', 'scipy-bdf'):
+        solver = sv.SolverOde(dof, backend=backend, contacts=True)
+        wall, (sol_t, sol_y) = timed(solver.solve, t_span, f0, fv)
+        penetration = -min(np.min(solver.fn_Cons(0.0, *f, *fv)) for f in sol_y.T)
+        print(f"  {backend:>11}: {wall:6.2f} s, {sol_t.size:6d} steps, {solver.stats['impacts']} impacts, "
+              f"max penetration {penetration:.3e}, final state difference {np.max(np.abs(sol_y[:, -1] - ref[:, -1])):.3e}")
+
+
+if __name__ == '__main__':
+    bench_lcp()
+    bench_lcp_batch()
+    bench_kernels()
+    bench_lcp_step()
+    bench_lcp_adaptive()
+    bench_ode_jacobian()
+    bench_ode_backends()
+    bench_ode_contacts()
@@ -0,0 +1,374 @@
+"""
+Code generation of the model kernels.
+
+The model is derived symbolically in `model.ipynb`. This module turns the derived expressions into a Python module of
+fused kernels: all the expressions of a kernel are evaluated together after common-subexpression elimination, so the
+repeated trigonometric terms and coefficients are computed once per call. Each kernel is emitted as a scalar variant
+using `math` for a single state, as an `_into` variant of it writing every output into one preallocated flat buffer, and
+as a batched variant using NumPy ufuncs for `(N, 2 * dof)` states.
+
+The model parameters stay runtime inputs. The subexpressions that depend only on the parameters are hoisted out of the
+kernels into a generated `derive` function, evaluated once per parameter set.
+
+The notebook's "Code generation" section calls `generate` to write `kernels.py`. The same section can be run headless,
+without Jupyter, with
+
+    python kernelgen.py [--simplify]
+
+By default `sp.simplify` is disabled while the derivation runs, since the common-subexpression elimination makes it
+unnecessary for the generated code and it dominates the derivation time.
+"""
+import argparse
+import contextlib
+import io
+import json
+import pathlib
+import sympy as sp
+
+from sympy.printing.numpy import NumPyPrinter
+from sympy.printing.pycode import PythonCodePrinter
+
+
+STATE = ('x', 'x_dot', 'y', 'y_dot', 'z', 'z_dot', 'theta', 'theta_dot', 'phi', 'phi_dot')
+FREE = ('fv_omega_l', 'fv_omega_r')
+
+HEADER = '''"""
+Model kernels generated by `kernelgen.py` from `model.ipynb`. Do not edit by hand.
+"""
+import math
+import numpy as np'''
+
+
+def _flatten(kernels):
+    names, shapes, exprs = [], [], []
+    for name, mat in kernels.items():
+        mat = sp.Matrix(mat)
+        names.append(name)
+        shapes.append(mat.shape)
+        exprs.extend(mat)
+    return names, shapes, exprs
+
+
+class _Derived:
+    """
+    Table of the derived constants: the maximal subexpressions that depend only on the model parameters. They are
+    replaced by `_k<i>` symbols in the kernels and evaluated once per parameter set by the generated `derive`.
+    """
+
+    def __init__(self, params):
+        self.params = set(params)
+        self.table = {}
+
+    def symbol(self, expr):
+        if expr not in self.table:
+            self.table[expr] = sp.Symbol(f'_k{len(self.table)}')
+        return self.table[expr]
+
+    def is_const(self, expr):
+        return expr.free_symbols <= self.params
+
+    def hoist(self, expr):
+        if self.is_const(expr):
+            return self.symbol(expr) if expr.free_symbols else expr
+        if expr.is_Atom:
+            return expr
+
+        if isinstance(expr, (sp.Add, sp.Mul)):
+            const = [a for a in expr.args if self.is_const(a)]
+            rest = [self.hoist(a) for a in expr.args if not self.is_const(a)]
+            if any(a.free_symbols for a in const):
+                return expr.func(self.symbol(expr.func(*const)), *rest)
+            return expr.func(*const, *rest)
+
+        return expr.func(*[self.hoist(a) for a in expr.args])
+
+
+def _symbols(exprs, names):
+    by_name = {str(sym): sym for expr in exprs for sym in sp.sympify(expr).free_symbols}
+    return [by_name.get(name, sp.Symbol(name, real=True)) for name in names]
+
+
+def jacobians(M, H):
+    """
+    Derivatives of the mass matrix and of the remaining terms of `M(f) q_ddot + H(f, fv) = 0` with respect to the
+    state `f` and the free variables `fv`, as needed by the Jacobian of the first-order system
+
+        d/df (M⁻¹ (-H)) = M⁻¹ (-dH/df - dM/df · M⁻¹ (-H))
+
+    The derivatives of `M` are returned as `(n * n, len(STATE))` matrices, row-major over the entries of `M`.
+
+    Returns
+    -------
+    dict[str, sp.Matrix]
+        `M_gradf`, `H_gradf`, `M_gradfv` and `H_gradfv`.
+    """
+    M, H = sp.Matrix(M), sp.Matrix(H)
+    state = _symbols([M, H], STATE)
+    free = _symbols([M, H], FREE)
+
+    M_flat = M.reshape(M.rows * M.cols, 1)
+    return {
+        'M_gradf': M_flat.jacobian(state),
+        'H_gradf': H.jacobian(state),
+        'M_gradfv': M_flat.jacobian(free),
+        'H_gradfv': H.jacobian(free),
+    }
+
+
+def constraint_drift(Cons_gradq):
+    """
+    Velocity-dependent term of the constraint accelerations, `d/dt(J) q_dot` with `J = Cons_gradq(q)`, so that
+
+        d²/dt² Cons = J q_ddot + d/dt(J) q_dot
+
+    Returns
+    -------
+    sp.Matrix
+        `(n_cons, 1)` matrix.
+    """
+    J = sp.Matrix(Cons_gradq)
+    state = _symbols([J], STATE)
+    q, qd = sp.Matrix(state[0::2]), sp.Matrix(state[1::2])
+    return (J * qd).jacobian(q) * qd
+
+
+def jacobian_sparsity(M, H):
+    """
+    Structural sparsity of the Jacobian of the first-order system `f_dot = [q_dot; M⁻¹ (-H)]` with respect to the
+    interleaved state `f = STATE`, as a boolean `(len(STATE), len(STATE))` matrix.
+
+    An acceleration depends on a state variable when some term of `M` or `H` coupled to it through `M⁻¹` does. The
+    coupling of `M⁻¹` is taken as the transitive closure of the non-zero pattern of `M`.
+    """
+    M, H = sp.Matrix(M), sp.Matrix(H)
+    n = M.rows
+    state = _symbols([M, H], STATE)
+
+    coupled = [[i == j or M[i, j] != 0 for j in range(n)] for i in range(n)]
+    for k in range(n):
+        for i in range(n):
+            for j in range(n):
+                coupled[i][j] = coupled[i][j] or (coupled[i][k] and coupled[k][j])
+
+    depends = [
+        [sym in H[i].free_symbols or any(sym in M[i, j].free_symbols for j in range(n)) for sym in state]
+        for i in range(n)
+    ]
+
+    sparsity = [[False] * len(state) for _ in state]
+    for i in range(n):
+        sparsity[2 * i][2 * i + 1] = True
+        for j in range(len(state)):
+            sparsity[2 * i + 1][j] = any(coupled[i][k] and depends[k][j] for k in range(n))
+
+    return sparsity
+
+
+def _shape(shape):
+    rows, cols = shape
+    return f"({rows},)" if cols == 1 else f"({rows}, {cols})"
+
+
+def _emit_constant(name, value):
+    rows = [f"    [{', '.join(str(v) for v in row)}]," for row in value]
+    return '\n'.join([f"{name} = np.array([", *rows, "])"])
+
+
+def _emit_derive(params, derived):
+    printer = PythonCodePrinter({'strict': False})
+
+    syms = list(derived.table.values())
+    replacements, reduced = sp.cse(list(derived.table.keys()), symbols=sp.numbered_symbols('_x'))
+
+    lines = [f"def derive({', '.join(params)}):"]
+    lines += [f"    {sym} = {printer.doprint(expr)}" for sym, expr in replacements]
+    lines += [f"    {sym} = {printer.doprint(expr)}" for sym, expr in zip(syms, reduced)]
+    lines.append("")
+    lines.append("    return (")
+    lines += [f"        {sym}," for sym in syms]
+    lines.append("    )")
+
+    return '\n'.join(lines)
+
+
+def _emit_scalar(fn_name, names, shapes, derived, replacements, reduced):
+    printer = PythonCodePrinter({'strict': False})
+
+    lines = [
+        f"def {fn_name}(fq, fv, k):",
+        f"    {', '.join(STATE)} = fq",
+        f"    {', '.join(FREE)} = fv",
+        f"    {', '.join(map(str, derived.table.values()))}, = k",
+        "",
+    ]
+    lines += [f"    {sym} = {printer.doprint(expr)}" for sym, expr in replacements]
+    lines.append("")
+
+    k = 0
+    for name, (rows, cols) in zip(names, shapes):
+        lines.append(f"    {name} = np.array([")
+        for i in range(rows):
+            row = [printer.doprint(e) for e in reduced[k:k + cols]]
+            k += cols
+            lines.append(f"        [{', '.join(row)}]," if cols > 1 else f"        {row[0]},")
+        lines.append("    ])")
+    lines.append(f"    return {', '.join(names)}")
+
+    return '\n'.join(lines)
+
+
+def _emit_into(fn_name, names, shapes, derived, replacements, reduced):
+    printer = PythonCodePrinter({'strict': False})
+
+    lines = [
+        f"def {fn_name}_into(fq, fv, k, out):",
+        f"    {', '.join(STATE)} = fq",
+        f"    {', '.join(FREE)} = fv",
+        f"    {', '.join(map(str, derived.table.values()))}, = k",
+        "",
+    ]
+    lines += [f"    {sym} = {printer.doprint(expr)}" for sym, expr in replacements]
+    lines.append("")
+    lines.append("    out[:] = (")
+    lines += [f"        {printer.doprint(expr)}," for expr in reduced]
+    lines.append("    )")
+
+    return '\n'.join(lines)
+
+
+def _emit_batch(fn_name, names, shapes, derived, replacements, reduced):
+    printer = NumPyPrinter({'strict': False})
+
+    def doprint(expr):
+        return printer.doprint(expr).replace('numpy.', 'np.')
+
+    lines = [
+        f"def {fn_name}_batch(fq, fv, k):",
+        "    fq = np.atleast_2d(np.asarray(fq, dtype=float))",
+        "    n = fq.shape[0]",
+        f"    {', '.join(STATE)} = fq.T",
+        f"    {', '.join(FREE)} = np.broadcast_to(np.asarray(fv, dtype=float), (n, {len(FREE)})).T",
+        f"    {', '.join(map(str, derived.table.values()))}, = k",
+        "",
+    ]
+    lines += [f"    {sym} = {doprint(expr)}" for sym, expr in replacements]
+    lines.append("")
+
+    k = 0
+    for name, (rows, cols) in zip(names, shapes):
+        is_vec = cols == 1
+        lines.append(f"    {name} = np.zeros((n, {rows}))" if is_vec else f"    {name} = np.zeros((n, {rows}, {cols}))")
+        for i in range(rows):
+            for j in range(cols):
+                expr = reduced[k]
+                k += 1
+                if expr == 0:
+                    continue
+                idx = f"[:, {i}]" if is_vec else f"[:, {i}, {j}]"
+                lines.append(f"    {name}{idx} = {doprint(expr)}")
+    lines.append(f"    return {', '.join(names)}")
+
+    return '\n'.join(lines)
+
+
+def generate(groups, params, subs=None, constants=None):
+    """
+    Generate the source of a kernels module.
+
+    Parameters
+    ----------
+    groups : dict[str, dict[str, sp.Matrix]]
+        Kernel function names mapped to the named expressions they return, in order. The expressions are in terms of
+        the `STATE` and `FREE` symbols and of the `params` symbols.
+    params : dict[str, sp.Symbol]
+        Model parameters that stay runtime inputs of the kernels, by argument name.
+    subs : dict, optional
+        Substitutions applied before generation, e.g. to fix some of the parameters.
+    constants : dict[str, list[list]], optional
+        Module-level constant matrices, e.g. the `jacobian_sparsity` of the model.
+
+    Returns
+    -------
+    str
+        Module source with:
+          - `STATE` and `FREE`, the names of the state and free variables in `fq` and `fv`,
+          - `PARAMS`, the parameter names accepted by `derive`,
+          - the `constants`,
+          - `derive(**params)`, returning the tuple `k` of derived constants of a parameter set,
+          - `SHAPES`, the shapes of the outputs of each group, in the flat `out` buffer of the `_into` variants,
+          - a scalar `<name>(fq, fv, k)`, an in-place `<name>_into(fq, fv, k, out)` and a batched
+            `<name>_batch(fq, fv, k)` function per group.
+    """
+    subs = subs or {}
+    derived = _Derived(params.values())
+    names_params = {sym: sp.Symbol(name) for name, sym in params.items()}
+
+    kernels = []
+    for fn_name, group in groups.items():
+        names, shapes, exprs = _flatten(group)
+        exprs = [derived.hoist(sp.sympify(e).subs(subs, simultaneous=True)) for e in exprs]
+        kernels.append((fn_name, names, shapes, *sp.cse(exprs, symbols=sp.numbered_symbols('_x'))))
+
+    derived.table = {expr.subs(names_params, simultaneous=True): sym for expr, sym in derived.table.items()}
+
+    blocks = [
+        HEADER,
+        '\n'.join([
+            f"STATE = ({', '.join(repr(name) for name in STATE)},)",
+            f"FREE = ({', '.join(repr(name) for name in FREE)},)",
+            f"PARAMS = ({', '.join(repr(name) for name in params)},)",
+        ]),
+    ]
+    blocks += [_emit_constant(name, value) for name, value in (constants or {}).items()]
+    blocks.append('\n'.join(
+        ["SHAPES = {"]
+        + [f"    {fn_name!r}: ({', '.join(map(_shape, shapes))}{',' * (len(shapes) == 1)})," for fn_name, _, shapes, *_ in kernels]
+        + ["}"]
+    ))
+    blocks.append(_emit_derive(params, derived))
+    for fn_name, names, shapes, replacements, reduced in kernels:
+        blocks.append(_emit_scalar(fn_name, names, shapes, derived, replacements, reduced))
+        blocks.append(_emit_into(fn_name, names, shapes, derived, replacements, reduced))
+        blocks.append(_emit_batch(fn_name, names, shapes, derived, replacements, reduced))
+
+    return '\n\n\n'.join(blocks) + '\n'
+
+
+def run_notebook(path, stop='#### C', simplify=False):
+    """
+    Execute the code cells of the notebook at `path` up to the first markdown cell whose heading is `stop`, and return
+    the resulting namespace. Rich display output is discarded.
+    """
+    nb = json.loads(pathlib.Path(path).read_text(encoding='utf-8'))
+
+    ns = {'display': lambda *args, **kwargs: None}
+    sp_simplify = sp.simplify
+    if not simplify:
+        sp.simplify = lambda expr, *args, **kwargs: expr
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for cell in nb['cells']:
+                source = ''.join(cell['source'])
+                if cell['cell_type'] == 'markdown' and source.split('\n', 1)[0] == stop:
+                    break
+                if cell['cell_type'] == 'code':
+                    exec(compile(source, str(path), 'exec'), ns)
+    finally:
+        sp.simplify = sp_simplify
+
+    return ns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the model kernels from model.ipynb.")
+    parser.add_argument('--simplify', action='store_true', help="keep the notebook's sp.simplify calls")
+    args = parser.parse_args()
+
+    root = pathlib.Path(__file__).resolve().parent
+    with contextlib.chdir(root):
+        run_notebook(root / 'model.ipynb', simplify=args.simplify)
+
+
+if __name__ == '__main__':
+    main()
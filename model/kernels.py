@@ -0,0 +1,2401 @@
+"""
+Model kernels generated by `kernelgen.py` from `model.ipynb`. Do not edit by hand.
+"""
+import math
+import numpy as np
+
+
+STATE = ('x', 'x_dot', 'y', 'y_dot', 'z', 'z_dot', 'theta', 'theta_dot', 'phi', 'phi_dot',)
+FREE = ('fv_omega_l', 'fv_omega_r',)
+PARAMS = ('agx', 'agy', 'xcm', 'ycm', 'zcm', 'hb', 'eb', 'dw', 'm', 'Ir', 'Iz', 'Iw', 'ba', 'bw', 'bd', 'ct', 'rho', 'g',)
+
+
+JAC_SPARSITY = np.array([
+    [False, True, False, False, False, False, False, False, False, False],
+    [False, True, False, True, False, True, True, True, True, True],
+    [False, False, False, True, False, False, False, False, False, False],
+    [False, True, False, True, False, True, True, True, True, True],
+    [False, False, False, False, False, True, False, False, False, False],
+    [False, True, False, True, False, True, True, True, True, True],
+    [False, False, False, False, False, False, False, True, False, False],
+    [False, True, False, True, False, True, True, True, True, True],
+    [False, False, False, False, False, False, False, False, False, True],
+    [False, True, False, True, False, True, True, True, True, True],
+])
+
+
+SHAPES = {
+    'eval_all': ((5, 5), (5,), (2,), (2, 5)),
+    'eval_kinematics': ((3,), (3,), (3,), (3,)),
+    'eval_jacobian': ((5, 5), (5,), (25, 10), (5, 10), (25, 2), (5, 2)),
+    'eval_contact': ((5, 5), (5,), (2,), (2, 5), (2,)),
+}
+
+
+def derive(agx, agy, xcm, ycm, zcm, hb, eb, dw, m, Ir, Iz, Iw, ba, bw, bd, ct, rho, g):
+    _x0 = m*zcm
+    _x1 = m*xcm
+    _x2 = m*ycm
+    _x3 = xcm**2
+    _x4 = _x3*m
+    _x5 = zcm**2
+    _x6 = _x5*m
+    _x7 = _x0*xcm
+    _x8 = 2*_x7
+    _x9 = 2*Iw
+    _x10 = _x1*ycm
+    _x11 = _x0*ycm
+    _x12 = ycm**2
+    _x13 = _x12*m
+    _x14 = bd*rho
+    _x15 = (1/2)*_x14
+    _x16 = _x15*ycm
+    _x17 = (1/4)*dw
+    _x18 = _x17*m
+    _x19 = _x15*xcm
+    _x20 = _x15*zcm
+    _x21 = (1/8)*_x14*dw
+    _x22 = _x16*zcm
+    _x23 = bw*dw**2
+    _x24 = _x15*_x5
+    _x25 = _x14*xcm*zcm
+    _x26 = _x1*g
+    _x27 = _x21*zcm
+    _x28 = 2*_x4
+    _x29 = 2*_x6
+    _x30 = _x14*_x5
+    _x31 = _x14*_x3
+    _x32 = 4*_x7
+    _k0 = m
+    _k1 = _x0
+    _k2 = -_x1
+    _k3 = -_x2
+    _k4 = -_x0
+    _k5 = _x1
+    _k6 = _x4
+    _k7 = _x6
+    _k8 = _x8
+    _k9 = -_x8
+    _k10 = Ir + _x9*ct + _x9
+    _k11 = _x10
+    _k12 = -_x11
+    _k13 = _x13
+    _k14 = Iz + _x13
+    _k15 = -_x16
+    _k16 = -_x18
+    _k17 = -_x19
+    _k18 = -_x20
+    _k19 = _x20
+    _k20 = _x2
+    _k21 = _x15
+    _k22 = _x21
+    _k23 = _x18
+    _k24 = _x19
+    _k25 = _x15 + 2*bw
+    _k26 = g*m
+    _k27 = _x16*xcm
+    _k28 = -_x22
+    _k29 = (1/2)*_x23
+    _k30 = _x15*_x3
+    _k31 = _x24
+    _k32 = -_x19*zcm
+    _k33 = -_x24
+    _k34 = _x25
+    _k35 = -_x25
+    _k36 = -_x6
+    _k37 = _x7
+    _k38 = -_x7
+    _k39 = -_x4
+    _k40 = -_x26
+    _k41 = -_x0*g
+    _k42 = (1/4)*_x23
+    _k43 = -_x21*xcm
+    _k44 = _x27
+    _k45 = _x12*_x15
+    _k46 = _x11
+    _k47 = -_x21*ycm
+    _k48 = -agx
+    _k49 = -agy
+    _k50 = hb
+    _k51 = (1/2)*dw
+    _k52 = -hb
+    _k53 = _x17
+    _k54 = -ycm
+    _k55 = xcm
+    _k56 = zcm
+    _k57 = ycm
+    _k58 = -xcm
+    _k59 = -zcm
+    _k60 = -_x28
+    _k61 = _x29
+    _k62 = -_x29
+    _k63 = _x28
+    _k64 = _x16
+    _k65 = -_x21
+    _k66 = _x22
+    _k67 = _x30
+    _k68 = -_x31
+    _k69 = _x31
+    _k70 = -_x30
+    _k71 = _x32
+    _k72 = -_x32
+    _k73 = _x26
+    _k74 = -_x27
+    _k75 = -_x10
+
+    return (
+        _k0,
+        _k1,
+        _k2,
+        _k3,
+        _k4,
+        _k5,
+        _k6,
+        _k7,
+        _k8,
+        _k9,
+        _k10,
+        _k11,
+        _k12,
+        _k13,
+        _k14,
+        _k15,
+        _k16,
+        _k17,
+        _k18,
+        _k19,
+        _k20,
+        _k21,
+        _k22,
+        _k23,
+        _k24,
+        _k25,
+        _k26,
+        _k27,
+        _k28,
+        _k29,
+        _k30,
+        _k31,
+        _k32,
+        _k33,
+        _k34,
+        _k35,
+        _k36,
+        _k37,
+        _k38,
+        _k39,
+        _k40,
+        _k41,
+        _k42,
+        _k43,
+        _k44,
+        _k45,
+        _k46,
+        _k47,
+        _k48,
+        _k49,
+        _k50,
+        _k51,
+        _k52,
+        _k53,
+        _k54,
+        _k55,
+        _k56,
+        _k57,
+        _k58,
+        _k59,
+        _k60,
+        _k61,
+        _k62,
+        _k63,
+        _k64,
+        _k65,
+        _k66,
+        _k67,
+        _k68,
+        _k69,
+        _k70,
+        _k71,
+        _k72,
+        _k73,
+        _k74,
+        _k75,
+    )
+
+
+def eval_all(fq, fv, k):
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq
+    fv_omega_l, fv_omega_r = fv
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = math.cos(phi)
+    _x1 = math.cos(theta)
+    _x2 = _k1*_x1
+    _x3 = _x0*_x2
+    _x4 = math.sin(theta)
+    _x5 = _k2*_x4
+    _x6 = _x0*_x5
+    _x7 = _x3 + _x6
+    _x8 = math.sin(phi)
+    _x9 = _k2*_x1
+    _x10 = _k4*_x4
+    _x11 = _x10*_x8 + _x8*_x9
+    _x12 = _k3*_x0 + _x11
+    _x13 = _x2*_x8 + _x5*_x8
+    _x14 = _x0*_x4
+    _x15 = _x0*_x1
+    _x16 = _k1*_x14 + _k3*_x8 + _k5*_x15
+    _x17 = _x10 + _x9
+    _x18 = _x0**2
+    _x19 = _x4**2
+    _x20 = _k6*_x19
+    _x21 = _x8**2
+    _x22 = _x1**2
+    _x23 = _k7*_x22
+    _x24 = _x1*_x4
+    _x25 = _k8*_x24
+    _x26 = _k9*_x24
+    _x27 = _k6*_x22
+    _x28 = _k7*_x19
+    _x29 = _x27 + _x28
+    _x30 = _k11*_x4
+    _x31 = _k12*_x1
+    _x32 = _x18*_x30 + _x18*_x31 + _x21*_x30 + _x21*_x31
+    _x33 = _k22*_x0
+    _x34 = _k4*_x1
+    _x35 = _x8*theta_dot
+    _x36 = _k5*_x4
+    _x37 = _x8*phi_dot
+    _x38 = theta_dot**2
+    _x39 = _x0*_x10 + _x0*_x9
+    _x40 = phi_dot**2
+    _x41 = _k19*_x14
+    _x42 = _k19*_x1
+    _x43 = _k17*_x14 + _x0*_x42
+    _x44 = _k16*_x8
+    _x45 = _k17*_x1
+    _x46 = _k18*_x4
+    _x47 = _k15*_x0 + _x45*_x8 + _x46*_x8
+    _x48 = _k22*_x8
+    _x49 = _x4*_x8
+    _x50 = _k17*_x49 + _x42*_x8
+    _x51 = _k23*_x0
+    _x52 = _k15*_x8 + _k24*_x15 + _x41
+    _x53 = _x45 + _x46
+    _x54 = _k42*fv_omega_l
+    _x55 = _k42*fv_omega_r
+    _x56 = _k43*_x4
+    _x57 = _x21*_x56
+    _x58 = _x18*fv_omega_l
+    _x59 = _x18*fv_omega_r
+    _x60 = _k44*_x1
+    _x61 = _x21*_x60
+    _x62 = _k27*_x4
+    _x63 = _k28*_x1
+    _x64 = _x18*_x62 + _x18*_x63 + _x21*_x62 + _x21*_x63
+    _x65 = _k36*_x24
+    _x66 = _k6*_x24
+    _x67 = _k37*_x19
+    _x68 = _k38*_x22
+    _x69 = _x18*_x65 + _x18*_x66 + _x18*_x67 + _x18*_x68 + _x21*_x65 + _x21*_x66 + _x21*_x67 + _x21*_x68
+    _x70 = _k37*_x22
+    _x71 = _k38*_x19
+    _x72 = _k39*_x24
+    _x73 = _k7*_x24
+    _x74 = _k30*_x22
+    _x75 = _k31*_x19
+    _x76 = _k34*_x24
+    _x77 = _k30*_x19
+    _x78 = _k31*_x22
+    _x79 = _k32*_x19
+    _x80 = _k31*_x24
+    _x81 = _k35*_x24
+    _x82 = _k47*fv_omega_l
+    _x83 = _k47*fv_omega_r
+    _x84 = _k23*_x8
+    _x85 = _k16*_x0
+    _x86 = _k11*_x1
+    _x87 = _k46*_x4
+    _x88 = _k28*_x4
+    _x89 = _x72*theta_dot
+    _x90 = _x73*theta_dot
+    _x91 = _x70*theta_dot
+    _x92 = _x71*theta_dot
+    _x93 = _x72*phi_dot
+    _x94 = _x73*phi_dot
+    _x95 = _x70*phi_dot
+    _x96 = _x71*phi_dot
+    _x97 = _k48*x + _k49*y + z
+
+    M = np.array([
+        [_k0, 0, 0, _x7, _x12],
+        [0, _k0, 0, _x13, _x16],
+        [0, 0, _k0, _x17, 0],
+        [_x7, _x13, _x17, _k10 + _x18*_x20 + _x18*_x23 + _x18*_x26 + _x20*_x21 + _x21*_x23 + _x21*_x26 + _x25 + _x29, _x32],
+        [_x12, _x16, 0, _x32, _k13*_x18 + _k13*_x21 + _k14 + _x18*_x25 + _x18*_x27 + _x18*_x28 + _x21*_x25 + _x21*_x27 + _x21*_x28 + _x29],
+    ])
+    H = np.array([
+        _k21*x_dot + _x33*fv_omega_l + _x33*fv_omega_r + _x38*_x39 + _x40*(_k20*_x8 + _x39) + phi_dot*(_x34*_x35 + _x35*_x36) + phi_dot*(_x44*fv_omega_l + _x44*fv_omega_r + _x47) + theta_dot*(_x41 + _x43) + theta_dot*(_x34*_x37 + _x36*_x37),
+        _k21*y_dot + _x11*_x38 + _x12*_x40 + _x48*fv_omega_l + _x48*fv_omega_r + phi_dot*(_x3*theta_dot + _x6*theta_dot) + phi_dot*(_x51*fv_omega_l + _x51*fv_omega_r + _x52) + theta_dot*(_k19*_x49 + _x50) + theta_dot*(_x3*phi_dot + _x6*phi_dot),
+        _k25*z_dot + _k26 + _x38*(_x34 + _x36) + theta_dot*(_x42 + _x53),
+        _k40*_x1 + _k41*_x4 + _x18*_x54 + _x18*_x55 + _x21*_x54 + _x21*_x55 + _x38*(_x69 + _x70 + _x71 + _x72 + _x73) + _x40*(_x65 + _x66 + _x69) + _x43*x_dot + _x50*y_dot + _x53*z_dot + _x56*_x58 + _x56*_x59 + _x57*fv_omega_l + _x57*fv_omega_r + _x58*_x60 + _x59*_x60 + _x61*fv_omega_l + _x61*fv_omega_r + _x64*phi_dot + theta_dot*(_k29*_x18 + _k29*_x21 + _k32*_x22 + _k33*_x24 + _x18*_x77 + _x18*_x78 + _x18*_x79 + _x18*_x80 + _x18*_x81 + _x21*_x77 + _x21*_x78 + _x21*_x79 + _x21*_x80 + _x21*_x81 + _x74 + _x75 + _x76),
+        _x18*_x82 + _x18*_x83 + _x21*_x82 + _x21*_x83 + _x38*(_x18*_x86 + _x18*_x87 + _x21*_x86 + _x21*_x87) + phi_dot*(_k45*_x18 + _k45*_x21 + _x18*_x74 + _x18*_x75 + _x18*_x76 + _x21*_x74 + _x21*_x75 + _x21*_x76) + phi_dot*(_x18*_x89 + _x18*_x90 + _x18*_x91 + _x18*_x92 + _x21*_x89 + _x21*_x90 + _x21*_x91 + _x21*_x92 + _x89 + _x90) + theta_dot*(_x18*_x88 + _x21*_x88 + _x64) + theta_dot*(_x18*_x93 + _x18*_x94 + _x18*_x95 + _x18*_x96 + _x21*_x93 + _x21*_x94 + _x21*_x95 + _x21*_x96 + _x93 + _x94) + x_dot*(_x47 + _x84*fv_omega_l + _x84*fv_omega_r) + y_dot*(_x52 + _x85*fv_omega_l + _x85*fv_omega_r),
+    ])
+    Cons = np.array([
+        _x97,
+        _k50*_x1 + _k51 + _x97,
+    ])
+    Cons_gradq = np.array([
+        [_k48, _k49, 1, 0, 0],
+        [_k48, _k49, 1, _k52*_x4, 0],
+    ])
+    return M, H, Cons, Cons_gradq
+
+
+def eval_all_into(fq, fv, k, out):
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq
+    fv_omega_l, fv_omega_r = fv
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = math.cos(phi)
+    _x1 = math.cos(theta)
+    _x2 = _k1*_x1
+    _x3 = _x0*_x2
+    _x4 = math.sin(theta)
+    _x5 = _k2*_x4
+    _x6 = _x0*_x5
+    _x7 = _x3 + _x6
+    _x8 = math.sin(phi)
+    _x9 = _k2*_x1
+    _x10 = _k4*_x4
+    _x11 = _x10*_x8 + _x8*_x9
+    _x12 = _k3*_x0 + _x11
+    _x13 = _x2*_x8 + _x5*_x8
+    _x14 = _x0*_x4
+    _x15 = _x0*_x1
+    _x16 = _k1*_x14 + _k3*_x8 + _k5*_x15
+    _x17 = _x10 + _x9
+    _x18 = _x0**2
+    _x19 = _x4**2
+    _x20 = _k6*_x19
+    _x21 = _x8**2
+    _x22 = _x1**2
+    _x23 = _k7*_x22
+    _x24 = _x1*_x4
+    _x25 = _k8*_x24
+    _x26 = _k9*_x24
+    _x27 = _k6*_x22
+    _x28 = _k7*_x19
+    _x29 = _x27 + _x28
+    _x30 = _k11*_x4
+    _x31 = _k12*_x1
+    _x32 = _x18*_x30 + _x18*_x31 + _x21*_x30 + _x21*_x31
+    _x33 = _k22*_x0
+    _x34 = _k4*_x1
+    _x35 = _x8*theta_dot
+    _x36 = _k5*_x4
+    _x37 = _x8*phi_dot
+    _x38 = theta_dot**2
+    _x39 = _x0*_x10 + _x0*_x9
+    _x40 = phi_dot**2
+    _x41 = _k19*_x14
+    _x42 = _k19*_x1
+    _x43 = _k17*_x14 + _x0*_x42
+    _x44 = _k16*_x8
+    _x45 = _k17*_x1
+    _x46 = _k18*_x4
+    _x47 = _k15*_x0 + _x45*_x8 + _x46*_x8
+    _x48 = _k22*_x8
+    _x49 = _x4*_x8
+    _x50 = _k17*_x49 + _x42*_x8
+    _x51 = _k23*_x0
+    _x52 = _k15*_x8 + _k24*_x15 + _x41
+    _x53 = _x45 + _x46
+    _x54 = _k42*fv_omega_l
+    _x55 = _k42*fv_omega_r
+    _x56 = _k43*_x4
+    _x57 = _x21*_x56
+    _x58 = _x18*fv_omega_l
+    _x59 = _x18*fv_omega_r
+    _x60 = _k44*_x1
+    _x61 = _x21*_x60
+    _x62 = _k27*_x4
+    _x63 = _k28*_x1
+    _x64 = _x18*_x62 + _x18*_x63 + _x21*_x62 + _x21*_x63
+    _x65 = _k36*_x24
+    _x66 = _k6*_x24
+    _x67 = _k37*_x19
+    _x68 = _k38*_x22
+    _x69 = _x18*_x65 + _x18*_x66 + _x18*_x67 + _x18*_x68 + _x21*_x65 + _x21*_x66 + _x21*_x67 + _x21*_x68
+    _x70 = _k37*_x22
+    _x71 = _k38*_x19
+    _x72 = _k39*_x24
+    _x73 = _k7*_x24
+    _x74 = _k30*_x22
+    _x75 = _k31*_x19
+    _x76 = _k34*_x24
+    _x77 = _k30*_x19
+    _x78 = _k31*_x22
+    _x79 = _k32*_x19
+    _x80 = _k31*_x24
+    _x81 = _k35*_x24
+    _x82 = _k47*fv_omega_l
+    _x83 = _k47*fv_omega_r
+    _x84 = _k23*_x8
+    _x85 = _k16*_x0
+    _x86 = _k11*_x1
+    _x87 = _k46*_x4
+    _x88 = _k28*_x4
+    _x89 = _x72*theta_dot
+    _x90 = _x73*theta_dot
+    _x91 = _x70*theta_dot
+    _x92 = _x71*theta_dot
+    _x93 = _x72*phi_dot
+    _x94 = _x73*phi_dot
+    _x95 = _x70*phi_dot
+    _x96 = _x71*phi_dot
+    _x97 = _k48*x + _k49*y + z
+
+    out[:] = (
+        _k0,
+        0,
+        0,
+        _x7,
+        _x12,
+        0,
+        _k0,
+        0,
+        _x13,
+        _x16,
+        0,
+        0,
+        _k0,
+        _x17,
+        0,
+        _x7,
+        _x13,
+        _x17,
+        _k10 + _x18*_x20 + _x18*_x23 + _x18*_x26 + _x20*_x21 + _x21*_x23 + _x21*_x26 + _x25 + _x29,
+        _x32,
+        _x12,
+        _x16,
+        0,
+        _x32,
+        _k13*_x18 + _k13*_x21 + _k14 + _x18*_x25 + _x18*_x27 + _x18*_x28 + _x21*_x25 + _x21*_x27 + _x21*_x28 + _x29,
+        _k21*x_dot + _x33*fv_omega_l + _x33*fv_omega_r + _x38*_x39 + _x40*(_k20*_x8 + _x39) + phi_dot*(_x34*_x35 + _x35*_x36) + phi_dot*(_x44*fv_omega_l + _x44*fv_omega_r + _x47) + theta_dot*(_x41 + _x43) + theta_dot*(_x34*_x37 + _x36*_x37),
+        _k21*y_dot + _x11*_x38 + _x12*_x40 + _x48*fv_omega_l + _x48*fv_omega_r + phi_dot*(_x3*theta_dot + _x6*theta_dot) + phi_dot*(_x51*fv_omega_l + _x51*fv_omega_r + _x52) + theta_dot*(_k19*_x49 + _x50) + theta_dot*(_x3*phi_dot + _x6*phi_dot),
+        _k25*z_dot + _k26 + _x38*(_x34 + _x36) + theta_dot*(_x42 + _x53),
+        _k40*_x1 + _k41*_x4 + _x18*_x54 + _x18*_x55 + _x21*_x54 + _x21*_x55 + _x38*(_x69 + _x70 + _x71 + _x72 + _x73) + _x40*(_x65 + _x66 + _x69) + _x43*x_dot + _x50*y_dot + _x53*z_dot + _x56*_x58 + _x56*_x59 + _x57*fv_omega_l + _x57*fv_omega_r + _x58*_x60 + _x59*_x60 + _x61*fv_omega_l + _x61*fv_omega_r + _x64*phi_dot + theta_dot*(_k29*_x18 + _k29*_x21 + _k32*_x22 + _k33*_x24 + _x18*_x77 + _x18*_x78 + _x18*_x79 + _x18*_x80 + _x18*_x81 + _x21*_x77 + _x21*_x78 + _x21*_x79 + _x21*_x80 + _x21*_x81 + _x74 + _x75 + _x76),
+        _x18*_x82 + _x18*_x83 + _x21*_x82 + _x21*_x83 + _x38*(_x18*_x86 + _x18*_x87 + _x21*_x86 + _x21*_x87) + phi_dot*(_k45*_x18 + _k45*_x21 + _x18*_x74 + _x18*_x75 + _x18*_x76 + _x21*_x74 + _x21*_x75 + _x21*_x76) + phi_dot*(_x18*_x89 + _x18*_x90 + _x18*_x91 + _x18*_x92 + _x21*_x89 + _x21*_x90 + _x21*_x91 + _x21*_x92 + _x89 + _x90) + theta_dot*(_x18*_x88 + _x21*_x88 + _x64) + theta_dot*(_x18*_x93 + _x18*_x94 + _x18*_x95 + _x18*_x96 + _x21*_x93 + _x21*_x94 + _x21*_x95 + _x21*_x96 + _x93 + _x94) + x_dot*(_x47 + _x84*fv_omega_l + _x84*fv_omega_r) + y_dot*(_x52 + _x85*fv_omega_l + _x85*fv_omega_r),
+        _x97,
+        _k50*_x1 + _k51 + _x97,
+        _k48,
+        _k49,
+        1,
+        0,
+        0,
+        _k48,
+        _k49,
+        1,
+        _k52*_x4,
+        0,
+    )
+
+
+def eval_all_batch(fq, fv, k):
+    fq = np.atleast_2d(np.asarray(fq, dtype=float))
+    n = fq.shape[0]
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq.T
+    fv_omega_l, fv_omega_r = np.broadcast_to(np.asarray(fv, dtype=float), (n, 2)).T
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = np.cos(phi)
+    _x1 = np.cos(theta)
+    _x2 = _k1*_x1
+    _x3 = _x0*_x2
+    _x4 = np.sin(theta)
+    _x5 = _k2*_x4
+    _x6 = _x0*_x5
+    _x7 = _x3 + _x6
+    _x8 = np.sin(phi)
+    _x9 = _k2*_x1
+    _x10 = _k4*_x4
+    _x11 = _x10*_x8 + _x8*_x9
+    _x12 = _k3*_x0 + _x11
+    _x13 = _x2*_x8 + _x5*_x8
+    _x14 = _x0*_x4
+    _x15 = _x0*_x1
+    _x16 = _k1*_x14 + _k3*_x8 + _k5*_x15
+    _x17 = _x10 + _x9
+    _x18 = _x0**2
+    _x19 = _x4**2
+    _x20 = _k6*_x19
+    _x21 = _x8**2
+    _x22 = _x1**2
+    _x23 = _k7*_x22
+    _x24 = _x1*_x4
+    _x25 = _k8*_x24
+    _x26 = _k9*_x24
+    _x27 = _k6*_x22
+    _x28 = _k7*_x19
+    _x29 = _x27 + _x28
+    _x30 = _k11*_x4
+    _x31 = _k12*_x1
+    _x32 = _x18*_x30 + _x18*_x31 + _x21*_x30 + _x21*_x31
+    _x33 = _k22*_x0
+    _x34 = _k4*_x1
+    _x35 = _x8*theta_dot
+    _x36 = _k5*_x4
+    _x37 = _x8*phi_dot
+    _x38 = theta_dot**2
+    _x39 = _x0*_x10 + _x0*_x9
+    _x40 = phi_dot**2
+    _x41 = _k19*_x14
+    _x42 = _k19*_x1
+    _x43 = _k17*_x14 + _x0*_x42
+    _x44 = _k16*_x8
+    _x45 = _k17*_x1
+    _x46 = _k18*_x4
+    _x47 = _k15*_x0 + _x45*_x8 + _x46*_x8
+    _x48 = _k22*_x8
+    _x49 = _x4*_x8
+    _x50 = _k17*_x49 + _x42*_x8
+    _x51 = _k23*_x0
+    _x52 = _k15*_x8 + _k24*_x15 + _x41
+    _x53 = _x45 + _x46
+    _x54 = _k42*fv_omega_l
+    _x55 = _k42*fv_omega_r
+    _x56 = _k43*_x4
+    _x57 = _x21*_x56
+    _x58 = _x18*fv_omega_l
+    _x59 = _x18*fv_omega_r
+    _x60 = _k44*_x1
+    _x61 = _x21*_x60
+    _x62 = _k27*_x4
+    _x63 = _k28*_x1
+    _x64 = _x18*_x62 + _x18*_x63 + _x21*_x62 + _x21*_x63
+    _x65 = _k36*_x24
+    _x66 = _k6*_x24
+    _x67 = _k37*_x19
+    _x68 = _k38*_x22
+    _x69 = _x18*_x65 + _x18*_x66 + _x18*_x67 + _x18*_x68 + _x21*_x65 + _x21*_x66 + _x21*_x67 + _x21*_x68
+    _x70 = _k37*_x22
+    _x71 = _k38*_x19
+    _x72 = _k39*_x24
+    _x73 = _k7*_x24
+    _x74 = _k30*_x22
+    _x75 = _k31*_x19
+    _x76 = _k34*_x24
+    _x77 = _k30*_x19
+    _x78 = _k31*_x22
+    _x79 = _k32*_x19
+    _x80 = _k31*_x24
+    _x81 = _k35*_x24
+    _x82 = _k47*fv_omega_l
+    _x83 = _k47*fv_omega_r
+    _x84 = _k23*_x8
+    _x85 = _k16*_x0
+    _x86 = _k11*_x1
+    _x87 = _k46*_x4
+    _x88 = _k28*_x4
+    _x89 = _x72*theta_dot
+    _x90 = _x73*theta_dot
+    _x91 = _x70*theta_dot
+    _x92 = _x71*theta_dot
+    _x93 = _x72*phi_dot
+    _x94 = _x73*phi_dot
+    _x95 = _x70*phi_dot
+    _x96 = _x71*phi_dot
+    _x97 = _k48*x + _k49*y + z
+
+    M = np.zeros((n, 5, 5))
+    M[:, 0, 0] = _k0
+    M[:, 0, 3] = _x7
+    M[:, 0, 4] = _x12
+    M[:, 1, 1] = _k0
+    M[:, 1, 3] = _x13
+    M[:, 1, 4] = _x16
+    M[:, 2, 2] = _k0
+    M[:, 2, 3] = _x17
+    M[:, 3, 0] = _x7
+    M[:, 3, 1] = _x13
+    M[:, 3, 2] = _x17
+    M[:, 3, 3] = _k10 + _x18*_x20 + _x18*_x23 + _x18*_x26 + _x20*_x21 + _x21*_x23 + _x21*_x26 + _x25 + _x29
+    M[:, 3, 4] = _x32
+    M[:, 4, 0] = _x12
+    M[:, 4, 1] = _x16
+    M[:, 4, 3] = _x32
+    M[:, 4, 4] = _k13*_x18 + _k13*_x21 + _k14 + _x18*_x25 + _x18*_x27 + _x18*_x28 + _x21*_x25 + _x21*_x27 + _x21*_x28 + _x29
+    H = np.zeros((n, 5))
+    H[:, 0] = _k21*x_dot + _x33*fv_omega_l + _x33*fv_omega_r + _x38*_x39 + _x40*(_k20*_x8 + _x39) + phi_dot*(_x34*_x35 + _x35*_x36) + phi_dot*(_x44*fv_omega_l + _x44*fv_omega_r + _x47) + theta_dot*(_x41 + _x43) + theta_dot*(_x34*_x37 + _x36*_x37)
+    H[:, 1] = _k21*y_dot + _x11*_x38 + _x12*_x40 + _x48*fv_omega_l + _x48*fv_omega_r + phi_dot*(_x3*theta_dot + _x6*theta_dot) + phi_dot*(_x51*fv_omega_l + _x51*fv_omega_r + _x52) + theta_dot*(_k19*_x49 + _x50) + theta_dot*(_x3*phi_dot + _x6*phi_dot)
+    H[:, 2] = _k25*z_dot + _k26 + _x38*(_x34 + _x36) + theta_dot*(_x42 + _x53)
+    H[:, 3] = _k40*_x1 + _k41*_x4 + _x18*_x54 + _x18*_x55 + _x21*_x54 + _x21*_x55 + _x38*(_x69 + _x70 + _x71 + _x72 + _x73) + _x40*(_x65 + _x66 + _x69) + _x43*x_dot + _x50*y_dot + _x53*z_dot + _x56*_x58 + _x56*_x59 + _x57*fv_omega_l + _x57*fv_omega_r + _x58*_x60 + _x59*_x60 + _x61*fv_omega_l + _x61*fv_omega_r + _x64*phi_dot + theta_dot*(_k29*_x18 + _k29*_x21 + _k32*_x22 + _k33*_x24 + _x18*_x77 + _x18*_x78 + _x18*_x79 + _x18*_x80 + _x18*_x81 + _x21*_x77 + _x21*_x78 + _x21*_x79 + _x21*_x80 + _x21*_x81 + _x74 + _x75 + _x76)
+    H[:, 4] = _x18*_x82 + _x18*_x83 + _x21*_x82 + _x21*_x83 + _x38*(_x18*_x86 + _x18*_x87 + _x21*_x86 + _x21*_x87) + phi_dot*(_k45*_x18 + _k45*_x21 + _x18*_x74 + _x18*_x75 + _x18*_x76 + _x21*_x74 + _x21*_x75 + _x21*_x76) + phi_dot*(_x18*_x89 + _x18*_x90 + _x18*_x91 + _x18*_x92 + _x21*_x89 + _x21*_x90 + _x21*_x91 + _x21*_x92 + _x89 + _x90) + theta_dot*(_x18*_x88 + _x21*_x88 + _x64) + theta_dot*(_x18*_x93 + _x18*_x94 + _x18*_x95 + _x18*_x96 + _x21*_x93 + _x21*_x94 + _x21*_x95 + _x21*_x96 + _x93 + _x94) + x_dot*(_x47 + _x84*fv_omega_l + _x84*fv_omega_r) + y_dot*(_x52 + _x85*fv_omega_l + _x85*fv_omega_r)
+    Cons = np.zeros((n, 2))
+    Cons[:, 0] = _x97
+    Cons[:, 1] = _k50*_x1 + _k51 + _x97
+    Cons_gradq = np.zeros((n, 2, 5))
+    Cons_gradq[:, 0, 0] = _k48
+    Cons_gradq[:, 0, 1] = _k49
+    Cons_gradq[:, 0, 2] = 1
+    Cons_gradq[:, 1, 0] = _k48
+    Cons_gradq[:, 1, 1] = _k49
+    Cons_gradq[:, 1, 2] = 1
+    Cons_gradq[:, 1, 3] = _k52*_x4
+    return M, H, Cons, Cons_gradq
+
+
+def eval_kinematics(fq, fv, k):
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq
+    fv_omega_l, fv_omega_r = fv
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = math.cos(phi)
+    _x1 = _k53*(fv_omega_l + fv_omega_r)
+    _x2 = _x0*_x1 + x_dot
+    _x3 = math.sin(phi)
+    _x4 = _x1*_x3 + y_dot
+    _x5 = _k54*_x3
+    _x6 = math.cos(theta)
+    _x7 = _k55*_x6
+    _x8 = _x0*_x7
+    _x9 = math.sin(theta)
+    _x10 = _k56*_x9
+    _x11 = _x0*_x10
+    _x12 = _k56*_x6
+    _x13 = _k58*_x9
+    _x14 = _x0*theta_dot
+    _x15 = _k58*_x6
+    _x16 = _x3*phi_dot
+    _x17 = _k59*_x9
+    _x18 = _x3*theta_dot
+
+    Xo = np.array([
+        x,
+        y,
+        z,
+    ])
+    Xo_dot = np.array([
+        _x2,
+        _x4,
+        z_dot,
+    ])
+    Xc = np.array([
+        _x11 + _x5 + _x8 + x,
+        _k57*_x0 + _x10*_x3 + _x3*_x7 + y,
+        _x12 + _x13 + z,
+    ])
+    Xc_dot = np.array([
+        _k54*_x0*phi_dot + _x12*_x14 + _x13*_x14 + _x15*_x16 + _x16*_x17 + _x2,
+        _x11*phi_dot + _x12*_x18 + _x13*_x18 + _x4 + _x5*phi_dot + _x8*phi_dot,
+        _x15*theta_dot + _x17*theta_dot + z_dot,
+    ])
+    return Xo, Xo_dot, Xc, Xc_dot
+
+
+def eval_kinematics_into(fq, fv, k, out):
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq
+    fv_omega_l, fv_omega_r = fv
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = math.cos(phi)
+    _x1 = _k53*(fv_omega_l + fv_omega_r)
+    _x2 = _x0*_x1 + x_dot
+    _x3 = math.sin(phi)
+    _x4 = _x1*_x3 + y_dot
+    _x5 = _k54*_x3
+    _x6 = math.cos(theta)
+    _x7 = _k55*_x6
+    _x8 = _x0*_x7
+    _x9 = math.sin(theta)
+    _x10 = _k56*_x9
+    _x11 = _x0*_x10
+    _x12 = _k56*_x6
+    _x13 = _k58*_x9
+    _x14 = _x0*theta_dot
+    _x15 = _k58*_x6
+    _x16 = _x3*phi_dot
+    _x17 = _k59*_x9
+    _x18 = _x3*theta_dot
+
+    out[:] = (
+        x,
+        y,
+        z,
+        _x2,
+        _x4,
+        z_dot,
+        _x11 + _x5 + _x8 + x,
+        _k57*_x0 + _x10*_x3 + _x3*_x7 + y,
+        _x12 + _x13 + z,
+        _k54*_x0*phi_dot + _x12*_x14 + _x13*_x14 + _x15*_x16 + _x16*_x17 + _x2,
+        _x11*phi_dot + _x12*_x18 + _x13*_x18 + _x4 + _x5*phi_dot + _x8*phi_dot,
+        _x15*theta_dot + _x17*theta_dot + z_dot,
+    )
+
+
+def eval_kinematics_batch(fq, fv, k):
+    fq = np.atleast_2d(np.asarray(fq, dtype=float))
+    n = fq.shape[0]
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq.T
+    fv_omega_l, fv_omega_r = np.broadcast_to(np.asarray(fv, dtype=float), (n, 2)).T
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = np.cos(phi)
+    _x1 = _k53*(fv_omega_l + fv_omega_r)
+    _x2 = _x0*_x1 + x_dot
+    _x3 = np.sin(phi)
+    _x4 = _x1*_x3 + y_dot
+    _x5 = _k54*_x3
+    _x6 = np.cos(theta)
+    _x7 = _k55*_x6
+    _x8 = _x0*_x7
+    _x9 = np.sin(theta)
+    _x10 = _k56*_x9
+    _x11 = _x0*_x10
+    _x12 = _k56*_x6
+    _x13 = _k58*_x9
+    _x14 = _x0*theta_dot
+    _x15 = _k58*_x6
+    _x16 = _x3*phi_dot
+    _x17 = _k59*_x9
+    _x18 = _x3*theta_dot
+
+    Xo = np.zeros((n, 3))
+    Xo[:, 0] = x
+    Xo[:, 1] = y
+    Xo[:, 2] = z
+    Xo_dot = np.zeros((n, 3))
+    Xo_dot[:, 0] = _x2
+    Xo_dot[:, 1] = _x4
+    Xo_dot[:, 2] = z_dot
+    Xc = np.zeros((n, 3))
+    Xc[:, 0] = _x11 + _x5 + _x8 + x
+    Xc[:, 1] = _k57*_x0 + _x10*_x3 + _x3*_x7 + y
+    Xc[:, 2] = _x12 + _x13 + z
+    Xc_dot = np.zeros((n, 3))
+    Xc_dot[:, 0] = _k54*_x0*phi_dot + _x12*_x14 + _x13*_x14 + _x15*_x16 + _x16*_x17 + _x2
+    Xc_dot[:, 1] = _x11*phi_dot + _x12*_x18 + _x13*_x18 + _x4 + _x5*phi_dot + _x8*phi_dot
+    Xc_dot[:, 2] = _x15*theta_dot + _x17*theta_dot + z_dot
+    return Xo, Xo_dot, Xc, Xc_dot
+
+
+def eval_jacobian(fq, fv, k):
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq
+    fv_omega_l, fv_omega_r = fv
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = math.cos(phi)
+    _x1 = math.cos(theta)
+    _x2 = _k1*_x1
+    _x3 = _x0*_x2
+    _x4 = math.sin(theta)
+    _x5 = _k2*_x4
+    _x6 = _x0*_x5
+    _x7 = _x3 + _x6
+    _x8 = math.sin(phi)
+    _x9 = _k2*_x1
+    _x10 = _k4*_x4
+    _x11 = _x10*_x8 + _x8*_x9
+    _x12 = _k3*_x0 + _x11
+    _x13 = _x2*_x8 + _x5*_x8
+    _x14 = _k1*_x4
+    _x15 = _k5*_x1
+    _x16 = _k3*_x8 + _x0*_x14 + _x0*_x15
+    _x17 = _x10 + _x9
+    _x18 = _x0**2
+    _x19 = _x4**2
+    _x20 = _k6*_x19
+    _x21 = _x18*_x20
+    _x22 = _x8**2
+    _x23 = _x20*_x22
+    _x24 = _x1**2
+    _x25 = _k7*_x24
+    _x26 = _x18*_x25
+    _x27 = _x22*_x25
+    _x28 = _x1*_x4
+    _x29 = _k8*_x28
+    _x30 = _k9*_x28
+    _x31 = _k6*_x24
+    _x32 = _k7*_x19
+    _x33 = _x31 + _x32
+    _x34 = _k11*_x4
+    _x35 = _k12*_x1
+    _x36 = _x18*_x34 + _x18*_x35 + _x22*_x34 + _x22*_x35
+    _x37 = _x18*_x31 + _x18*_x32 + _x22*_x31 + _x22*_x32
+    _x38 = _x33 + _x37
+    _x39 = _k22*_x0
+    _x40 = _k4*_x1
+    _x41 = _x40*_x8
+    _x42 = _k5*_x4
+    _x43 = _x42*_x8
+    _x44 = _x41*theta_dot + _x43*theta_dot
+    _x45 = _x41*phi_dot + _x43*phi_dot
+    _x46 = theta_dot**2
+    _x47 = _x0*_x9
+    _x48 = _x0*_x10
+    _x49 = _x47 + _x48
+    _x50 = phi_dot**2
+    _x51 = _k20*_x8 + _x49
+    _x52 = _x0*_x4
+    _x53 = _k19*_x52
+    _x54 = _k19*_x1
+    _x55 = _x0*_x54
+    _x56 = _k17*_x52 + _x55
+    _x57 = _x53 + _x56
+    _x58 = _k16*_x8
+    _x59 = _k17*_x1
+    _x60 = _k18*_x4
+    _x61 = _x60*_x8
+    _x62 = _x59*_x8 + _x61
+    _x63 = _k15*_x0 + _x62
+    _x64 = _x58*fv_omega_l + _x58*fv_omega_r + _x63
+    _x65 = _x39*fv_omega_l + _x39*fv_omega_r + _x44*phi_dot + _x45*theta_dot + _x46*_x49 + _x50*_x51 + _x57*theta_dot + _x64*phi_dot
+    _x66 = _k22*_x8
+    _x67 = _x3*theta_dot + _x6*theta_dot
+    _x68 = _x3*phi_dot + _x6*phi_dot
+    _x69 = _x4*_x8
+    _x70 = _x54*_x8
+    _x71 = _k17*_x69 + _x70
+    _x72 = _k19*_x69 + _x71
+    _x73 = _k23*_x0
+    _x74 = _x73*fv_omega_l + _x73*fv_omega_r
+    _x75 = _k15*_x8 + _k24*_x0*_x1 + _x53
+    _x76 = _x74 + _x75
+    _x77 = _x40 + _x42
+    _x78 = _x59 + _x60
+    _x79 = _x54 + _x78
+    _x80 = _k42*_x22
+    _x81 = _k42*_x18
+    _x82 = _k43*_x4
+    _x83 = _x22*_x82
+    _x84 = _x18*_x82
+    _x85 = _k44*_x1
+    _x86 = _x22*_x85
+    _x87 = _x18*_x85
+    _x88 = _k27*_x4
+    _x89 = _k28*_x1
+    _x90 = _x18*_x89 + _x22*_x89
+    _x91 = _x18*_x88 + _x22*_x88 + _x90
+    _x92 = _k36*_x28
+    _x93 = _k6*_x28
+    _x94 = _k37*_x19
+    _x95 = _k38*_x24
+    _x96 = _x18*_x92 + _x18*_x93 + _x18*_x94 + _x18*_x95 + _x22*_x92 + _x22*_x93 + _x22*_x94 + _x22*_x95
+    _x97 = _x92 + _x93 + _x96
+    _x98 = _k37*_x24
+    _x99 = _k38*_x19
+    _x100 = _k39*_x28
+    _x101 = _k7*_x28
+    _x102 = _x100 + _x101
+    _x103 = _x102 + _x96 + _x98 + _x99
+    _x104 = _k30*_x24
+    _x105 = _k30*_x19
+    _x106 = _k32*_x19
+    _x107 = _k31*_x28
+    _x108 = _k31*_x19
+    _x109 = _k31*_x24
+    _x110 = _k34*_x28
+    _x111 = _k35*_x28
+    _x112 = _x108 + _x109*_x18 + _x109*_x22 + _x110 + _x111*_x18 + _x111*_x22
+    _x113 = _k29*_x18 + _k29*_x22 + _k32*_x24 + _k33*_x28 + _x104 + _x105*_x18 + _x105*_x22 + _x106*_x18 + _x106*_x22 + _x107*_x18 + _x107*_x22 + _x112
+    _x114 = _k47*_x22
+    _x115 = _k47*_x18
+    _x116 = _k23*_x8
+    _x117 = _x116*fv_omega_l + _x116*fv_omega_r + _x63
+    _x118 = _k16*_x0
+    _x119 = _x118*fv_omega_l + _x118*fv_omega_r
+    _x120 = _x119 + _x75
+    _x121 = _k11*_x1
+    _x122 = _k46*_x4
+    _x123 = _x121*_x18 + _x121*_x22 + _x122*_x18 + _x122*_x22
+    _x124 = _k28*_x4
+    _x125 = _x124*_x18 + _x124*_x22 + _x91
+    _x126 = _k45*_x18 + _k45*_x22 + _x104*_x18 + _x104*_x22 + _x108*_x18 + _x108*_x22 + _x110*_x18 + _x110*_x22
+    _x127 = _x100*theta_dot
+    _x128 = _x101*theta_dot
+    _x129 = _x22*_x98
+    _x130 = _x18*_x98
+    _x131 = _x22*_x99
+    _x132 = _x18*_x99
+    _x133 = _x127*_x18 + _x127*_x22 + _x127 + _x128*_x18 + _x128*_x22 + _x128 + _x129*theta_dot + _x130*theta_dot + _x131*theta_dot + _x132*theta_dot
+    _x134 = _x100*phi_dot
+    _x135 = _x101*phi_dot
+    _x136 = _x129*phi_dot + _x130*phi_dot + _x131*phi_dot + _x132*phi_dot + _x134*_x18 + _x134*_x22 + _x134 + _x135*_x18 + _x135*_x22 + _x135
+    _x137 = _x41 + _x43
+    _x138 = _k8*_x24
+    _x139 = _k9*_x19
+    _x140 = _k8*_x19
+    _x141 = _k9*_x24
+    _x142 = _k62*_x28
+    _x143 = _k63*_x28
+    _x144 = _k60*_x28
+    _x145 = _k61*_x28
+    _x146 = _x144 + _x145
+    _x147 = _k18*_x1
+    _x148 = _k24*_x4
+    _x149 = _x147*_x8 + _x148*_x8
+    _x150 = _x14*_x8
+    _x151 = _x15*_x8
+    _x152 = _x0*_x40
+    _x153 = _x0*_x42
+    _x154 = _x152 + _x153
+    _x155 = _x0*_x59 + _x0*_x60
+    _x156 = 2*theta_dot
+    _x157 = _k65*_x8
+    _x158 = _x150 + _x151
+    _x159 = _k64*_x8 + _x155
+    _x160 = 2*phi_dot
+    _x161 = _x147 + _x148
+    _x162 = _k43*_x1
+    _x163 = _x162*_x22
+    _x164 = _x18*fv_omega_l
+    _x165 = _x18*fv_omega_r
+    _x166 = _k74*_x4
+    _x167 = _x166*_x22
+    _x168 = _k27*_x1
+    _x169 = _k66*_x4
+    _x170 = _x168*_x18 + _x168*_x22 + _x169*_x18 + _x169*_x22
+    _x171 = _k36*_x24
+    _x172 = _k39*_x19
+    _x173 = _k71*_x28
+    _x174 = _x171*_x18 + _x171*_x22 + _x172*_x18 + _x172*_x22 + _x173*_x18 + _x173*_x22
+    _x175 = _k36*_x19
+    _x176 = _k39*_x24
+    _x177 = _k72*_x28
+    _x178 = _k34*_x24
+    _x179 = _k35*_x19
+    _x180 = _k33*_x19
+    _x181 = _k34*_x19
+    _x182 = _k35*_x24
+    _x183 = _k67*_x28
+    _x184 = _k68*_x28
+    _x185 = _k69*_x28
+    _x186 = _k70*_x28
+    _x187 = _x149*x_dot + _x56*y_dot
+    _x188 = _x175*theta_dot
+    _x189 = _x176*theta_dot
+    _x190 = _x177*theta_dot
+    _x191 = _x175*phi_dot
+    _x192 = _x176*phi_dot
+    _x193 = _x177*phi_dot
+    _x194 = _k46*_x1
+    _x195 = _k75*_x4
+    _x196 = _x100*_x18 + _x100*_x22 + _x101*_x18 + _x101*_x22 + _x102 + _x129 + _x130 + _x131 + _x132
+    _x197 = _x39 + _x58*phi_dot
+    _x198 = _x66 + _x73*phi_dot
+    _x199 = _x80 + _x81 + _x83 + _x84 + _x86 + _x87
+    _x200 = _x114 + _x115 + _x116*x_dot + _x118*y_dot
+
+    M = np.array([
+        [_k0, 0, 0, _x7, _x12],
+        [0, _k0, 0, _x13, _x16],
+        [0, 0, _k0, _x17, 0],
+        [_x7, _x13, _x17, _k10 + _x18*_x30 + _x21 + _x22*_x30 + _x23 + _x26 + _x27 + _x29 + _x33, _x36],
+        [_x12, _x16, 0, _x36, _k13*_x18 + _k13*_x22 + _k14 + _x18*_x29 + _x22*_x29 + _x38],
+    ])
+    H = np.array([
+        _k21*x_dot + _x65,
+        _k21*y_dot + _x11*_x46 + _x12*_x50 + _x66*fv_omega_l + _x66*fv_omega_r + _x67*phi_dot + _x68*theta_dot + _x72*theta_dot + _x76*phi_dot,
+        _k25*z_dot + _k26 + _x46*_x77 + _x79*theta_dot,
+        _k40*_x1 + _k41*_x4 + _x103*_x46 + _x113*theta_dot + _x50*_x97 + _x56*x_dot + _x71*y_dot + _x78*z_dot + _x80*fv_omega_l + _x80*fv_omega_r + _x81*fv_omega_l + _x81*fv_omega_r + _x83*fv_omega_l + _x83*fv_omega_r + _x84*fv_omega_l + _x84*fv_omega_r + _x86*fv_omega_l + _x86*fv_omega_r + _x87*fv_omega_l + _x87*fv_omega_r + _x91*phi_dot,
+        _x114*fv_omega_l + _x114*fv_omega_r + _x115*fv_omega_l + _x115*fv_omega_r + _x117*x_dot + _x120*y_dot + _x123*_x46 + _x125*theta_dot + _x126*phi_dot + _x133*phi_dot + _x136*theta_dot,
+    ])
+    M_gradf = np.array([
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, _x49, 0, _x137, 0],
+        [0, 0, 0, 0, 0, 0, _x137, 0, _x51, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, _x11, 0, _x7, 0],
+        [0, 0, 0, 0, 0, 0, _x7, 0, _x12, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, _x77, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, _x49, 0, _x137, 0],
+        [0, 0, 0, 0, 0, 0, _x11, 0, _x7, 0],
+        [0, 0, 0, 0, 0, 0, _x77, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, _x138 + _x139 + _x140*_x18 + _x140*_x22 + _x141*_x18 + _x141*_x22 + _x142*_x18 + _x142*_x22 + _x143*_x18 + _x143*_x22 + _x146, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, _x123, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, _x137, 0, _x51, 0],
+        [0, 0, 0, 0, 0, 0, _x7, 0, _x12, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, _x123, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, _x138*_x18 + _x138*_x22 + _x139*_x18 + _x139*_x22 + _x144*_x18 + _x144*_x22 + _x145*_x18 + _x145*_x22 + _x146, 0, 0, 0],
+    ])
+    H_gradf = np.array([
+        [0, _k21, 0, 0, 0, 0, _x149*phi_dot + _x154*_x46 + _x154*_x50 + phi_dot*(_x150*theta_dot + _x151*theta_dot) + theta_dot*(_x155 + _x55) + theta_dot*(_x150*phi_dot + _x151*phi_dot), _x137*phi_dot + _x156*_x49 + _x45 + _x57, _x157*fv_omega_l + _x157*fv_omega_r + _x158*_x46 + _x50*(_k20*_x0 + _x158) + phi_dot*(_x119 + _x159) + phi_dot*(_x152*theta_dot + _x153*theta_dot) + theta_dot*(_x149 + _x61) + theta_dot*(_x152*phi_dot + _x153*phi_dot), _x137*theta_dot + _x160*_x51 + _x44 + _x64],
+        [0, 0, 0, _k21, 0, 0, _x137*_x46 + _x137*_x50 + _x56*phi_dot + phi_dot*(_x47*theta_dot + _x48*theta_dot) + theta_dot*(_x62 + _x70) + theta_dot*(_x47*phi_dot + _x48*phi_dot), _x11*_x156 + _x68 + _x7*phi_dot + _x72, _x65, _x12*_x160 + _x67 + _x7*theta_dot + _x76],
+        [0, 0, 0, 0, 0, _k25, _x46*(_x14 + _x15) + theta_dot*(_x161 + _x60), _x156*_x77 + _x79, 0, 0],
+        [0, _x56, 0, _x71, 0, _x78, _k41*_x1 + _k73*_x4 + _x155*x_dot + _x161*z_dot + _x162*_x164 + _x162*_x165 + _x163*fv_omega_l + _x163*fv_omega_r + _x164*_x166 + _x165*_x166 + _x167*fv_omega_l + _x167*fv_omega_r + _x170*phi_dot + _x46*(_x174 + _x175 + _x176 + _x177 + _x20 + _x25 + _x37) + _x50*(_x171 + _x172 + _x174 + _x38) + _x62*y_dot + theta_dot*(_k33*_x24 + _x112 + _x178 + _x179 + _x18*_x180 + _x18*_x181 + _x18*_x182 + _x18*_x185 + _x18*_x186 + _x180*_x22 + _x181*_x22 + _x182*_x22 + _x183 + _x184 + _x185*_x22 + _x186*_x22), _x103*_x156 + _x113, _x187, _x160*_x97 + _x91],
+        [0, _x117, 0, _x120, 0, 0, _x187 + _x46*(_x18*_x194 + _x18*_x195 + _x194*_x22 + _x195*_x22) + phi_dot*(_x178*_x18 + _x178*_x22 + _x179*_x18 + _x179*_x22 + _x18*_x183 + _x18*_x184 + _x183*_x22 + _x184*_x22) + phi_dot*(_x18*_x188 + _x18*_x189 + _x18*_x190 + _x188*_x22 + _x188 + _x189*_x22 + _x189 + _x190*_x22 + _x20*theta_dot + _x21*theta_dot + _x23*theta_dot + _x25*theta_dot + _x26*theta_dot + _x27*theta_dot) + theta_dot*(_x170 + _x90) + theta_dot*(_x18*_x191 + _x18*_x192 + _x18*_x193 + _x191*_x22 + _x191 + _x192*_x22 + _x192 + _x193*_x22 + _x20*phi_dot + _x21*phi_dot + _x23*phi_dot + _x25*phi_dot + _x26*phi_dot + _x27*phi_dot), _x123*_x156 + _x125 + _x136 + _x196*phi_dot, _x117*y_dot + x_dot*(_x159 + _x74), _x126 + _x133 + _x196*theta_dot],
+    ])
+    M_gradfv = np.array([
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+        [0, 0],
+    ])
+    H_gradfv = np.array([
+        [_x197, _x197],
+        [_x198, _x198],
+        [0, 0],
+        [_x199, _x199],
+        [_x200, _x200],
+    ])
+    return M, H, M_gradf, H_gradf, M_gradfv, H_gradfv
+
+
+def eval_jacobian_into(fq, fv, k, out):
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq
+    fv_omega_l, fv_omega_r = fv
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = math.cos(phi)
+    _x1 = math.cos(theta)
+    _x2 = _k1*_x1
+    _x3 = _x0*_x2
+    _x4 = math.sin(theta)
+    _x5 = _k2*_x4
+    _x6 = _x0*_x5
+    _x7 = _x3 + _x6
+    _x8 = math.sin(phi)
+    _x9 = _k2*_x1
+    _x10 = _k4*_x4
+    _x11 = _x10*_x8 + _x8*_x9
+    _x12 = _k3*_x0 + _x11
+    _x13 = _x2*_x8 + _x5*_x8
+    _x14 = _k1*_x4
+    _x15 = _k5*_x1
+    _x16 = _k3*_x8 + _x0*_x14 + _x0*_x15
+    _x17 = _x10 + _x9
+    _x18 = _x0**2
+    _x19 = _x4**2
+    _x20 = _k6*_x19
+    _x21 = _x18*_x20
+    _x22 = _x8**2
+    _x23 = _x20*_x22
+    _x24 = _x1**2
+    _x25 = _k7*_x24
+    _x26 = _x18*_x25
+    _x27 = _x22*_x25
+    _x28 = _x1*_x4
+    _x29 = _k8*_x28
+    _x30 = _k9*_x28
+    _x31 = _k6*_x24
+    _x32 = _k7*_x19
+    _x33 = _x31 + _x32
+    _x34 = _k11*_x4
+    _x35 = _k12*_x1
+    _x36 = _x18*_x34 + _x18*_x35 + _x22*_x34 + _x22*_x35
+    _x37 = _x18*_x31 + _x18*_x32 + _x22*_x31 + _x22*_x32
+    _x38 = _x33 + _x37
+    _x39 = _k22*_x0
+    _x40 = _k4*_x1
+    _x41 = _x40*_x8
+    _x42 = _k5*_x4
+    _x43 = _x42*_x8
+    _x44 = _x41*theta_dot + _x43*theta_dot
+    _x45 = _x41*phi_dot + _x43*phi_dot
+    _x46 = theta_dot**2
+    _x47 = _x0*_x9
+    _x48 = _x0*_x10
+    _x49 = _x47 + _x48
+    _x50 = phi_dot**2
+    _x51 = _k20*_x8 + _x49
+    _x52 = _x0*_x4
+    _x53 = _k19*_x52
+    _x54 = _k19*_x1
+    _x55 = _x0*_x54
+    _x56 = _k17*_x52 + _x55
+    _x57 = _x53 + _x56
+    _x58 = _k16*_x8
+    _x59 = _k17*_x1
+    _x60 = _k18*_x4
+    _x61 = _x60*_x8
+    _x62 = _x59*_x8 + _x61
+    _x63 = _k15*_x0 + _x62
+    _x64 = _x58*fv_omega_l + _x58*fv_omega_r + _x63
+    _x65 = _x39*fv_omega_l + _x39*fv_omega_r + _x44*phi_dot + _x45*theta_dot + _x46*_x49 + _x50*_x51 + _x57*theta_dot + _x64*phi_dot
+    _x66 = _k22*_x8
+    _x67 = _x3*theta_dot + _x6*theta_dot
+    _x68 = _x3*phi_dot + _x6*phi_dot
+    _x69 = _x4*_x8
+    _x70 = _x54*_x8
+    _x71 = _k17*_x69 + _x70
+    _x72 = _k19*_x69 + _x71
+    _x73 = _k23*_x0
+    _x74 = _x73*fv_omega_l + _x73*fv_omega_r
+    _x75 = _k15*_x8 + _k24*_x0*_x1 + _x53
+    _x76 = _x74 + _x75
+    _x77 = _x40 + _x42
+    _x78 = _x59 + _x60
+    _x79 = _x54 + _x78
+    _x80 = _k42*_x22
+    _x81 = _k42*_x18
+    _x82 = _k43*_x4
+    _x83 = _x22*_x82
+    _x84 = _x18*_x82
+    _x85 = _k44*_x1
+    _x86 = _x22*_x85
+    _x87 = _x18*_x85
+    _x88 = _k27*_x4
+    _x89 = _k28*_x1
+    _x90 = _x18*_x89 + _x22*_x89
+    _x91 = _x18*_x88 + _x22*_x88 + _x90
+    _x92 = _k36*_x28
+    _x93 = _k6*_x28
+    _x94 = _k37*_x19
+    _x95 = _k38*_x24
+    _x96 = _x18*_x92 + _x18*_x93 + _x18*_x94 + _x18*_x95 + _x22*_x92 + _x22*_x93 + _x22*_x94 + _x22*_x95
+    _x97 = _x92 + _x93 + _x96
+    _x98 = _k37*_x24
+    _x99 = _k38*_x19
+    _x100 = _k39*_x28
+    _x101 = _k7*_x28
+    _x102 = _x100 + _x101
+    _x103 = _x102 + _x96 + _x98 + _x99
+    _x104 = _k30*_x24
+    _x105 = _k30*_x19
+    _x106 = _k32*_x19
+    _x107 = _k31*_x28
+    _x108 = _k31*_x19
+    _x109 = _k31*_x24
+    _x110 = _k34*_x28
+    _x111 = _k35*_x28
+    _x112 = _x108 + _x109*_x18 + _x109*_x22 + _x110 + _x111*_x18 + _x111*_x22
+    _x113 = _k29*_x18 + _k29*_x22 + _k32*_x24 + _k33*_x28 + _x104 + _x105*_x18 + _x105*_x22 + _x106*_x18 + _x106*_x22 + _x107*_x18 + _x107*_x22 + _x112
+    _x114 = _k47*_x22
+    _x115 = _k47*_x18
+    _x116 = _k23*_x8
+    _x117 = _x116*fv_omega_l + _x116*fv_omega_r + _x63
+    _x118 = _k16*_x0
+    _x119 = _x118*fv_omega_l + _x118*fv_omega_r
+    _x120 = _x119 + _x75
+    _x121 = _k11*_x1
+    _x122 = _k46*_x4
+    _x123 = _x121*_x18 + _x121*_x22 + _x122*_x18 + _x122*_x22
+    _x124 = _k28*_x4
+    _x125 = _x124*_x18 + _x124*_x22 + _x91
+    _x126 = _k45*_x18 + _k45*_x22 + _x104*_x18 + _x104*_x22 + _x108*_x18 + _x108*_x22 + _x110*_x18 + _x110*_x22
+    _x127 = _x100*theta_dot
+    _x128 = _x101*theta_dot
+    _x129 = _x22*_x98
+    _x130 = _x18*_x98
+    _x131 = _x22*_x99
+    _x132 = _x18*_x99
+    _x133 = _x127*_x18 + _x127*_x22 + _x127 + _x128*_x18 + _x128*_x22 + _x128 + _x129*theta_dot + _x130*theta_dot + _x131*theta_dot + _x132*theta_dot
+    _x134 = _x100*phi_dot
+    _x135 = _x101*phi_dot
+    _x136 = _x129*phi_dot + _x130*phi_dot + _x131*phi_dot + _x132*phi_dot + _x134*_x18 + _x134*_x22 + _x134 + _x135*_x18 + _x135*_x22 + _x135
+    _x137 = _x41 + _x43
+    _x138 = _k8*_x24
+    _x139 = _k9*_x19
+    _x140 = _k8*_x19
+    _x141 = _k9*_x24
+    _x142 = _k62*_x28
+    _x143 = _k63*_x28
+    _x144 = _k60*_x28
+    _x145 = _k61*_x28
+    _x146 = _x144 + _x145
+    _x147 = _k18*_x1
+    _x148 = _k24*_x4
+    _x149 = _x147*_x8 + _x148*_x8
+    _x150 = _x14*_x8
+    _x151 = _x15*_x8
+    _x152 = _x0*_x40
+    _x153 = _x0*_x42
+    _x154 = _x152 + _x153
+    _x155 = _x0*_x59 + _x0*_x60
+    _x156 = 2*theta_dot
+    _x157 = _k65*_x8
+    _x158 = _x150 + _x151
+    _x159 = _k64*_x8 + _x155
+    _x160 = 2*phi_dot
+    _x161 = _x147 + _x148
+    _x162 = _k43*_x1
+    _x163 = _x162*_x22
+    _x164 = _x18*fv_omega_l
+    _x165 = _x18*fv_omega_r
+    _x166 = _k74*_x4
+    _x167 = _x166*_x22
+    _x168 = _k27*_x1
+    _x169 = _k66*_x4
+    _x170 = _x168*_x18 + _x168*_x22 + _x169*_x18 + _x169*_x22
+    _x171 = _k36*_x24
+    _x172 = _k39*_x19
+    _x173 = _k71*_x28
+    _x174 = _x171*_x18 + _x171*_x22 + _x172*_x18 + _x172*_x22 + _x173*_x18 + _x173*_x22
+    _x175 = _k36*_x19
+    _x176 = _k39*_x24
+    _x177 = _k72*_x28
+    _x178 = _k34*_x24
+    _x179 = _k35*_x19
+    _x180 = _k33*_x19
+    _x181 = _k34*_x19
+    _x182 = _k35*_x24
+    _x183 = _k67*_x28
+    _x184 = _k68*_x28
+    _x185 = _k69*_x28
+    _x186 = _k70*_x28
+    _x187 = _x149*x_dot + _x56*y_dot
+    _x188 = _x175*theta_dot
+    _x189 = _x176*theta_dot
+    _x190 = _x177*theta_dot
+    _x191 = _x175*phi_dot
+    _x192 = _x176*phi_dot
+    _x193 = _x177*phi_dot
+    _x194 = _k46*_x1
+    _x195 = _k75*_x4
+    _x196 = _x100*_x18 + _x100*_x22 + _x101*_x18 + _x101*_x22 + _x102 + _x129 + _x130 + _x131 + _x132
+    _x197 = _x39 + _x58*phi_dot
+    _x198 = _x66 + _x73*phi_dot
+    _x199 = _x80 + _x81 + _x83 + _x84 + _x86 + _x87
+    _x200 = _x114 + _x115 + _x116*x_dot + _x118*y_dot
+
+    out[:] = (
+        _k0,
+        0,
+        0,
+        _x7,
+        _x12,
+        0,
+        _k0,
+        0,
+        _x13,
+        _x16,
+        0,
+        0,
+        _k0,
+        _x17,
+        0,
+        _x7,
+        _x13,
+        _x17,
+        _k10 + _x18*_x30 + _x21 + _x22*_x30 + _x23 + _x26 + _x27 + _x29 + _x33,
+        _x36,
+        _x12,
+        _x16,
+        0,
+        _x36,
+        _k13*_x18 + _k13*_x22 + _k14 + _x18*_x29 + _x22*_x29 + _x38,
+        _k21*x_dot + _x65,
+        _k21*y_dot + _x11*_x46 + _x12*_x50 + _x66*fv_omega_l + _x66*fv_omega_r + _x67*phi_dot + _x68*theta_dot + _x72*theta_dot + _x76*phi_dot,
+        _k25*z_dot + _k26 + _x46*_x77 + _x79*theta_dot,
+        _k40*_x1 + _k41*_x4 + _x103*_x46 + _x113*theta_dot + _x50*_x97 + _x56*x_dot + _x71*y_dot + _x78*z_dot + _x80*fv_omega_l + _x80*fv_omega_r + _x81*fv_omega_l + _x81*fv_omega_r + _x83*fv_omega_l + _x83*fv_omega_r + _x84*fv_omega_l + _x84*fv_omega_r + _x86*fv_omega_l + _x86*fv_omega_r + _x87*fv_omega_l + _x87*fv_omega_r + _x91*phi_dot,
+        _x114*fv_omega_l + _x114*fv_omega_r + _x115*fv_omega_l + _x115*fv_omega_r + _x117*x_dot + _x120*y_dot + _x123*_x46 + _x125*theta_dot + _x126*phi_dot + _x133*phi_dot + _x136*theta_dot,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x49,
+        0,
+        _x137,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x137,
+        0,
+        _x51,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x11,
+        0,
+        _x7,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x7,
+        0,
+        _x12,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x77,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x49,
+        0,
+        _x137,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x11,
+        0,
+        _x7,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x77,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x138 + _x139 + _x140*_x18 + _x140*_x22 + _x141*_x18 + _x141*_x22 + _x142*_x18 + _x142*_x22 + _x143*_x18 + _x143*_x22 + _x146,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x123,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x137,
+        0,
+        _x51,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x7,
+        0,
+        _x12,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x123,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x138*_x18 + _x138*_x22 + _x139*_x18 + _x139*_x22 + _x144*_x18 + _x144*_x22 + _x145*_x18 + _x145*_x22 + _x146,
+        0,
+        0,
+        0,
+        0,
+        _k21,
+        0,
+        0,
+        0,
+        0,
+        _x149*phi_dot + _x154*_x46 + _x154*_x50 + phi_dot*(_x150*theta_dot + _x151*theta_dot) + theta_dot*(_x155 + _x55) + theta_dot*(_x150*phi_dot + _x151*phi_dot),
+        _x137*phi_dot + _x156*_x49 + _x45 + _x57,
+        _x157*fv_omega_l + _x157*fv_omega_r + _x158*_x46 + _x50*(_k20*_x0 + _x158) + phi_dot*(_x119 + _x159) + phi_dot*(_x152*theta_dot + _x153*theta_dot) + theta_dot*(_x149 + _x61) + theta_dot*(_x152*phi_dot + _x153*phi_dot),
+        _x137*theta_dot + _x160*_x51 + _x44 + _x64,
+        0,
+        0,
+        0,
+        _k21,
+        0,
+        0,
+        _x137*_x46 + _x137*_x50 + _x56*phi_dot + phi_dot*(_x47*theta_dot + _x48*theta_dot) + theta_dot*(_x62 + _x70) + theta_dot*(_x47*phi_dot + _x48*phi_dot),
+        _x11*_x156 + _x68 + _x7*phi_dot + _x72,
+        _x65,
+        _x12*_x160 + _x67 + _x7*theta_dot + _x76,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _k25,
+        _x46*(_x14 + _x15) + theta_dot*(_x161 + _x60),
+        _x156*_x77 + _x79,
+        0,
+        0,
+        0,
+        _x56,
+        0,
+        _x71,
+        0,
+        _x78,
+        _k41*_x1 + _k73*_x4 + _x155*x_dot + _x161*z_dot + _x162*_x164 + _x162*_x165 + _x163*fv_omega_l + _x163*fv_omega_r + _x164*_x166 + _x165*_x166 + _x167*fv_omega_l + _x167*fv_omega_r + _x170*phi_dot + _x46*(_x174 + _x175 + _x176 + _x177 + _x20 + _x25 + _x37) + _x50*(_x171 + _x172 + _x174 + _x38) + _x62*y_dot + theta_dot*(_k33*_x24 + _x112 + _x178 + _x179 + _x18*_x180 + _x18*_x181 + _x18*_x182 + _x18*_x185 + _x18*_x186 + _x180*_x22 + _x181*_x22 + _x182*_x22 + _x183 + _x184 + _x185*_x22 + _x186*_x22),
+        _x103*_x156 + _x113,
+        _x187,
+        _x160*_x97 + _x91,
+        0,
+        _x117,
+        0,
+        _x120,
+        0,
+        0,
+        _x187 + _x46*(_x18*_x194 + _x18*_x195 + _x194*_x22 + _x195*_x22) + phi_dot*(_x178*_x18 + _x178*_x22 + _x179*_x18 + _x179*_x22 + _x18*_x183 + _x18*_x184 + _x183*_x22 + _x184*_x22) + phi_dot*(_x18*_x188 + _x18*_x189 + _x18*_x190 + _x188*_x22 + _x188 + _x189*_x22 + _x189 + _x190*_x22 + _x20*theta_dot + _x21*theta_dot + _x23*theta_dot + _x25*theta_dot + _x26*theta_dot + _x27*theta_dot) + theta_dot*(_x170 + _x90) + theta_dot*(_x18*_x191 + _x18*_x192 + _x18*_x193 + _x191*_x22 + _x191 + _x192*_x22 + _x192 + _x193*_x22 + _x20*phi_dot + _x21*phi_dot + _x23*phi_dot + _x25*phi_dot + _x26*phi_dot + _x27*phi_dot),
+        _x123*_x156 + _x125 + _x136 + _x196*phi_dot,
+        _x117*y_dot + x_dot*(_x159 + _x74),
+        _x126 + _x133 + _x196*theta_dot,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        0,
+        _x197,
+        _x197,
+        _x198,
+        _x198,
+        0,
+        0,
+        _x199,
+        _x199,
+        _x200,
+        _x200,
+    )
+
+
+def eval_jacobian_batch(fq, fv, k):
+    fq = np.atleast_2d(np.asarray(fq, dtype=float))
+    n = fq.shape[0]
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq.T
+    fv_omega_l, fv_omega_r = np.broadcast_to(np.asarray(fv, dtype=float), (n, 2)).T
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = np.cos(phi)
+    _x1 = np.cos(theta)
+    _x2 = _k1*_x1
+    _x3 = _x0*_x2
+    _x4 = np.sin(theta)
+    _x5 = _k2*_x4
+    _x6 = _x0*_x5
+    _x7 = _x3 + _x6
+    _x8 = np.sin(phi)
+    _x9 = _k2*_x1
+    _x10 = _k4*_x4
+    _x11 = _x10*_x8 + _x8*_x9
+    _x12 = _k3*_x0 + _x11
+    _x13 = _x2*_x8 + _x5*_x8
+    _x14 = _k1*_x4
+    _x15 = _k5*_x1
+    _x16 = _k3*_x8 + _x0*_x14 + _x0*_x15
+    _x17 = _x10 + _x9
+    _x18 = _x0**2
+    _x19 = _x4**2
+    _x20 = _k6*_x19
+    _x21 = _x18*_x20
+    _x22 = _x8**2
+    _x23 = _x20*_x22
+    _x24 = _x1**2
+    _x25 = _k7*_x24
+    _x26 = _x18*_x25
+    _x27 = _x22*_x25
+    _x28 = _x1*_x4
+    _x29 = _k8*_x28
+    _x30 = _k9*_x28
+    _x31 = _k6*_x24
+    _x32 = _k7*_x19
+    _x33 = _x31 + _x32
+    _x34 = _k11*_x4
+    _x35 = _k12*_x1
+    _x36 = _x18*_x34 + _x18*_x35 + _x22*_x34 + _x22*_x35
+    _x37 = _x18*_x31 + _x18*_x32 + _x22*_x31 + _x22*_x32
+    _x38 = _x33 + _x37
+    _x39 = _k22*_x0
+    _x40 = _k4*_x1
+    _x41 = _x40*_x8
+    _x42 = _k5*_x4
+    _x43 = _x42*_x8
+    _x44 = _x41*theta_dot + _x43*theta_dot
+    _x45 = _x41*phi_dot + _x43*phi_dot
+    _x46 = theta_dot**2
+    _x47 = _x0*_x9
+    _x48 = _x0*_x10
+    _x49 = _x47 + _x48
+    _x50 = phi_dot**2
+    _x51 = _k20*_x8 + _x49
+    _x52 = _x0*_x4
+    _x53 = _k19*_x52
+    _x54 = _k19*_x1
+    _x55 = _x0*_x54
+    _x56 = _k17*_x52 + _x55
+    _x57 = _x53 + _x56
+    _x58 = _k16*_x8
+    _x59 = _k17*_x1
+    _x60 = _k18*_x4
+    _x61 = _x60*_x8
+    _x62 = _x59*_x8 + _x61
+    _x63 = _k15*_x0 + _x62
+    _x64 = _x58*fv_omega_l + _x58*fv_omega_r + _x63
+    _x65 = _x39*fv_omega_l + _x39*fv_omega_r + _x44*phi_dot + _x45*theta_dot + _x46*_x49 + _x50*_x51 + _x57*theta_dot + _x64*phi_dot
+    _x66 = _k22*_x8
+    _x67 = _x3*theta_dot + _x6*theta_dot
+    _x68 = _x3*phi_dot + _x6*phi_dot
+    _x69 = _x4*_x8
+    _x70 = _x54*_x8
+    _x71 = _k17*_x69 + _x70
+    _x72 = _k19*_x69 + _x71
+    _x73 = _k23*_x0
+    _x74 = _x73*fv_omega_l + _x73*fv_omega_r
+    _x75 = _k15*_x8 + _k24*_x0*_x1 + _x53
+    _x76 = _x74 + _x75
+    _x77 = _x40 + _x42
+    _x78 = _x59 + _x60
+    _x79 = _x54 + _x78
+    _x80 = _k42*_x22
+    _x81 = _k42*_x18
+    _x82 = _k43*_x4
+    _x83 = _x22*_x82
+    _x84 = _x18*_x82
+    _x85 = _k44*_x1
+    _x86 = _x22*_x85
+    _x87 = _x18*_x85
+    _x88 = _k27*_x4
+    _x89 = _k28*_x1
+    _x90 = _x18*_x89 + _x22*_x89
+    _x91 = _x18*_x88 + _x22*_x88 + _x90
+    _x92 = _k36*_x28
+    _x93 = _k6*_x28
+    _x94 = _k37*_x19
+    _x95 = _k38*_x24
+    _x96 = _x18*_x92 + _x18*_x93 + _x18*_x94 + _x18*_x95 + _x22*_x92 + _x22*_x93 + _x22*_x94 + _x22*_x95
+    _x97 = _x92 + _x93 + _x96
+    _x98 = _k37*_x24
+    _x99 = _k38*_x19
+    _x100 = _k39*_x28
+    _x101 = _k7*_x28
+    _x102 = _x100 + _x101
+    _x103 = _x102 + _x96 + _x98 + _x99
+    _x104 = _k30*_x24
+    _x105 = _k30*_x19
+    _x106 = _k32*_x19
+    _x107 = _k31*_x28
+    _x108 = _k31*_x19
+    _x109 = _k31*_x24
+    _x110 = _k34*_x28
+    _x111 = _k35*_x28
+    _x112 = _x108 + _x109*_x18 + _x109*_x22 + _x110 + _x111*_x18 + _x111*_x22
+    _x113 = _k29*_x18 + _k29*_x22 + _k32*_x24 + _k33*_x28 + _x104 + _x105*_x18 + _x105*_x22 + _x106*_x18 + _x106*_x22 + _x107*_x18 + _x107*_x22 + _x112
+    _x114 = _k47*_x22
+    _x115 = _k47*_x18
+    _x116 = _k23*_x8
+    _x117 = _x116*fv_omega_l + _x116*fv_omega_r + _x63
+    _x118 = _k16*_x0
+    _x119 = _x118*fv_omega_l + _x118*fv_omega_r
+    _x120 = _x119 + _x75
+    _x121 = _k11*_x1
+    _x122 = _k46*_x4
+    _x123 = _x121*_x18 + _x121*_x22 + _x122*_x18 + _x122*_x22
+    _x124 = _k28*_x4
+    _x125 = _x124*_x18 + _x124*_x22 + _x91
+    _x126 = _k45*_x18 + _k45*_x22 + _x104*_x18 + _x104*_x22 + _x108*_x18 + _x108*_x22 + _x110*_x18 + _x110*_x22
+    _x127 = _x100*theta_dot
+    _x128 = _x101*theta_dot
+    _x129 = _x22*_x98
+    _x130 = _x18*_x98
+    _x131 = _x22*_x99
+    _x132 = _x18*_x99
+    _x133 = _x127*_x18 + _x127*_x22 + _x127 + _x128*_x18 + _x128*_x22 + _x128 + _x129*theta_dot + _x130*theta_dot + _x131*theta_dot + _x132*theta_dot
+    _x134 = _x100*phi_dot
+    _x135 = _x101*phi_dot
+    _x136 = _x129*phi_dot + _x130*phi_dot + _x131*phi_dot + _x132*phi_dot + _x134*_x18 + _x134*_x22 + _x134 + _x135*_x18 + _x135*_x22 + _x135
+    _x137 = _x41 + _x43
+    _x138 = _k8*_x24
+    _x139 = _k9*_x19
+    _x140 = _k8*_x19
+    _x141 = _k9*_x24
+    _x142 = _k62*_x28
+    _x143 = _k63*_x28
+    _x144 = _k60*_x28
+    _x145 = _k61*_x28
+    _x146 = _x144 + _x145
+    _x147 = _k18*_x1
+    _x148 = _k24*_x4
+    _x149 = _x147*_x8 + _x148*_x8
+    _x150 = _x14*_x8
+    _x151 = _x15*_x8
+    _x152 = _x0*_x40
+    _x153 = _x0*_x42
+    _x154 = _x152 + _x153
+    _x155 = _x0*_x59 + _x0*_x60
+    _x156 = 2*theta_dot
+    _x157 = _k65*_x8
+    _x158 = _x150 + _x151
+    _x159 = _k64*_x8 + _x155
+    _x160 = 2*phi_dot
+    _x161 = _x147 + _x148
+    _x162 = _k43*_x1
+    _x163 = _x162*_x22
+    _x164 = _x18*fv_omega_l
+    _x165 = _x18*fv_omega_r
+    _x166 = _k74*_x4
+    _x167 = _x166*_x22
+    _x168 = _k27*_x1
+    _x169 = _k66*_x4
+    _x170 = _x168*_x18 + _x168*_x22 + _x169*_x18 + _x169*_x22
+    _x171 = _k36*_x24
+    _x172 = _k39*_x19
+    _x173 = _k71*_x28
+    _x174 = _x171*_x18 + _x171*_x22 + _x172*_x18 + _x172*_x22 + _x173*_x18 + _x173*_x22
+    _x175 = _k36*_x19
+    _x176 = _k39*_x24
+    _x177 = _k72*_x28
+    _x178 = _k34*_x24
+    _x179 = _k35*_x19
+    _x180 = _k33*_x19
+    _x181 = _k34*_x19
+    _x182 = _k35*_x24
+    _x183 = _k67*_x28
+    _x184 = _k68*_x28
+    _x185 = _k69*_x28
+    _x186 = _k70*_x28
+    _x187 = _x149*x_dot + _x56*y_dot
+    _x188 = _x175*theta_dot
+    _x189 = _x176*theta_dot
+    _x190 = _x177*theta_dot
+    _x191 = _x175*phi_dot
+    _x192 = _x176*phi_dot
+    _x193 = _x177*phi_dot
+    _x194 = _k46*_x1
+    _x195 = _k75*_x4
+    _x196 = _x100*_x18 + _x100*_x22 + _x101*_x18 + _x101*_x22 + _x102 + _x129 + _x130 + _x131 + _x132
+    _x197 = _x39 + _x58*phi_dot
+    _x198 = _x66 + _x73*phi_dot
+    _x199 = _x80 + _x81 + _x83 + _x84 + _x86 + _x87
+    _x200 = _x114 + _x115 + _x116*x_dot + _x118*y_dot
+
+    M = np.zeros((n, 5, 5))
+    M[:, 0, 0] = _k0
+    M[:, 0, 3] = _x7
+    M[:, 0, 4] = _x12
+    M[:, 1, 1] = _k0
+    M[:, 1, 3] = _x13
+    M[:, 1, 4] = _x16
+    M[:, 2, 2] = _k0
+    M[:, 2, 3] = _x17
+    M[:, 3, 0] = _x7
+    M[:, 3, 1] = _x13
+    M[:, 3, 2] = _x17
+    M[:, 3, 3] = _k10 + _x18*_x30 + _x21 + _x22*_x30 + _x23 + _x26 + _x27 + _x29 + _x33
+    M[:, 3, 4] = _x36
+    M[:, 4, 0] = _x12
+    M[:, 4, 1] = _x16
+    M[:, 4, 3] = _x36
+    M[:, 4, 4] = _k13*_x18 + _k13*_x22 + _k14 + _x18*_x29 + _x22*_x29 + _x38
+    H = np.zeros((n, 5))
+    H[:, 0] = _k21*x_dot + _x65
+    H[:, 1] = _k21*y_dot + _x11*_x46 + _x12*_x50 + _x66*fv_omega_l + _x66*fv_omega_r + _x67*phi_dot + _x68*theta_dot + _x72*theta_dot + _x76*phi_dot
+    H[:, 2] = _k25*z_dot + _k26 + _x46*_x77 + _x79*theta_dot
+    H[:, 3] = _k40*_x1 + _k41*_x4 + _x103*_x46 + _x113*theta_dot + _x50*_x97 + _x56*x_dot + _x71*y_dot + _x78*z_dot + _x80*fv_omega_l + _x80*fv_omega_r + _x81*fv_omega_l + _x81*fv_omega_r + _x83*fv_omega_l + _x83*fv_omega_r + _x84*fv_omega_l + _x84*fv_omega_r + _x86*fv_omega_l + _x86*fv_omega_r + _x87*fv_omega_l + _x87*fv_omega_r + _x91*phi_dot
+    H[:, 4] = _x114*fv_omega_l + _x114*fv_omega_r + _x115*fv_omega_l + _x115*fv_omega_r + _x117*x_dot + _x120*y_dot + _x123*_x46 + _x125*theta_dot + _x126*phi_dot + _x133*phi_dot + _x136*theta_dot
+    M_gradf = np.zeros((n, 25, 10))
+    M_gradf[:, 3, 6] = _x49
+    M_gradf[:, 3, 8] = _x137
+    M_gradf[:, 4, 6] = _x137
+    M_gradf[:, 4, 8] = _x51
+    M_gradf[:, 8, 6] = _x11
+    M_gradf[:, 8, 8] = _x7
+    M_gradf[:, 9, 6] = _x7
+    M_gradf[:, 9, 8] = _x12
+    M_gradf[:, 13, 6] = _x77
+    M_gradf[:, 15, 6] = _x49
+    M_gradf[:, 15, 8] = _x137
+    M_gradf[:, 16, 6] = _x11
+    M_gradf[:, 16, 8] = _x7
+    M_gradf[:, 17, 6] = _x77
+    M_gradf[:, 18, 6] = _x138 + _x139 + _x140*_x18 + _x140*_x22 + _x141*_x18 + _x141*_x22 + _x142*_x18 + _x142*_x22 + _x143*_x18 + _x143*_x22 + _x146
+    M_gradf[:, 19, 6] = _x123
+    M_gradf[:, 20, 6] = _x137
+    M_gradf[:, 20, 8] = _x51
+    M_gradf[:, 21, 6] = _x7
+    M_gradf[:, 21, 8] = _x12
+    M_gradf[:, 23, 6] = _x123
+    M_gradf[:, 24, 6] = _x138*_x18 + _x138*_x22 + _x139*_x18 + _x139*_x22 + _x144*_x18 + _x144*_x22 + _x145*_x18 + _x145*_x22 + _x146
+    H_gradf = np.zeros((n, 5, 10))
+    H_gradf[:, 0, 1] = _k21
+    H_gradf[:, 0, 6] = _x149*phi_dot + _x154*_x46 + _x154*_x50 + phi_dot*(_x150*theta_dot + _x151*theta_dot) + theta_dot*(_x155 + _x55) + theta_dot*(_x150*phi_dot + _x151*phi_dot)
+    H_gradf[:, 0, 7] = _x137*phi_dot + _x156*_x49 + _x45 + _x57
+    H_gradf[:, 0, 8] = _x157*fv_omega_l + _x157*fv_omega_r + _x158*_x46 + _x50*(_k20*_x0 + _x158) + phi_dot*(_x119 + _x159) + phi_dot*(_x152*theta_dot + _x153*theta_dot) + theta_dot*(_x149 + _x61) + theta_dot*(_x152*phi_dot + _x153*phi_dot)
+    H_gradf[:, 0, 9] = _x137*theta_dot + _x160*_x51 + _x44 + _x64
+    H_gradf[:, 1, 3] = _k21
+    H_gradf[:, 1, 6] = _x137*_x46 + _x137*_x50 + _x56*phi_dot + phi_dot*(_x47*theta_dot + _x48*theta_dot) + theta_dot*(_x62 + _x70) + theta_dot*(_x47*phi_dot + _x48*phi_dot)
+    H_gradf[:, 1, 7] = _x11*_x156 + _x68 + _x7*phi_dot + _x72
+    H_gradf[:, 1, 8] = _x65
+    H_gradf[:, 1, 9] = _x12*_x160 + _x67 + _x7*theta_dot + _x76
+    H_gradf[:, 2, 5] = _k25
+    H_gradf[:, 2, 6] = _x46*(_x14 + _x15) + theta_dot*(_x161 + _x60)
+    H_gradf[:, 2, 7] = _x156*_x77 + _x79
+    H_gradf[:, 3, 1] = _x56
+    H_gradf[:, 3, 3] = _x71
+    H_gradf[:, 3, 5] = _x78
+    H_gradf[:, 3, 6] = _k41*_x1 + _k73*_x4 + _x155*x_dot + _x161*z_dot + _x162*_x164 + _x162*_x165 + _x163*fv_omega_l + _x163*fv_omega_r + _x164*_x166 + _x165*_x166 + _x167*fv_omega_l + _x167*fv_omega_r + _x170*phi_dot + _x46*(_x174 + _x175 + _x176 + _x177 + _x20 + _x25 + _x37) + _x50*(_x171 + _x172 + _x174 + _x38) + _x62*y_dot + theta_dot*(_k33*_x24 + _x112 + _x178 + _x179 + _x18*_x180 + _x18*_x181 + _x18*_x182 + _x18*_x185 + _x18*_x186 + _x180*_x22 + _x181*_x22 + _x182*_x22 + _x183 + _x184 + _x185*_x22 + _x186*_x22)
+    H_gradf[:, 3, 7] = _x103*_x156 + _x113
+    H_gradf[:, 3, 8] = _x187
+    H_gradf[:, 3, 9] = _x160*_x97 + _x91
+    H_gradf[:, 4, 1] = _x117
+    H_gradf[:, 4, 3] = _x120
+    H_gradf[:, 4, 6] = _x187 + _x46*(_x18*_x194 + _x18*_x195 + _x194*_x22 + _x195*_x22) + phi_dot*(_x178*_x18 + _x178*_x22 + _x179*_x18 + _x179*_x22 + _x18*_x183 + _x18*_x184 + _x183*_x22 + _x184*_x22) + phi_dot*(_x18*_x188 + _x18*_x189 + _x18*_x190 + _x188*_x22 + _x188 + _x189*_x22 + _x189 + _x190*_x22 + _x20*theta_dot + _x21*theta_dot + _x23*theta_dot + _x25*theta_dot + _x26*theta_dot + _x27*theta_dot) + theta_dot*(_x170 + _x90) + theta_dot*(_x18*_x191 + _x18*_x192 + _x18*_x193 + _x191*_x22 + _x191 + _x192*_x22 + _x192 + _x193*_x22 + _x20*phi_dot + _x21*phi_dot + _x23*phi_dot + _x25*phi_dot + _x26*phi_dot + _x27*phi_dot)
+    H_gradf[:, 4, 7] = _x123*_x156 + _x125 + _x136 + _x196*phi_dot
+    H_gradf[:, 4, 8] = _x117*y_dot + x_dot*(_x159 + _x74)
+    H_gradf[:, 4, 9] = _x126 + _x133 + _x196*theta_dot
+    M_gradfv = np.zeros((n, 25, 2))
+    H_gradfv = np.zeros((n, 5, 2))
+    H_gradfv[:, 0, 0] = _x197
+    H_gradfv[:, 0, 1] = _x197
+    H_gradfv[:, 1, 0] = _x198
+    H_gradfv[:, 1, 1] = _x198
+    H_gradfv[:, 3, 0] = _x199
+    H_gradfv[:, 3, 1] = _x199
+    H_gradfv[:, 4, 0] = _x200
+    H_gradfv[:, 4, 1] = _x200
+    return M, H, M_gradf, H_gradf, M_gradfv, H_gradfv
+
+
+def eval_contact(fq, fv, k):
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq
+    fv_omega_l, fv_omega_r = fv
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = math.cos(phi)
+    _x1 = math.cos(theta)
+    _x2 = _k1*_x1
+    _x3 = _x0*_x2
+    _x4 = math.sin(theta)
+    _x5 = _k2*_x4
+    _x6 = _x0*_x5
+    _x7 = _x3 + _x6
+    _x8 = math.sin(phi)
+    _x9 = _k2*_x1
+    _x10 = _k4*_x4
+    _x11 = _x10*_x8 + _x8*_x9
+    _x12 = _k3*_x0 + _x11
+    _x13 = _x2*_x8 + _x5*_x8
+    _x14 = _x0*_x4
+    _x15 = _x0*_x1
+    _x16 = _k1*_x14 + _k3*_x8 + _k5*_x15
+    _x17 = _x10 + _x9
+    _x18 = _x0**2
+    _x19 = _x4**2
+    _x20 = _k6*_x19
+    _x21 = _x8**2
+    _x22 = _x1**2
+    _x23 = _k7*_x22
+    _x24 = _x1*_x4
+    _x25 = _k8*_x24
+    _x26 = _k9*_x24
+    _x27 = _k6*_x22
+    _x28 = _k7*_x19
+    _x29 = _x27 + _x28
+    _x30 = _k11*_x4
+    _x31 = _k12*_x1
+    _x32 = _x18*_x30 + _x18*_x31 + _x21*_x30 + _x21*_x31
+    _x33 = _k22*_x0
+    _x34 = _k4*_x1
+    _x35 = _x8*theta_dot
+    _x36 = _k5*_x4
+    _x37 = _x8*phi_dot
+    _x38 = theta_dot**2
+    _x39 = _x0*_x10 + _x0*_x9
+    _x40 = phi_dot**2
+    _x41 = _k19*_x14
+    _x42 = _k19*_x1
+    _x43 = _k17*_x14 + _x0*_x42
+    _x44 = _k16*_x8
+    _x45 = _k17*_x1
+    _x46 = _k18*_x4
+    _x47 = _k15*_x0 + _x45*_x8 + _x46*_x8
+    _x48 = _k22*_x8
+    _x49 = _x4*_x8
+    _x50 = _k17*_x49 + _x42*_x8
+    _x51 = _k23*_x0
+    _x52 = _k15*_x8 + _k24*_x15 + _x41
+    _x53 = _x45 + _x46
+    _x54 = _k42*fv_omega_l
+    _x55 = _k42*fv_omega_r
+    _x56 = _k43*_x4
+    _x57 = _x21*_x56
+    _x58 = _x18*fv_omega_l
+    _x59 = _x18*fv_omega_r
+    _x60 = _k44*_x1
+    _x61 = _x21*_x60
+    _x62 = _k27*_x4
+    _x63 = _k28*_x1
+    _x64 = _x18*_x62 + _x18*_x63 + _x21*_x62 + _x21*_x63
+    _x65 = _k36*_x24
+    _x66 = _k6*_x24
+    _x67 = _k37*_x19
+    _x68 = _k38*_x22
+    _x69 = _x18*_x65 + _x18*_x66 + _x18*_x67 + _x18*_x68 + _x21*_x65 + _x21*_x66 + _x21*_x67 + _x21*_x68
+    _x70 = _k37*_x22
+    _x71 = _k38*_x19
+    _x72 = _k39*_x24
+    _x73 = _k7*_x24
+    _x74 = _k30*_x22
+    _x75 = _k31*_x19
+    _x76 = _k34*_x24
+    _x77 = _k30*_x19
+    _x78 = _k31*_x22
+    _x79 = _k32*_x19
+    _x80 = _k31*_x24
+    _x81 = _k35*_x24
+    _x82 = _k47*fv_omega_l
+    _x83 = _k47*fv_omega_r
+    _x84 = _k23*_x8
+    _x85 = _k16*_x0
+    _x86 = _k11*_x1
+    _x87 = _k46*_x4
+    _x88 = _k28*_x4
+    _x89 = _x72*theta_dot
+    _x90 = _x73*theta_dot
+    _x91 = _x70*theta_dot
+    _x92 = _x71*theta_dot
+    _x93 = _x72*phi_dot
+    _x94 = _x73*phi_dot
+    _x95 = _x70*phi_dot
+    _x96 = _x71*phi_dot
+    _x97 = _k48*x + _k49*y + z
+
+    M = np.array([
+        [_k0, 0, 0, _x7, _x12],
+        [0, _k0, 0, _x13, _x16],
+        [0, 0, _k0, _x17, 0],
+        [_x7, _x13, _x17, _k10 + _x18*_x20 + _x18*_x23 + _x18*_x26 + _x20*_x21 + _x21*_x23 + _x21*_x26 + _x25 + _x29, _x32],
+        [_x12, _x16, 0, _x32, _k13*_x18 + _k13*_x21 + _k14 + _x18*_x25 + _x18*_x27 + _x18*_x28 + _x21*_x25 + _x21*_x27 + _x21*_x28 + _x29],
+    ])
+    H = np.array([
+        _k21*x_dot + _x33*fv_omega_l + _x33*fv_omega_r + _x38*_x39 + _x40*(_k20*_x8 + _x39) + phi_dot*(_x34*_x35 + _x35*_x36) + phi_dot*(_x44*fv_omega_l + _x44*fv_omega_r + _x47) + theta_dot*(_x41 + _x43) + theta_dot*(_x34*_x37 + _x36*_x37),
+        _k21*y_dot + _x11*_x38 + _x12*_x40 + _x48*fv_omega_l + _x48*fv_omega_r + phi_dot*(_x3*theta_dot + _x6*theta_dot) + phi_dot*(_x51*fv_omega_l + _x51*fv_omega_r + _x52) + theta_dot*(_k19*_x49 + _x50) + theta_dot*(_x3*phi_dot + _x6*phi_dot),
+        _k25*z_dot + _k26 + _x38*(_x34 + _x36) + theta_dot*(_x42 + _x53),
+        _k40*_x1 + _k41*_x4 + _x18*_x54 + _x18*_x55 + _x21*_x54 + _x21*_x55 + _x38*(_x69 + _x70 + _x71 + _x72 + _x73) + _x40*(_x65 + _x66 + _x69) + _x43*x_dot + _x50*y_dot + _x53*z_dot + _x56*_x58 + _x56*_x59 + _x57*fv_omega_l + _x57*fv_omega_r + _x58*_x60 + _x59*_x60 + _x61*fv_omega_l + _x61*fv_omega_r + _x64*phi_dot + theta_dot*(_k29*_x18 + _k29*_x21 + _k32*_x22 + _k33*_x24 + _x18*_x77 + _x18*_x78 + _x18*_x79 + _x18*_x80 + _x18*_x81 + _x21*_x77 + _x21*_x78 + _x21*_x79 + _x21*_x80 + _x21*_x81 + _x74 + _x75 + _x76),
+        _x18*_x82 + _x18*_x83 + _x21*_x82 + _x21*_x83 + _x38*(_x18*_x86 + _x18*_x87 + _x21*_x86 + _x21*_x87) + phi_dot*(_k45*_x18 + _k45*_x21 + _x18*_x74 + _x18*_x75 + _x18*_x76 + _x21*_x74 + _x21*_x75 + _x21*_x76) + phi_dot*(_x18*_x89 + _x18*_x90 + _x18*_x91 + _x18*_x92 + _x21*_x89 + _x21*_x90 + _x21*_x91 + _x21*_x92 + _x89 + _x90) + theta_dot*(_x18*_x88 + _x21*_x88 + _x64) + theta_dot*(_x18*_x93 + _x18*_x94 + _x18*_x95 + _x18*_x96 + _x21*_x93 + _x21*_x94 + _x21*_x95 + _x21*_x96 + _x93 + _x94) + x_dot*(_x47 + _x84*fv_omega_l + _x84*fv_omega_r) + y_dot*(_x52 + _x85*fv_omega_l + _x85*fv_omega_r),
+    ])
+    Cons = np.array([
+        _x97,
+        _k50*_x1 + _k51 + _x97,
+    ])
+    Cons_gradq = np.array([
+        [_k48, _k49, 1, 0, 0],
+        [_k48, _k49, 1, _k52*_x4, 0],
+    ])
+    Cons_drift = np.array([
+        0,
+        _k52*_x1*_x38,
+    ])
+    return M, H, Cons, Cons_gradq, Cons_drift
+
+
+def eval_contact_into(fq, fv, k, out):
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq
+    fv_omega_l, fv_omega_r = fv
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = math.cos(phi)
+    _x1 = math.cos(theta)
+    _x2 = _k1*_x1
+    _x3 = _x0*_x2
+    _x4 = math.sin(theta)
+    _x5 = _k2*_x4
+    _x6 = _x0*_x5
+    _x7 = _x3 + _x6
+    _x8 = math.sin(phi)
+    _x9 = _k2*_x1
+    _x10 = _k4*_x4
+    _x11 = _x10*_x8 + _x8*_x9
+    _x12 = _k3*_x0 + _x11
+    _x13 = _x2*_x8 + _x5*_x8
+    _x14 = _x0*_x4
+    _x15 = _x0*_x1
+    _x16 = _k1*_x14 + _k3*_x8 + _k5*_x15
+    _x17 = _x10 + _x9
+    _x18 = _x0**2
+    _x19 = _x4**2
+    _x20 = _k6*_x19
+    _x21 = _x8**2
+    _x22 = _x1**2
+    _x23 = _k7*_x22
+    _x24 = _x1*_x4
+    _x25 = _k8*_x24
+    _x26 = _k9*_x24
+    _x27 = _k6*_x22
+    _x28 = _k7*_x19
+    _x29 = _x27 + _x28
+    _x30 = _k11*_x4
+    _x31 = _k12*_x1
+    _x32 = _x18*_x30 + _x18*_x31 + _x21*_x30 + _x21*_x31
+    _x33 = _k22*_x0
+    _x34 = _k4*_x1
+    _x35 = _x8*theta_dot
+    _x36 = _k5*_x4
+    _x37 = _x8*phi_dot
+    _x38 = theta_dot**2
+    _x39 = _x0*_x10 + _x0*_x9
+    _x40 = phi_dot**2
+    _x41 = _k19*_x14
+    _x42 = _k19*_x1
+    _x43 = _k17*_x14 + _x0*_x42
+    _x44 = _k16*_x8
+    _x45 = _k17*_x1
+    _x46 = _k18*_x4
+    _x47 = _k15*_x0 + _x45*_x8 + _x46*_x8
+    _x48 = _k22*_x8
+    _x49 = _x4*_x8
+    _x50 = _k17*_x49 + _x42*_x8
+    _x51 = _k23*_x0
+    _x52 = _k15*_x8 + _k24*_x15 + _x41
+    _x53 = _x45 + _x46
+    _x54 = _k42*fv_omega_l
+    _x55 = _k42*fv_omega_r
+    _x56 = _k43*_x4
+    _x57 = _x21*_x56
+    _x58 = _x18*fv_omega_l
+    _x59 = _x18*fv_omega_r
+    _x60 = _k44*_x1
+    _x61 = _x21*_x60
+    _x62 = _k27*_x4
+    _x63 = _k28*_x1
+    _x64 = _x18*_x62 + _x18*_x63 + _x21*_x62 + _x21*_x63
+    _x65 = _k36*_x24
+    _x66 = _k6*_x24
+    _x67 = _k37*_x19
+    _x68 = _k38*_x22
+    _x69 = _x18*_x65 + _x18*_x66 + _x18*_x67 + _x18*_x68 + _x21*_x65 + _x21*_x66 + _x21*_x67 + _x21*_x68
+    _x70 = _k37*_x22
+    _x71 = _k38*_x19
+    _x72 = _k39*_x24
+    _x73 = _k7*_x24
+    _x74 = _k30*_x22
+    _x75 = _k31*_x19
+    _x76 = _k34*_x24
+    _x77 = _k30*_x19
+    _x78 = _k31*_x22
+    _x79 = _k32*_x19
+    _x80 = _k31*_x24
+    _x81 = _k35*_x24
+    _x82 = _k47*fv_omega_l
+    _x83 = _k47*fv_omega_r
+    _x84 = _k23*_x8
+    _x85 = _k16*_x0
+    _x86 = _k11*_x1
+    _x87 = _k46*_x4
+    _x88 = _k28*_x4
+    _x89 = _x72*theta_dot
+    _x90 = _x73*theta_dot
+    _x91 = _x70*theta_dot
+    _x92 = _x71*theta_dot
+    _x93 = _x72*phi_dot
+    _x94 = _x73*phi_dot
+    _x95 = _x70*phi_dot
+    _x96 = _x71*phi_dot
+    _x97 = _k48*x + _k49*y + z
+
+    out[:] = (
+        _k0,
+        0,
+        0,
+        _x7,
+        _x12,
+        0,
+        _k0,
+        0,
+        _x13,
+        _x16,
+        0,
+        0,
+        _k0,
+        _x17,
+        0,
+        _x7,
+        _x13,
+        _x17,
+        _k10 + _x18*_x20 + _x18*_x23 + _x18*_x26 + _x20*_x21 + _x21*_x23 + _x21*_x26 + _x25 + _x29,
+        _x32,
+        _x12,
+        _x16,
+        0,
+        _x32,
+        _k13*_x18 + _k13*_x21 + _k14 + _x18*_x25 + _x18*_x27 + _x18*_x28 + _x21*_x25 + _x21*_x27 + _x21*_x28 + _x29,
+        _k21*x_dot + _x33*fv_omega_l + _x33*fv_omega_r + _x38*_x39 + _x40*(_k20*_x8 + _x39) + phi_dot*(_x34*_x35 + _x35*_x36) + phi_dot*(_x44*fv_omega_l + _x44*fv_omega_r + _x47) + theta_dot*(_x41 + _x43) + theta_dot*(_x34*_x37 + _x36*_x37),
+        _k21*y_dot + _x11*_x38 + _x12*_x40 + _x48*fv_omega_l + _x48*fv_omega_r + phi_dot*(_x3*theta_dot + _x6*theta_dot) + phi_dot*(_x51*fv_omega_l + _x51*fv_omega_r + _x52) + theta_dot*(_k19*_x49 + _x50) + theta_dot*(_x3*phi_dot + _x6*phi_dot),
+        _k25*z_dot + _k26 + _x38*(_x34 + _x36) + theta_dot*(_x42 + _x53),
+        _k40*_x1 + _k41*_x4 + _x18*_x54 + _x18*_x55 + _x21*_x54 + _x21*_x55 + _x38*(_x69 + _x70 + _x71 + _x72 + _x73) + _x40*(_x65 + _x66 + _x69) + _x43*x_dot + _x50*y_dot + _x53*z_dot + _x56*_x58 + _x56*_x59 + _x57*fv_omega_l + _x57*fv_omega_r + _x58*_x60 + _x59*_x60 + _x61*fv_omega_l + _x61*fv_omega_r + _x64*phi_dot + theta_dot*(_k29*_x18 + _k29*_x21 + _k32*_x22 + _k33*_x24 + _x18*_x77 + _x18*_x78 + _x18*_x79 + _x18*_x80 + _x18*_x81 + _x21*_x77 + _x21*_x78 + _x21*_x79 + _x21*_x80 + _x21*_x81 + _x74 + _x75 + _x76),
+        _x18*_x82 + _x18*_x83 + _x21*_x82 + _x21*_x83 + _x38*(_x18*_x86 + _x18*_x87 + _x21*_x86 + _x21*_x87) + phi_dot*(_k45*_x18 + _k45*_x21 + _x18*_x74 + _x18*_x75 + _x18*_x76 + _x21*_x74 + _x21*_x75 + _x21*_x76) + phi_dot*(_x18*_x89 + _x18*_x90 + _x18*_x91 + _x18*_x92 + _x21*_x89 + _x21*_x90 + _x21*_x91 + _x21*_x92 + _x89 + _x90) + theta_dot*(_x18*_x88 + _x21*_x88 + _x64) + theta_dot*(_x18*_x93 + _x18*_x94 + _x18*_x95 + _x18*_x96 + _x21*_x93 + _x21*_x94 + _x21*_x95 + _x21*_x96 + _x93 + _x94) + x_dot*(_x47 + _x84*fv_omega_l + _x84*fv_omega_r) + y_dot*(_x52 + _x85*fv_omega_l + _x85*fv_omega_r),
+        _x97,
+        _k50*_x1 + _k51 + _x97,
+        _k48,
+        _k49,
+        1,
+        0,
+        0,
+        _k48,
+        _k49,
+        1,
+        _k52*_x4,
+        0,
+        0,
+        _k52*_x1*_x38,
+    )
+
+
+def eval_contact_batch(fq, fv, k):
+    fq = np.atleast_2d(np.asarray(fq, dtype=float))
+    n = fq.shape[0]
+    x, x_dot, y, y_dot, z, z_dot, theta, theta_dot, phi, phi_dot = fq.T
+    fv_omega_l, fv_omega_r = np.broadcast_to(np.asarray(fv, dtype=float), (n, 2)).T
+    _k0, _k1, _k2, _k3, _k4, _k5, _k6, _k7, _k8, _k9, _k10, _k11, _k12, _k13, _k14, _k15, _k16, _k17, _k18, _k19, _k20, _k21, _k22, _k23, _k24, _k25, _k26, _k27, _k28, _k29, _k30, _k31, _k32, _k33, _k34, _k35, _k36, _k37, _k38, _k39, _k40, _k41, _k42, _k43, _k44, _k45, _k46, _k47, _k48, _k49, _k50, _k51, _k52, _k53, _k54, _k55, _k56, _k57, _k58, _k59, _k60, _k61, _k62, _k63, _k64, _k65, _k66, _k67, _k68, _k69, _k70, _k71, _k72, _k73, _k74, _k75, = k
+
+    _x0 = np.cos(phi)
+    _x1 = np.cos(theta)
+    _x2 = _k1*_x1
+    _x3 = _x0*_x2
+    _x4 = np.sin(theta)
+    _x5 = _k2*_x4
+    _x6 = _x0*_x5
+    _x7 = _x3 + _x6
+    _x8 = np.sin(phi)
+    _x9 = _k2*_x1
+    _x10 = _k4*_x4
+    _x11 = _x10*_x8 + _x8*_x9
+    _x12 = _k3*_x0 + _x11
+    _x13 = _x2*_x8 + _x5*_x8
+    _x14 = _x0*_x4
+    _x15 = _x0*_x1
+    _x16 = _k1*_x14 + _k3*_x8 + _k5*_x15
+    _x17 = _x10 + _x9
+    _x18 = _x0**2
+    _x19 = _x4**2
+    _x20 = _k6*_x19
+    _x21 = _x8**2
+    _x22 = _x1**2
+    _x23 = _k7*_x22
+    _x24 = _x1*_x4
+    _x25 = _k8*_x24
+    _x26 = _k9*_x24
+    _x27 = _k6*_x22
+    _x28 = _k7*_x19
+    _x29 = _x27 + _x28
+    _x30 = _k11*_x4
+    _x31 = _k12*_x1
+    _x32 = _x18*_x30 + _x18*_x31 + _x21*_x30 + _x21*_x31
+    _x33 = _k22*_x0
+    _x34 = _k4*_x1
+    _x35 = _x8*theta_dot
+    _x36 = _k5*_x4
+    _x37 = _x8*phi_dot
+    _x38 = theta_dot**2
+    _x39 = _x0*_x10 + _x0*_x9
+    _x40 = phi_dot**2
+    _x41 = _k19*_x14
+    _x42 = _k19*_x1
+    _x43 = _k17*_x14 + _x0*_x42
+    _x44 = _k16*_x8
+    _x45 = _k17*_x1
+    _x46 = _k18*_x4
+    _x47 = _k15*_x0 + _x45*_x8 + _x46*_x8
+    _x48 = _k22*_x8
+    _x49 = _x4*_x8
+    _x50 = _k17*_x49 + _x42*_x8
+    _x51 = _k23*_x0
+    _x52 = _k15*_x8 + _k24*_x15 + _x41
+    _x53 = _x45 + _x46
+    _x54 = _k42*fv_omega_l
+    _x55 = _k42*fv_omega_r
+    _x56 = _k43*_x4
+    _x57 = _x21*_x56
+    _x58 = _x18*fv_omega_l
+    _x59 = _x18*fv_omega_r
+    _x60 = _k44*_x1
+    _x61 = _x21*_x60
+    _x62 = _k27*_x4
+    _x63 = _k28*_x1
+    _x64 = _x18*_x62 + _x18*_x63 + _x21*_x62 + _x21*_x63
+    _x65 = _k36*_x24
+    _x66 = _k6*_x24
+    _x67 = _k37*_x19
+    _x68 = _k38*_x22
+    _x69 = _x18*_x65 + _x18*_x66 + _x18*_x67 + _x18*_x68 + _x21*_x65 + _x21*_x66 + _x21*_x67 + _x21*_x68
+    _x70 = _k37*_x22
+    _x71 = _k38*_x19
+    _x72 = _k39*_x24
+    _x73 = _k7*_x24
+    _x74 = _k30*_x22
+    _x75 = _k31*_x19
+    _x76 = _k34*_x24
+    _x77 = _k30*_x19
+    _x78 = _k31*_x22
+    _x79 = _k32*_x19
+    _x80 = _k31*_x24
+    _x81 = _k35*_x24
+    _x82 = _k47*fv_omega_l
+    _x83 = _k47*fv_omega_r
+    _x84 = _k23*_x8
+    _x85 = _k16*_x0
+    _x86 = _k11*_x1
+    _x87 = _k46*_x4
+    _x88 = _k28*_x4
+    _x89 = _x72*theta_dot
+    _x90 = _x73*theta_dot
+    _x91 = _x70*theta_dot
+    _x92 = _x71*theta_dot
+    _x93 = _x72*phi_dot
+    _x94 = _x73*phi_dot
+    _x95 = _x70*phi_dot
+    _x96 = _x71*phi_dot
+    _x97 = _k48*x + _k49*y + z
+
+    M = np.zeros((n, 5, 5))
+    M[:, 0, 0] = _k0
+    M[:, 0, 3] = _x7
+    M[:, 0, 4] = _x12
+    M[:, 1, 1] = _k0
+    M[:, 1, 3] = _x13
+    M[:, 1, 4] = _x16
+    M[:, 2, 2] = _k0
+    M[:, 2, 3] = _x17
+    M[:, 3, 0] = _x7
+    M[:, 3, 1] = _x13
+    M[:, 3, 2] = _x17
+    M[:, 3, 3] = _k10 + _x18*_x20 + _x18*_x23 + _x18*_x26 + _x20*_x21 + _x21*_x23 + _x21*_x26 + _x25 + _x29
+    M[:, 3, 4] = _x32
+    M[:, 4, 0] = _x12
+    M[:, 4, 1] = _x16
+    M[:, 4, 3] = _x32
+    M[:, 4, 4] = _k13*_x18 + _k13*_x21 + _k14 + _x18*_x25 + _x18*_x27 + _x18*_x28 + _x21*_x25 + _x21*_x27 + _x21*_x28 + _x29
+    H = np.zeros((n, 5))
+    H[:, 0] = _k21*x_dot + _x33*fv_omega_l + _x33*fv_omega_r + _x38*_x39 + _x40*(_k20*_x8 + _x39) + phi_dot*(_x34*_x35 + _x35*_x36) + phi_dot*(_x44*fv_omega_l + _x44*fv_omega_r + _x47) + theta_dot*(_x41 + _x43) + theta_dot*(_x34*_x37 + _x36*_x37)
+    H[:, 1] = _k21*y_dot + _x11*_x38 + _x12*_x40 + _x48*fv_omega_l + _x48*fv_omega_r + phi_dot*(_x3*theta_dot + _x6*theta_dot) + phi_dot*(_x51*fv_omega_l + _x51*fv_omega_r + _x52) + theta_dot*(_k19*_x49 + _x50) + theta_dot*(_x3*phi_dot + _x6*phi_dot)
+    H[:, 2] = _k25*z_dot + _k26 + _x38*(_x34 + _x36) + theta_dot*(_x42 + _x53)
+    H[:, 3] = _k40*_x1 + _k41*_x4 + _x18*_x54 + _x18*_x55 + _x21*_x54 + _x21*_x55 + _x38*(_x69 + _x70 + _x71 + _x72 + _x73) + _x40*(_x65 + _x66 + _x69) + _x43*x_dot + _x50*y_dot + _x53*z_dot + _x56*_x58 + _x56*_x59 + _x57*fv_omega_l + _x57*fv_omega_r + _x58*_x60 + _x59*_x60 + _x61*fv_omega_l + _x61*fv_omega_r + _x64*phi_dot + theta_dot*(_k29*_x18 + _k29*_x21 + _k32*_x22 + _k33*_x24 + _x18*_x77 + _x18*_x78 + _x18*_x79 + _x18*_x80 + _x18*_x81 + _x21*_x77 + _x21*_x78 + _x21*_x79 + _x21*_x80 + _x21*_x81 + _x74 + _x75 + _x76)
+    H[:, 4] = _x18*_x82 + _x18*_x83 + _x21*_x82 + _x21*_x83 + _x38*(_x18*_x86 + _x18*_x87 + _x21*_x86 + _x21*_x87) + phi_dot*(_k45*_x18 + _k45*_x21 + _x18*_x74 + _x18*_x75 + _x18*_x76 + _x21*_x74 + _x21*_x75 + _x21*_x76) + phi_dot*(_x18*_x89 + _x18*_x90 + _x18*_x91 + _x18*_x92 + _x21*_x89 + _x21*_x90 + _x21*_x91 + _x21*_x92 + _x89 + _x90) + theta_dot*(_x18*_x88 + _x21*_x88 + _x64) + theta_dot*(_x18*_x93 + _x18*_x94 + _x18*_x95 + _x18*_x96 + _x21*_x93 + _x21*_x94 + _x21*_x95 + _x21*_x96 + _x93 + _x94) + x_dot*(_x47 + _x84*fv_omega_l + _x84*fv_omega_r) + y_dot*(_x52 + _x85*fv_omega_l + _x85*fv_omega_r)
+    Cons = np.zeros((n, 2))
+    Cons[:, 0] = _x97
+    Cons[:, 1] = _k50*_x1 + _k51 + _x97
+    Cons_gradq = np.zeros((n, 2, 5))
+    Cons_gradq[:, 0, 0] = _k48
+    Cons_gradq[:, 0, 1] = _k49
+    Cons_gradq[:, 0, 2] = 1
+    Cons_gradq[:, 1, 0] = _k48
+    Cons_gradq[:, 1, 1] = _k49
+    Cons_gradq[:, 1, 2] = 1
+    Cons_gradq[:, 1, 3] = _k52*_x4
+    Cons_drift = np.zeros((n, 2))
+    Cons_drift[:, 1] = _k52*_x1*_x38
+    return M, H, Cons, Cons_gradq, Cons_drift
@@ -0,0 +1,102 @@
+"""
+Values of the original hand-written `Solver.fn_*` methods, with the prototype's parameters, at a few fixed states: the
+regression reference of the generated kernels, checked by `benchmark.bench_kernels`.
+"""
+
+STATES = [
+    ([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1e-08, 0.0, 0.0, 0.0], [0.0, 0.0]),
+    ([0.1, 0.2, -0.3, 0.4, 0.05, -0.1, 0.3, 0.5, 0.7, -0.2], [1.0, -1.0]),
+    ([-1.2, 0.8, 0.5, -0.6, 0.01, 0.02, -1.1, 2.0, -2.5, 1.5], [3.0, 2.0]),
+    ([2.0, -1.5, -0.7, 0.3, -0.04, 0.2, 0.9, -1.3, 3.1, -0.4], [-0.5, 4.0]),
+]
+
+VALUES = [
+    {
+        'M': [
+            [0.7, 0.0, 0.0, 0.056, -0.0],
+            [0.0, 0.7, 0.0, 0.0, 5.6e-10],
+            [0.0, 0.0, 0.7, -5.6e-10, 0.0],
+            [0.056, 0.0, -5.6e-10, 0.01148, 0.0],
+            [-0.0, 5.6e-10, 0.0, 0.0, 0.002000000000000001],
+        ],
+        'H': [0.0, 0.0, 6.867, -5.493599999999999e-09, 0.0],
+        'Cons': [0.0, 0.3225],
+        'Cons_gradq': [
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, 1.0, -2.5e-09, 0.0],
+        ],
+        'Xo': [0.0, 0.0, 0.0],
+        'Xo_dot': [0.0, 0.0, 0.0],
+        'Xc': [8e-10, 0.0, 0.08],
+        'Xc_dot': [0.0, 0.0, 0.0],
+    },
+    {
+        'M': [
+            [0.7, 0.0, 0.0, 0.040918172396388695, -0.010661243267772869],
+            [0.0, 0.7, 0.0, 0.03446490115926331, 0.012657473989978888],
+            [0.0, 0.0, 0.7, -0.016549131573035013, 0.0],
+            [0.040918172396388695, 0.03446490115926331, -0.016549131573035013, 0.01148, 0.0],
+            [-0.010661243267772869, 0.012657473989978888, 0.0, 0.0, 0.002782496445204641],
+        ],
+        'H': [
+            0.003225268876016103,
+            -0.011270144474327101,
+            4.8536243874622205,
+            -0.10988521203381413,
+            -0.000505869737564238,
+        ],
+        'Cons': [0.05, 0.3613341222814015],
+        'Cons_gradq': [
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, 1.0, -0.07388005166533489, 0.0],
+        ],
+        'Xo': [0.1, -0.3, 0.05],
+        'Xo_dot': [0.2, 0.4, -0.1],
+        'Xc': [0.11808210569996985, -0.28476965247461017, 0.1264269191300485],
+        'Xc_dot': [0.23227333550249846, 0.421001365402337, -0.11182080826645359],
+    },
+    {
+        'M': [
+            [0.7, 0.0, 0.0, -0.020350155656149366, -0.029868315658562867],
+            [0.0, 0.7, 0.0, -0.015202020027421017, 0.039983164851932755],
+            [0.0, 0.0, 0.7, 0.04990761216344038, 0.0],
+            [-0.020350155656149366, -0.015202020027421017, 0.04990761216344038, 0.01148, 0.0],
+            [-0.029868315658562867, 0.039983164851932755, 0.0, 0.0, 0.009116485005303949],
+        ],
+        'H': [-0.044778005912417436, -0.4612526670534479, 7.165397349615494, 0.970805948630558, -0.14346510827051698],
+        'Cons': [0.01, 0.19589903035639433],
+        'Cons_gradq': [
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, 1.0, 0.22280184001535885, 0.0],
+        ],
+        'Xo': [-1.2, 0.5, 0.01],
+        'Xo_dot': [0.6547927196821184, -0.7084730761188421, 0.02],
+        'Xc': [-1.1428811930686675, 0.5426690223693755, 0.04628768971404619],
+        'Xc_dot': [0.5326458842533426, -0.666229208657332, 0.16259317760982966],
+    },
+    {
+        'M': [
+            [0.7, 0.0, 0.0, -0.034780052667330814, -0.0018239901010314499],
+            [0.0, 0.7, 0.0, 0.0014474294383265307, -0.04382836917557052],
+            [0.0, 0.0, 0.7, -0.04386630693913907, 0.0],
+            [-0.034780052667330814, 0.0014474294383265307, -0.04386630693913907, 0.01148, 0.0],
+            [-0.0018239901010314499, -0.04382836917557052, 0.0, 0.0, 0.00749786538422503],
+        ],
+        'H': [
+            0.08103618262683182,
+            -0.004047388248239074,
+            10.808173488630247,
+            -0.3837195326420256,
+            0.025618532706619596,
+        ],
+        'Cons': [-0.04, 0.18790249206766607],
+        'Cons_gradq': [
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, 1.0, -0.19583172740687085, 0.0],
+        ],
+        'Xo': [2.0, -0.7, -0.04],
+        'Xo_dot': [-1.6267652721909223, 0.30527554654622374, 0.2],
+        'Xc': [1.9373880440348992, -0.6973942998556694, 0.00972879746165315],
+        'Xc_dot': [-1.5611314657510043, 0.32763224568965765, 0.2814659986012583],
+    },
+]
@@ -25,11 +25,11 @@ sol_t, sol_f = solver_lcp.solve(t_span, f0, fv, dt)
 sol_x, sol_x_dot, sol_y, sol_y_dot, sol_z, sol_z_dot, sol_theta, sol_theta_dot, sol_phi, sol_phi_dot = sol_f
 
 
-# sol_xo = np.array([sv.Solver.fn_Xo(sol_t[i], *sol_f[:, i], *params_sim.values(), *fv) for i in range(len(sol_t))]).reshape((len(sol_t), 3))
-# sol_xo_dot = np.array([sv.Solver.fn_Xo_dot(sol_t[i], *sol_f[:, i], *params_sim.values(), *fv) for i in range(len(sol_t))]).reshape((len(sol_t), 3))
+sol_xo = solver_lcp.fn_Xo_batch(sol_t, sol_f.T, fv)
+sol_xo_dot = solver_lcp.fn_Xo_dot_batch(sol_t, sol_f.T, fv)
 
-# sol_xc = np.array([sv.Solver.fn_Xc(sol_t[i], *sol_f[:, i], *params_sim.values(), *fv) for i in range(len(sol_t))]).reshape((len(sol_t), 3))
-# sol_xc_dot = np.array([sv.Solver.fn_Xc_dot(sol_t[i], *sol_f[:, i], *params_sim.values(), *fv) for i in range(len(sol_t))]).reshape((len(sol_t), 3))
+sol_xc = solver_lcp.fn_Xc_batch(sol_t, sol_f.T, fv)
+sol_xc_dot = solver_lcp.fn_Xc_dot_batch(sol_t, sol_f.T, fv)
 
 
 plt.figure(figsize=(15, 5))
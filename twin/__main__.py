@@ -1,6 +1,9 @@
+import argparse
 import numpy as np
+import os
 import pygame
 import sys
+import time
 
 from pygame.locals import *
 
@@ -8,11 +11,117 @@ from cart import Cart
 from vec3 import Vec3
 from screen import Camera, Screen, ScreenObject, BoxSO, DiskSO
 from drawings import draw_axes, draw_ground
-from receiver import ReceiverFirebase
 from imu import ImuRawData, ImuData, Imu
+from physics import FixedTimestep, PhysicsWorker, Snapshot, step_cart
+from profiler import FrameProfiler
+from receiver import ReceiverFirebase
+from recording import LogWriter, ReceiverReplay, SOURCE_CART, SOURCE_MODEL
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog='twin', description="Digital twin of the 5 DOF cart-pole.")
+    parser.add_argument('--headless', action='store_true',
+                        help="render a simulated run off-screen, as fast as possible, without a display")
+    parser.add_argument('--frames', type=int, default=600, help="number of frames of the headless run")
+    parser.add_argument('--fps', type=float, default=60.0, help="frame rate of the headless run, in simulated time")
+    parser.add_argument('--png', metavar='DIR', help="write the headless frames to DIR/frame_00000.png, ...")
+    parser.add_argument('--raw', metavar='PATH',
+                        help="write the headless frames as a raw RGB24 video stream to PATH, or to stdout with '-'")
+    parser.add_argument('--physics-dt', type=float, default=1.0e-3, help="fixed step of the model, in seconds")
+    parser.add_argument('--max-substeps', type=int, default=50,
+                        help="most model steps per frame, the time beyond being dropped after a hitch")
+    parser.add_argument('--single-thread', action='store_true',
+                        help="step the model in the render loop instead of in a physics worker thread")
+    parser.add_argument('--camera-slack', type=float, default=0.0,
+                        help="let the cart drift this fraction of the viewing distance before the camera recenters, "
+                             "keeping the cached static layer in between")
+    parser.add_argument('--profile-out', metavar='PATH',
+                        help="export the frame profile on exit, per frame to PATH.csv or as percentiles to PATH.json")
+    parser.add_argument('--record', metavar='PATH',
+                        help="append the received IMU samples and the model states to the binary log at PATH")
+    parser.add_argument('--replay', metavar='PATH', help="play the IMU samples of the log at PATH instead of receiving")
+    parser.add_argument('--replay-speed', type=float, default=1.0,
+                        help="speed factor of the replay, or 0 to replay as fast as the frames drain the samples")
+    return parser.parse_args()
+
+
+def draw_frame(screen, camera, cart):
+    draw_ground(screen, camera, z=-cart.params['dw'] / 2.0)
+    draw_axes(screen, camera)
+    cart.draw(screen, camera)
+
+    text = f"Yaw: {np.degrees(camera.angle_yaw):.1f}°, Pitch: {np.degrees(camera.angle_pitch):.1f}°"
+    screen.draw_text(text, (10, 10), background=(255, 255, 255))
+
+
+def record_model(log, state, t_last):
+    # The model state, once per model time, returning the time of the last one recorded
+    if state is None or state[0] == t_last:
+        return t_last
+    log.write_state(SOURCE_MODEL, *state)
+    return state[0]
+
+
+def run_headless(cart, args):
+    """
+    Render the run frame by frame, not locked to the wall clock, and export the frames. A raw stream can be encoded
+    with e.g. `ffmpeg -f rawvideo -pix_fmt rgb24 -s 1200x900 -r 60 -i - out.mp4`.
+    """
+    # Without a display, through SDL's dummy video driver, set before pygame initializes
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    pygame.font.init()
+    screen = Screen(1200, 900, headless=True)
+    camera = Camera(screen)
+
+    if args.png is not None:
+        os.makedirs(args.png, exist_ok=True)
+    raw = None
+    if args.raw is not None:
+        raw = sys.stdout.buffer if args.raw == '-' else open(args.raw, 'wb')
+
+    log = LogWriter(args.record) if args.record is not None else None
+    t_recorded = None
+
+    profiler = FrameProfiler()
+    timestep = FixedTimestep(args.physics_dt, args.max_substeps)
+    t0 = time.perf_counter()
+    for i in range(args.frames):
+        # TODO: dynamic fv
+        fv = [0.6, -0.6]
+        step_cart(cart, timestep, 1.0 / args.fps, fv, profiler)
+        if log is not None:
+            t_recorded = record_model(log, cart.model_state, t_recorded)
+
+        camera.follow(cart.draw_origin, args.camera_slack)
+        with profiler.stage('build'):
+            draw_frame(screen, camera, cart)
+        screen.render_frame(camera)
+        profiler.record_timings(screen.timings)
+
+        # Exporting the frame stands in for the flip of the interactive twin
+        with profiler.stage('flip'):
+            if args.png is not None:
+                screen.save_frame(os.path.join(args.png, f"frame_{i:05d}.png"))
+            if raw is not None:
+                raw.write(screen.frame_bytes())
+        profiler.end_frame()
+
+    wall = time.perf_counter() - t0
+    if raw is not None and raw is not sys.stdout.buffer:
+        raw.close()
+    if log is not None:
+        log.close()
+    print(f"{args.frames} frames in {wall:.2f} s ({args.frames / wall:.1f} frames/s)", file=sys.stderr)
+    if args.profile_out is not None:
+        profiler.export(args.profile_out)
+
+    pygame.quit()
 
 
 def main():
+    args = parse_args()
+
     cart = Cart(
         hbc = 8.0e-2,
         hb = 20.0e-2,
@@ -25,11 +134,19 @@ def main():
     # cart._imu_cm.sglobal.g.y = 0.01
     # cart._imu_cm.slocal.g.y = 0.01
 
-    receiver = ReceiverFirebase(
-        host="https://dof-cart-pole-control-default-rtdb.firebaseio.com/",
-        auth="./dof-cart-pole-control-firebase-adminsdk-fbsvc-bd0bab0515.json",
-        poll_interval=0.100,
-    )
+    if args.headless:
+        run_headless(cart, args)
+        return
+
+    if args.replay is not None:
+        receiver = ReceiverReplay(args.replay, speed=args.replay_speed if args.replay_speed > 0 else None)
+    else:
+        receiver = ReceiverFirebase(
+            host="https://dof-cart-pole-control-default-rtdb.firebaseio.com/",
+            auth="./dof-cart-pole-control-firebase-adminsdk-fbsvc-bd0bab0515.json",
+        )
+    log = LogWriter(args.record) if args.record is not None else None
+    t_recorded = None
 
     camera_pos_factor = 0.01
 
@@ -39,14 +156,28 @@ def main():
     clock = pygame.time.Clock()
     camera = Camera(screen)
 
+    # The model runs in a worker thread, unless asked otherwise, and the render loop draws its latest snapshot
+    worker = None
+    timestep = FixedTimestep(args.physics_dt, args.max_substeps)
+    if not args.single_thread:
+        worker = PhysicsWorker(cart, args.physics_dt, args.max_substeps)
+        worker.start()
+    snapshot = Snapshot()
+
+    # Stage timings of the last frames: F3 toggles their overlay, F4 exports them next to the working directory
+    profiler = FrameProfiler()
+    worker_busy = 0.0
+
     running = True
     auto_center = True
     dragging = False
     last_mouse = (0, 0)
 
     while running:
-        dt = clock.tick(60) / 1000.0
+        # The frame time only feeds the accumulator, the model always steps by timestep.dt
+        frame_dt = clock.tick(60) / 1000.0
 
+        t_input = time.perf_counter()
         for event in pygame.event.get():
             if event.type == QUIT:
                 running = False
@@ -68,6 +199,12 @@ def main():
             elif event.type == KEYDOWN:
                 if event.key == K_ESCAPE:
                     running = False
+                elif event.key == K_F3:
+                    profiler.visible = not profiler.visible
+                elif event.key == K_F4:
+                    stamp = time.strftime('%Y%m%d-%H%M%S')
+                    profiler.export_csv(f"profile-{stamp}.csv")
+                    profiler.export_json(f"profile-{stamp}.json")
 
             keys = pygame.key.get_pressed()
             if keys[K_SPACE]:
@@ -105,31 +242,52 @@ def main():
                 cart.imu_target.sglobal.g.z += camera_pos_factor
             if keys[K_LEFT]:
                 cart.imu_target.sglobal.g.z -= camera_pos_factor
+        profiler.record('input', time.perf_counter() - t_input)
 
-        raw_data = receiver.receive_raw()
-        # if raw_data is not None:
-        #     cart.update_imu(raw_data)
+        # Every sample streamed since the last frame, oldest first
+        with profiler.stage('receiver'):
+            samples = receiver.drain()
+            if log is not None and len(samples) > 0:
+                log.write_imu_samples(SOURCE_CART, samples)
+        # if len(samples) > 0:
+        #     cart.update_imu_samples(samples)
         #     cart.update_state('meas')
 
         # TODO: dynamic fv
         fv = [0.6, -0.6]
-        cart.update_model(dt, fv)
-        cart.update_state('model')
-
-        draw_ground(screen, camera, z=-cart.params['dw'] / 2.0)
-        draw_axes(screen, camera)
-        cart.draw(screen, camera)
+        if worker is not None:
+            worker.fv = fv
+            worker.interpolate_cart(snapshot, profiler)
+            # The model steps on the worker thread: its busy time since the last frame, off the frame's critical path
+            profiler.record('update_model', worker.busy - worker_busy)
+            worker_busy = worker.busy
+            if log is not None and worker.snapshots.seq > 0:
+                t_recorded = record_model(log, (snapshot.t, snapshot.fq, snapshot.fv), t_recorded)
+        else:
+            step_cart(cart, timestep, frame_dt, fv, profiler)
+            if log is not None:
+                t_recorded = record_model(log, cart.model_state, t_recorded)
 
-        text = f"Yaw: {np.degrees(camera.angle_yaw):.1f}°, Pitch: {np.degrees(camera.angle_pitch):.1f}°"
-        screen.draw_text(text, (10, 10))
+        with profiler.stage('build'):
+            draw_frame(screen, camera, cart)
+            profiler.draw(screen)
 
         if auto_center:
-            camera.target = cart.origin
+            camera.follow(cart.draw_origin, args.camera_slack)
 
         screen.render_frame(camera)
-        pygame.display.flip()
-        clock.tick(60)
+        profiler.record_timings(screen.timings)
+        with profiler.stage('flip'):
+            screen.update_display()
+        profiler.end_frame()
 
+    if worker is not None:
+        worker.stop()
+    receiver.stop()
+    if log is not None:
+        log.close()
+    if args.profile_out is not None:
+        profiler.export(args.profile_out)
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,526 @@
+import os
+import time
+
+# Render off-screen, without a display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from drawings import draw_axes, draw_ground
+from screen import Camera, Screen, BoxSO, DiskSO
+from vec3 import Vec3
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return time.perf_counter() - t0, out
+
+
+def make_scene(steps=None):
+    """
+    The twin's cart: two boxes and two wheels, built once and then only posed.
+    """
+    return (
+        BoxSO(Vec3(0.0, 0.0, 0.0), 0.16, 0.02, 0.02, color=(0, 0, 255)),
+        BoxSO(Vec3(0.0, 0.0, 0.1), 0.02, 0.19, 0.02, color=(0, 0, 255)),
+        DiskSO(Vec3(0.0, -0.08, 0.0), 7.25e-2, 8.0e-3, theta=0.0, phi=np.pi / 2, color=(0, 200, 0), steps=steps),
+        DiskSO(Vec3(0.0, +0.08, 0.0), 7.25e-2, 8.0e-3, theta=0.0, phi=np.pi / 2, color=(0, 200, 0), steps=steps),
+    )
+
+
+def draw_scene(screen, camera, shapes, phi=0.0):
+    """
+    The twin's scene: the ground grid, the axes and the cart turned by `phi`.
+    """
+    draw_ground(screen, camera, z=-7.25e-2)
+    draw_axes(screen, camera)
+
+    for shape in shapes:
+        shape.phi = phi + (np.pi / 2 if isinstance(shape, DiskSO) else 0.0)
+        screen.draw_object(camera, shape)
+
+
+def bench_render(n_frames=20, steps=(24, 96, 384, None)):
+    print("Frame rendering")
+
+    pygame.init()
+    pygame.font.init()
+    screen = Screen(1200, 900, headless=True)
+    camera = Camera(screen)
+    camera.angle_pitch = 0.5
+    camera.distance = 1.0
+
+    for n in steps:
+        shapes = make_scene(steps=n)
+
+        def frame(phi=0.0):
+            draw_scene(screen, camera, shapes, phi)
+            screen.render_frame(camera)
+
+        frame()
+        wall, _ = timed(lambda: [frame(1.0e-2 * i) for i in range(n_frames)])
+        t = screen.timings
+        label = f"{n:4d}" if n is not None else f"auto ({shapes[2].steps})"
+        print(f"  wheel steps {label}: {1.0e3 * wall / n_frames:8.2f} ms/frame "
+              f"(transform {1.0e3 * t['transform']:.2f} ms, sort {1.0e3 * t['sort']:.2f} ms, "
+              f"raster {1.0e3 * t['raster']:.2f} ms, {t['draw_calls']} draw calls, "
+              f"{t['culled_faces']} faces culled)")
+
+    pygame.quit()
+
+
+def bench_render_carts(n_frames=20, n_carts=(1, 4, 16, 64)):
+    print("Frame rendering, carts in a row")
+
+    pygame.init()
+    pygame.font.init()
+    screen = Screen(1200, 900, headless=True)
+    camera = Camera(screen)
+    camera.angle_pitch = 0.5
+    camera.distance = 1.0
+
+    for n in n_carts:
+        carts = []
+        for k in range(n):
+            shapes = make_scene()
+            for shape in shapes:
+                shape.center = shape.center + Vec3(0.0, 0.4 * (k - (n - 1) / 2), 0.0)
+            carts.append(shapes)
+
+        def frame(phi=0.0):
+            draw_ground(screen, camera, z=-7.25e-2)
+            draw_axes(screen, camera)
+            for shapes in carts:
+                for shape in shapes:
+                    shape.phi = phi + (np.pi / 2 if isinstance(shape, DiskSO) else 0.0)
+                    screen.draw_object(camera, shape)
+            screen.render_frame(camera)
+
+        frame()
+        wall, _ = timed(lambda: [frame(1.0e-2 * i) for i in range(n_frames)])
+        t = screen.timings
+        print(f"  {n:3d} carts: {1.0e3 * wall / n_frames:8.2f} ms/frame ({t['draw_calls']} draw calls, "
+              f"{t['culled_objects']} objects and {t['culled_faces']} faces culled)")
+
+    pygame.quit()
+
+
+def bench_ground(n_frames=20, grids=((2.0, 0.1), (20.0, 0.05))):
+    print("Ground grid")
+
+    pygame.init()
+    pygame.font.init()
+    screen = Screen(1200, 900, headless=True)
+    camera = Camera(screen)
+    camera.angle_pitch = 0.5
+    camera.distance = 5.0
+
+    for size, step in grids:
+        for label, yaw_rate in (('still', 0.0), ('moving', 1.0e-2)):
+            def frame(yaw=0.0):
+                camera.angle_yaw = yaw
+                draw_ground(screen, camera, z=-7.25e-2, size=size, step=step)
+                screen.render_frame(camera)
+
+            frame()
+            wall, _ = timed(lambda: [frame(yaw_rate * i) for i in range(n_frames)])
+            t = screen.timings
+            print(f"  {size:4.0f} m at {100.0 * step:3.0f} cm, {label:>6} camera: "
+                  f"{1.0e3 * wall / n_frames:8.2f} ms/frame (background {1.0e3 * t['background']:.2f} ms, "
+                  f"raster {1.0e3 * t['raster']:.2f} ms)")
+
+    pygame.quit()
+
+
+def bench_layers(n_frames=50):
+    print("Layered frames")
+
+    pygame.init()
+    pygame.font.init()
+    screen = Screen(1200, 900, headless=True)
+    camera = Camera(screen)
+    camera.angle_pitch = 0.5
+    camera.distance = 1.0
+    shapes = make_scene()
+
+    # A still camera, one turning around the cart, and one following it as it drives at 0.12 m/s at 60 frames/s, its
+    # target set every frame or through Camera.follow with a slack
+    modes = (('still', 0.0, 0.0, False), ('moving', 1.0e-2, 0.0, False), ('tracking', 0.0, 2.0e-3, False),
+             ('following', 0.0, 2.0e-3, True))
+    for label, yaw_rate, speed, follow in modes:
+        area = 0
+        camera.target = Vec3(0, 0, 0)
+
+        def frame(i):
+            nonlocal area
+            camera.angle_yaw = yaw_rate * i
+            for shape in shapes:
+                shape.center = Vec3(speed * i, shape.center.y, shape.center.z)
+            if follow:
+                camera.follow(shapes[0].center, slack=0.05)
+            else:
+                camera.target = Vec3(speed * i, 0.0, 0.0)
+            draw_scene(screen, camera, shapes, 1.0e-2 * i)
+            screen.draw_text(f"Frame {i}", (10, 10), background=(255, 255, 255))
+            rects = screen.render_frame(camera)
+            screen.update_display()
+            area += sum(rect.w * rect.h for rect in rects)
+
+        frame(0)
+        area = 0
+        wall, _ = timed(lambda: [frame(i) for i in range(1, n_frames + 1)])
+        print(f"  {label:>9} camera: {1.0e3 * wall / n_frames:8.2f} ms/frame, "
+              f"{100.0 * area / (n_frames * screen.width * screen.height):5.1f} % of the screen updated")
+
+    pygame.quit()
+
+
+def bench_physics_worker(duration=3.0, physics_dt=1.0e-3, fps=60.0):
+    print("Physics worker")
+
+    # The cart needs the model package, from the repository root
+    from cart import Cart
+    from physics import FixedTimestep, PhysicsWorker, Snapshot, step_cart
+    from profiler import FrameProfiler
+
+    pygame.init()
+    pygame.font.init()
+    screen = Screen(1200, 900, headless=True)
+    camera = Camera(screen)
+    camera.angle_pitch = 0.5
+    camera.distance = 1.0
+    fv = [0.6, -0.6]
+
+    def make_cart():
+        return Cart(hbc=8.0e-2, hb=20.0e-2, hr=1.0e-2, eb=8.0e-2, ew=8.0e-3, dw=14.5e-2)
+
+    def run(cart, update):
+        # Frames paced at `fps` as by the twin's clock, with the stages on the render thread timed by the profiler and
+        # the work of each frame, from the end of its wait to the end of its render
+        profiler = FrameProfiler()
+        work = []
+        t_start = t_last = t_next = time.perf_counter()
+        while t_last - t_start < duration:
+            time.sleep(max(t_next - time.perf_counter(), 0.0))
+            t_next += 1.0 / fps
+            now = time.perf_counter()
+            update(profiler, now - t_last)
+            t_last = now
+            with profiler.stage('build'):
+                camera.follow(cart.draw_origin, slack=0.05)
+                draw_ground(screen, camera, z=-7.25e-2)
+                draw_axes(screen, camera)
+                cart.draw(screen, camera)
+            screen.render_frame(camera)
+            profiler.record_timings(screen.timings)
+            work.append(time.perf_counter() - now)
+            profiler.end_frame()
+        wall = time.perf_counter() - t_start
+
+        p = profiler.percentiles()
+        render = sum(p[stage]['p50'] for stage in ('build', 'transform', 'sort', 'raster', 'background'))
+        model = ', '.join(f"{stage} {1.0e3 * p[stage]['p50']:5.2f} ms" for stage in ('update_model', 'update_state')
+                          if stage in p)
+        print(f"    {profiler.frames / wall:5.1f} frames/s, per frame (p50): {model}, render {1.0e3 * render:5.2f} ms, "
+              f"work {1.0e3 * np.percentile(work, 50):5.2f} ms (p95 {1.0e3 * np.percentile(work, 95):5.2f} ms)")
+
+    # Model and frames in the same loop
+    print("  single thread:")
+    cart = make_cart()
+    timestep = FixedTimestep(physics_dt)
+    run(cart, lambda profiler, frame_dt: step_cart(cart, timestep, frame_dt, fv, profiler))
+
+    # Model in the worker, frames from its snapshots
+    print("  worker:")
+    cart = make_cart()
+    worker = PhysicsWorker(cart, physics_dt, fv=fv)
+    snapshot = Snapshot()
+    worker.start()
+    t0 = time.perf_counter()
+    run(cart, lambda profiler, frame_dt: worker.interpolate_cart(snapshot, profiler))
+    wall = time.perf_counter() - t0
+    worker.stop()
+    print(f"    worker: {worker.steps / wall:6.0f} model steps/s, busy {100.0 * worker.busy / wall:4.1f} % of a core, "
+          f"off the render thread")
+
+    pygame.quit()
+
+
+def bench_receiver_stream(n_samples=1000, rate=200.0, poll_interval=0.1):
+    print("Streaming receiver")
+
+    import http.client
+    import json
+    import threading
+    from receiver import ReceiverFirebase
+    from standins import RtdbStandIn, raw_sample_json
+
+    standin = RtdbStandIn().start()
+    receiver = ReceiverFirebase(standin.url)
+    time.sleep(0.2)
+
+    # The former receiver: both paths read in turn, then a sleep
+    polled = {}
+    stop = threading.Event()
+
+    def poll():
+        connection = http.client.HTTPConnection(*standin.url[7:-1].split(':'))
+        while not stop.is_set():
+            for path in ('/raw.json', '/imu.json'):
+                connection.request('GET', path)
+                data = json.loads(connection.getresponse().read())
+                if path == '/raw.json' and data:
+                    polled.setdefault(data['timestamp'], time.time())
+            time.sleep(poll_interval)
+
+    poller = threading.Thread(target=poll, daemon=True)
+    poller.start()
+
+    # The cart's writes, one sample per request at the sample rate
+    connection = http.client.HTTPConnection(*standin.url[7:-1].split(':'))
+    t_next = time.perf_counter()
+    for i in range(n_samples):
+        connection.request('PUT', '/raw.json', json.dumps(raw_sample_json(time.time(), gd=(0.0, 0.0, 1.0e-3 * i))))
+        connection.getresponse().read()
+        t_next += 1.0 / rate
+        time.sleep(max(t_next - time.perf_counter(), 0.0))
+    time.sleep(2 * poll_interval)
+
+    stop.set()
+    poller.join()
+    samples = receiver.drain()
+
+    # Malformed events are counted and skipped, and the stream goes on
+    for event, message in (('put', {'path': '/raw'}), ('put', {'data': 1.0}), ('patch', {'path': '/', 'data': [1.0]}),
+                           ('put', {'path': '/raw', 'data': {'timestamp': 1.0, 'xdd': [0.0, 0.0, 9.81]}})):
+        standin.send_event(event, message)
+    connection.request('PUT', '/raw.json', json.dumps(raw_sample_json(time.time())))
+    connection.getresponse().read()
+    time.sleep(0.1)
+    assert receiver.stats['malformed'] == 4 and len(receiver.drain()) == 1, receiver.stats
+    receiver.stop()
+    standin.stop()
+
+    stats = receiver.stats
+    print(f"  stream: {len(samples):5d}/{n_samples} samples, {stats['dropped']} dropped, "
+          f"latency mean {1.0e3 * stats['latency_mean']:6.2f} ms, max {1.0e3 * stats['latency_max']:6.2f} ms")
+    # Over the best case, as the receiver takes it
+    latency = np.array([arrival - ts / 1000.0 for ts, arrival in polled.items()])
+    latency -= latency.min()
+    print(f"    poll: {len(polled):5d}/{n_samples} samples, {n_samples - len(polled)} missed, "
+          f"latency mean {1.0e3 * latency.mean():6.2f} ms, max {1.0e3 * latency.max():6.2f} ms")
+
+
+def bench_receiver_udp(n_samples=2000, rate=500.0, n_burst=100000, burst_rate=20000.0):
+    print("UDP receiver")
+
+    import http.client
+    import json
+    import multiprocessing
+    import threading
+    from receiver import ReceiverFirebase, ReceiverUdp
+    from standins import RtdbStandIn, raw_sample_json
+
+    def run(label, receiver, take, send, n):
+        # Send n samples while the receiver is drained once per 60 Hz frame, as by the render loop
+        n_received = 0
+        stop = threading.Event()
+
+        def drain():
+            nonlocal n_received
+            while not stop.wait(1.0 / 60.0):
+                n_received += len(take())
+
+        drainer = threading.Thread(target=drain)
+        drainer.start()
+        wall, _ = timed(send, n)
+        time.sleep(0.1)
+        stop.set()
+        drainer.join()
+        n_received += len(take())
+
+        stats = receiver.stats
+        print(f"  {label:>9}: {n_received:6d}/{n} samples, {n / wall:8.0f} samples/s sent, {stats['dropped']} dropped, "
+              f"{stats.get('lost', 0)} lost, latency mean {1.0e3 * stats['latency_mean']:6.3f} ms, "
+              f"max {1.0e3 * stats['latency_max']:6.3f} ms")
+        receiver.stop()
+
+    def paced(send_one, rate):
+        def send(n):
+            t_next = time.perf_counter()
+            for i in range(n):
+                send_one(i)
+                if rate is not None:
+                    t_next += 1.0 / rate
+                    time.sleep(max(t_next - time.perf_counter(), 0.0))
+        return send
+
+    # The Firebase path through the local stand-in, one PUT per sample, without the TLS and the cloud round trips
+    standin = RtdbStandIn().start()
+    receiver = ReceiverFirebase(standin.url)
+    time.sleep(0.2)
+    connection = http.client.HTTPConnection(*standin.url[7:-1].split(':'))
+
+    def put(i):
+        connection.request('PUT', '/raw.json', json.dumps(raw_sample_json(time.time(), gd=(0.0, 0.0, 1.0e-3 * i))))
+        connection.getresponse().read()
+
+    # At the sample rate, then as fast as the sender goes
+    run('firebase', receiver, receiver.drain, paced(put, rate), n_samples)
+    standin.write(['raw'], None)
+    receiver = ReceiverFirebase(standin.url)
+    time.sleep(0.2)
+    run('firebase+', receiver, receiver.drain, paced(put, None), n_samples)
+    standin.stop()
+
+    # The UDP sender runs in its own process, as the cart does, not to take the GIL from the receiver: at the sample
+    # rate, then at the burst rate, as far as the sender keeps up
+    def stream_udp(port, rate):
+        def send(n):
+            process = multiprocessing.Process(target=_stream_udp, args=(port, n, rate))
+            process.start()
+            process.join()
+        return send
+
+    for label, n, r in (('udp', n_samples, rate), ('udp+', n_burst, burst_rate)):
+        receiver = ReceiverUdp(port=0)
+        gz = []
+
+        def take():
+            samples = receiver.drain()
+            gz.append(samples[:, 6].copy())
+            return samples
+
+        run(label, receiver, take, stream_udp(receiver.address[1], r), n)
+        # Every sample in order, with the values sent as float32
+        assert np.allclose(np.concatenate(gz), 1.0e-3 * np.arange(n), rtol=0.0, atol=1.0e-5), label
+
+
+def _stream_udp(port, n_samples, rate):
+    from standins import UdpImuSender
+
+    sender = UdpImuSender(port=port)
+    sender.stream(n_samples, rate)
+    sender.close()
+
+
+def bench_receiver_batch(rate=500.0, duration=2.0, round_trip=0.05, batch_sizes=(10, 25, 50)):
+    print("Batched uploads")
+
+    import http.client
+    import json
+    from receiver import ReceiverFirebase
+    from standins import BatchUploader, RtdbStandIn, raw_sample_json
+
+    # The writes take the round trip of a TLS request to the cloud
+    n_samples = int(rate * duration)
+    standin = RtdbStandIn(round_trip=round_trip).start()
+
+    # One blocking PUT of a JSON sample after each read, as the firmware did, for the same duration
+    receiver = ReceiverFirebase(standin.url)
+    time.sleep(0.2)
+    connection = http.client.HTTPConnection(*standin.url[7:-1].split(':'))
+    n_sent = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < duration:
+        connection.request('PUT', '/raw.json', json.dumps(raw_sample_json(time.time(), gd=(0.0, 0.0, 1.0e-3 * n_sent))))
+        connection.getresponse().read()
+        n_sent += 1
+    wall = time.perf_counter() - t0
+    time.sleep(0.1)
+    n_received = len(receiver.drain())
+    print(f"  {'per sample':>10}: {n_received:5d} samples in {wall:5.2f} s, {n_received / wall:6.0f} samples/s, "
+          f"{n_sent / wall:4.0f} requests/s, latency mean {1.0e3 * receiver.stats['latency_mean']:6.2f} ms")
+    receiver.stop()
+    standin.write(['raw'], None)
+
+    # Sampled at the rate and uploaded in batches, the latency over the best case including the batching
+    for batch_size in batch_sizes:
+        receiver = ReceiverFirebase(standin.url)
+        time.sleep(0.2)
+        uploader = BatchUploader(standin.url, batch_size)
+        wall, _ = timed(uploader.stream, n_samples, rate)
+        time.sleep(0.1 + round_trip)
+        n_received = len(receiver.drain())
+        stats = receiver.stats
+        print(f"  {f'batch {batch_size}':>10}: {n_received:5d} samples in {wall:5.2f} s, "
+              f"{n_received / wall:6.0f} samples/s, {uploader.requests / wall:4.0f} requests/s, {stats['lost']} lost, "
+              f"latency mean {1.0e3 * stats['latency_mean']:6.2f} ms, max {1.0e3 * stats['latency_max']:6.2f} ms")
+        uploader.close()
+        receiver.stop()
+        standin.write(['batch'], None)
+    standin.stop()
+
+
+def bench_replay(n_samples=500000, rate=500.0, frame_samples=8):
+    print("Record and replay")
+
+    import json
+    import tempfile
+    from recording import KIND_IMU, LogReader, LogWriter, ReceiverReplay, SOURCE_CART
+
+    samples = np.zeros((n_samples, 7))
+    samples[:, 0] = np.arange(n_samples) / rate
+    samples[:, 1:] = np.random.default_rng(0).normal(size=(n_samples, 6))
+
+    with tempfile.TemporaryDirectory() as directory:
+        # The samples of a frame at a time, as the twin records what it drains, against one JSON line per sample
+        path = os.path.join(directory, 'run.mblog')
+        with LogWriter(path) as log:
+            wall, _ = timed(lambda: [log.write_imu_samples(SOURCE_CART, samples[i:i + frame_samples])
+                                     for i in range(0, n_samples, frame_samples)])
+        print(f"  {'write log':>11}: {n_samples / wall:10.0f} samples/s, {os.path.getsize(path) / n_samples:5.0f} B/sample")
+
+        json_path = os.path.join(directory, 'run.jsonl')
+        with open(json_path, 'w') as f:
+            wall, _ = timed(lambda: [f.write(json.dumps(dict(zip(('t', 'ax', 'ay', 'az', 'gx', 'gy', 'gz'), row))) + '\n')
+                                     for row in samples.tolist()])
+        print(f"  {'write JSON':>11}: {n_samples / wall:10.0f} samples/s, "
+              f"{os.path.getsize(json_path) / n_samples:5.0f} B/sample")
+
+        wall, read = timed(lambda: LogReader(path).imu_samples())
+        assert np.array_equal(read, samples)
+        print(f"  {'read log':>11}: {n_samples / wall:10.0f} samples/s")
+        wall, _ = timed(lambda: LogReader(path).t[-1])
+        print(f"  {'last time':>11}: {1.0e3 * wall:10.3f} ms, mapped without reading the log")
+
+        with open(json_path) as f:
+            wall, _ = timed(lambda: np.array([list(json.loads(line).values()) for line in f]))
+        print(f"  {'read JSON':>11}: {n_samples / wall:10.0f} samples/s")
+
+        # Drained as fast as possible, in frames of whatever was played since the last one
+        receiver = ReceiverReplay(path, speed=None)
+        n_received = n_frames = 0
+        t0 = time.perf_counter()
+        while not receiver.finished.is_set() or n_received < n_samples:
+            n_received += len(receiver.drain())
+            n_frames += 1
+        wall = time.perf_counter() - t0
+        receiver.stop()
+        print(f"  {'replay':>11}: {n_received / wall:10.0f} samples/s, {n_received / n_frames:5.1f} samples/drain, "
+              f"{receiver.stats['dropped']} dropped, {n_samples / rate / wall:5.0f}x real time")
+
+        # A record cut short by a crash is truncated on reopening, and the records appended after it stay aligned
+        torn_path = os.path.join(directory, 'torn.mblog')
+        with LogWriter(torn_path) as log:
+            log.write_imu(SOURCE_CART, 1.0, (0.0, 0.0, 9.81), (0.0, 0.0, 0.0))
+        with open(torn_path, 'ab') as f:
+            f.write(bytes(50))
+        with LogWriter(torn_path) as log:
+            log.write_imu(SOURCE_CART, 2.0, (0.0, 0.0, 9.81), (0.0, 0.0, 0.0))
+        torn = LogReader(torn_path)
+        assert torn.t.tolist() == [1.0, 2.0] and torn.kind.tolist() == [KIND_IMU, KIND_IMU]
+
+
+if __name__ == '__main__':
+    bench_render()
+    bench_render_carts()
+    bench_ground()
+    bench_layers()
+    bench_physics_worker()
+    bench_receiver_stream()
+    bench_receiver_udp()
+    bench_receiver_batch()
+    bench_replay()
@@ -48,7 +48,49 @@ class Cart:
             imu.sglobal.g.y = 0.01
             imu.slocal.g.y = 0.01
 
-        self._solver = sv.SolverLcp(5)
+        # The cart geometry feeds the model dynamics
+        self._solver = sv.SolverLcp(5, params=sv.ModelParams(zcm=hbc, hb=hb, eb=eb, dw=dw))
+
+        # Last two model states, and the pose drawn between them
+        self._model_last = None
+        self._model_fq = None
+        self._model_fv = None
+        self._model_t = None
+        self._draw_pose = None
+
+        # Shapes drawn by the twin, posed in draw
+        self._shapes = (
+            BoxSO(
+                center=Vec3(0, 0, 0),
+                width=2 * self.params['eb'],
+                height=2 * self.params['hr'],
+                depth=2 * self.params['hr'],
+                color=(0, 0, 255)
+            ),
+            BoxSO(
+                center=Vec3(0, 0, 0),
+                width=2 * self.params['hr'],
+                height=self.params['hb'] - self.params['hr'],
+                depth=2 * self.params['hr'],
+                color=(0, 0, 255)
+            ),
+            DiskSO(
+                center=Vec3(0, 0, 0),
+                radius=self.params['dw'] / 2.0,
+                thickness=self.params['ew'],
+                theta=0,
+                phi=np.pi / 2,
+                color=(0, 200, 0),
+            ),
+            DiskSO(
+                center=Vec3(0, 0, 0),
+                radius=self.params['dw'] / 2.0,
+                thickness=self.params['ew'],
+                theta=0,
+                phi=np.pi / 2,
+                color=(0, 200, 0),
+            ),
+        )
 
     @property
     def origin(self):
@@ -66,6 +108,10 @@ class Cart:
     def phi(self):
         return self._imus['fusion'].slocal.g.z
 
+    @property
+    def draw_origin(self):
+        return self._draw_pose[0] if self._draw_pose is not None else self.origin
+
     @property
     def imu(self):
         return self._imus['fusion']
@@ -78,6 +124,15 @@ class Cart:
         self._imus['meas-last'] = self._imus['meas'].copy()
         self._imus['meas'].update(raw_data.xdd, raw_data.gd, raw_data.time)
 
+    def update_imu_samples(self, samples: np.ndarray):
+        # Integrate every sample of a block from Receiver.drain, oldest first, keeping the state before the block
+        if len(samples) == 0:
+            return
+        self._imus['meas-last'] = self._imus['meas'].copy()
+        imu = self._imus['meas']
+        for t, ax, ay, az, gx, gy, gz in samples.tolist():
+            imu.update(Vec3(ax, ay, az), Vec3(gx, gy, gz), t)
+
     def _update_from_model(self, t, fq, fv):
         self._imus['model-origin-last'] = self._imus['model-origin'].copy()
         self._imus['model-origin'].sglobal.time = t
@@ -91,10 +146,9 @@ class Cart:
         if dt <= 0.0:
             return
 
-        # Update origin
-        xo = self._solver.fn_Xo(t, *fq, *fv)
-        xo_dot = self._solver.fn_Xo_dot(t, *fq, *fv)
+        xo, xo_dot, xc, xc_dot = self._solver.fn_kinematics(t, *fq, *fv)
 
+        # Update origin
         self._imus['model-origin'].sglobal.x = Vec3(xo)
         self._imus['model-origin'].sglobal.xd = Vec3(xo_dot)
         self._imus['model-origin'].sglobal.xdd = (self._imus['model-origin'].sglobal.xd - self._imus['model-origin-last'].sglobal.xd) / dt
@@ -112,9 +166,6 @@ class Cart:
         self._imus['model-origin'].slocal.gdd = (self._imus['model-origin'].slocal.gd - self._imus['model-origin-last'].slocal.gd) / dt
 
         # Update center
-        xc = self._solver.fn_Xc(t, *fq, *fv)
-        xc_dot = self._solver.fn_Xc_dot(t, *fq, *fv)
-
         self._imus['model'].sglobal.x = Vec3(xc)
         self._imus['model'].sglobal.xd = Vec3(xc_dot)
         self._imus['model'].sglobal.xdd = (self._imus['model'].sglobal.xd - self._imus['model-last'].sglobal.xd) / dt
@@ -150,13 +201,62 @@ class Cart:
             gd.z
         ])
 
-    def update_model(self, dt, fv):
-        sol_t, sol_f = self._solver.step(dt, self._make_f0(), fv)
-        self._update_from_model(self._imus['fusion'].sglobal.time + sol_t, sol_f, fv)
+    def fused_state(self):
+        return self._make_f0()
+
+    def step_model(self, dt, fq, fv, n_steps=1):
+        """
+        Advance the model state `fq` by `n_steps` fixed steps of `dt`, without touching the IMUs, and return the last
+        two states.
+        """
+        fq_last = fq
+        for _ in range(n_steps):
+            fq_last = fq
+            _, fq = self._solver.step(dt, fq, fv)
+        return fq_last, fq
+
+    def sync_model(self, t, fq_last, fq, fv):
+        """
+        Update the model IMUs from the state `fq` at time `t`, and keep the last two states for `interpolate`.
+        """
+        self._model_last, self._model_fq, self._model_fv = fq_last, fq, fv
+        self._model_t = t
+        self._update_from_model(t, fq, fv)
+
+    @property
+    def model_state(self):
+        # Time, state and wheel speeds of the last model step, or None before the first one
+        if self._model_fq is None:
+            return None
+        return self._model_t, self._model_fq, self._model_fv
+
+    def update_model(self, dt, fv, n_steps=1):
+        """
+        Advance the model by `n_steps` fixed steps of `dt` from the fused state. The IMUs are updated once, from the
+        last state.
+        """
+        fq_last, fq = self.step_model(dt, self._make_f0(), fv, n_steps)
+        self.sync_model(self._imus['fusion'].sglobal.time + n_steps * dt, fq_last, fq, fv)
+
+    def interpolate(self, alpha, states=None):
+        """
+        Draw the cart at `alpha` in [0, 1] between the last two model states, so that the drawn motion stays smooth
+        whatever the number of model steps per frame. The states `(fq_last, fq, fv)` of a physics snapshot can be given
+        instead of the ones of this cart, which another thread may be updating.
+        """
+        fq_last, fq, fv = states if states is not None else (self._model_last, self._model_fq, self._model_fv)
+        if fq_last is None:
+            return
+
+        fq = (1.0 - alpha) * fq_last + alpha * fq
+        _, _, xc, _ = self._solver.fn_kinematics(0.0, *fq, *fv)
+        center, theta, phi = Vec3(xc), float(fq[6]), float(fq[8])
+        self._draw_pose = (center - Vec3.rotate(Vec3(0, 0, self.params['hbc']), theta, phi), center, theta, phi)
 
     def update_state(self, source):
         if source == 'meas':
             print(self._imus['meas'])
+            self._draw_pose = None
             self._imus['fusion'] = self._imus['meas'].copy()
             self._imus['fusion-origin'] = self._imus['meas-origin'].copy()
         elif source == 'model':
@@ -167,42 +267,26 @@ class Cart:
 
     def draw(self, screen, camera):
         # TODO: Fix theta rotation
-        axle = BoxSO(
-            center=self.origin,
-            width=2 * self.params['eb'],
-            height=2 * self.params['hr'],
-            depth=2 * self.params['hr'],
-            theta=self.theta,
-            phi=self.phi,
-            color=(0, 0, 255)
-        )
-        body = BoxSO(
-            center=self.center,
-            width=2 * self.params['hr'],
-            height=self.params['hb'] - self.params['hr'],
-            depth=2 * self.params['hr'],
-            theta=self.theta,
-            phi=self.phi,
-            color=(0, 0, 255)
-        )
-        wheel_left = DiskSO(
-            center=self.origin + Vec3.rotate(Vec3(0, self.params['eb'], 0), self.theta, self.phi),
-            radius=self.params['dw'] / 2.0,
-            thickness=self.params['ew'],
-            theta=0,
-            phi=self.phi + np.pi / 2,
-            color=(0, 200, 0),
-            steps=24,
-        )
-        wheel_right = DiskSO(
-            center=self.origin + Vec3.rotate(Vec3(0, -self.params['eb'], 0), self.theta, self.phi),
-            radius=self.params['dw'] / 2.0,
-            thickness=self.params['ew'],
-            theta=0,
-            phi=self.phi + np.pi / 2,
-            color=(0, 200, 0),
-            steps=24,
-        )
+        axle, body, wheel_left, wheel_right = self._shapes
+        if self._draw_pose is not None:
+            origin, center, theta, phi = self._draw_pose
+        else:
+            origin, center, theta, phi = self.origin, self.center, self.theta, self.phi
+
+        # Only the pose changes between frames, the meshes are built once per geometry
+        axle.center = origin
+        axle.theta = theta
+        axle.phi = phi
+
+        body.center = center
+        body.theta = theta
+        body.phi = phi
+
+        wheel_left.center = origin + Vec3.rotate(Vec3(0, self.params['eb'], 0), theta, phi)
+        wheel_left.phi = phi + np.pi / 2
+
+        wheel_right.center = origin + Vec3.rotate(Vec3(0, -self.params['eb'], 0), theta, phi)
+        wheel_right.phi = phi + np.pi / 2
 
         screen.draw_object(camera, axle)
         screen.draw_object(camera, body)
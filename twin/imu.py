@@ -25,6 +25,9 @@ class ImuData:
 
 
 class Imu:
+    # Samples further apart, as is the first one from the initial time, restart the integration
+    MAX_DT = 0.1
+
     def __init__(self):
         self.sglobal = ImuData(
             0.0,
@@ -61,12 +64,10 @@ class Imu:
         return deepcopy(self)
 
     def update(self, accel, gyro, time):
+        dt = time - self.sglobal.time
         self.slocal.time = time
         self.sglobal.time = time
-
-        dt = time - self.sglobal.time
-        dt = max(0.016, dt)  # TODO: Fix and remove
-        if dt <= 0.0:
+        if dt <= 0.0 or dt > self.MAX_DT:
             return
 
         # Integrate acceleration in local frame as well
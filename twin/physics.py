@@ -0,0 +1,183 @@
+import contextlib
+import numpy as np
+import threading
+import time
+
+
+class FixedTimestep:
+    """
+    Accumulates the frame times into whole model steps of `dt`, independently of the frame rate. After a hitch at most
+    `max_steps` steps are run in one frame and the rest of the backlog is dropped, so that the model never spirals
+    behind; `alpha` is the fraction of a step left over, to draw the state between the last two steps.
+    """
+
+    def __init__(self, dt=1.0e-3, max_steps=50):
+        self.dt = dt
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0
+
+    def advance(self, frame_dt) -> int:
+        self.accumulator += frame_dt
+        n_steps = int(self.accumulator / self.dt)
+        if n_steps > self.max_steps:
+            self.dropped += (n_steps - self.max_steps) * self.dt
+            self.accumulator -= (n_steps - self.max_steps) * self.dt
+            n_steps = self.max_steps
+        self.accumulator -= n_steps * self.dt
+        return n_steps
+
+    @property
+    def alpha(self) -> float:
+        return min(max(self.accumulator / self.dt, 0.0), 1.0)
+
+
+def step_cart(cart, timestep, frame_dt, fv, profiler=None):
+    """
+    Step the cart model by the whole steps of the frame time, in the render loop, and draw it between the last two.
+    The model and state updates are timed as stages of the frame profiler, if any.
+    """
+    stage = profiler.stage if profiler is not None else lambda name: contextlib.nullcontext()
+
+    n_steps = timestep.advance(frame_dt)
+    if n_steps > 0:
+        with stage('update_model'):
+            cart.update_model(timestep.dt, fv, n_steps)
+        with stage('update_state'):
+            cart.update_state('model')
+    cart.interpolate(timestep.alpha)
+
+
+class Snapshot:
+    """
+    Model state published by the physics worker: the last two states and the wheel speeds between them, the model time
+    of the last state, and the wall time and step fraction at which it was published.
+    """
+
+    def __init__(self, dof=5):
+        self.fq_last = np.zeros(2 * dof)
+        self.fq = np.zeros(2 * dof)
+        self.fv = np.zeros(2)
+        self.t = 0.0
+        self.wall = 0.0
+        self.alpha = 0.0
+
+    def copy_from(self, other):
+        self.fq_last[:] = other.fq_last
+        self.fq[:] = other.fq
+        self.fv[:] = other.fv
+        self.t, self.wall, self.alpha = other.t, other.wall, other.alpha
+
+
+class SnapshotBuffer:
+    """
+    Double-buffered snapshot slot with a single writer and any number of readers, without locks.
+
+    The writer fills the back buffer, then flips the front index. A sequence number, odd while a flip is in progress,
+    lets the readers detect a publish during their copy, after which the next one may already be overwriting the buffer
+    they copy from, and copy again. The writer never waits for the readers, and a copy takes microseconds against a
+    publish every model step, so retries are rare.
+    """
+
+    def __init__(self, dof=5):
+        self._buffers = (Snapshot(dof), Snapshot(dof))
+        self._front = 0
+        self._seq = 0
+
+    def publish(self, fq_last, fq, fv, t, alpha):
+        back = self._buffers[1 - self._front]
+        back.fq_last[:] = fq_last
+        back.fq[:] = fq
+        back.fv[:] = fv
+        back.t, back.wall, back.alpha = t, time.perf_counter(), alpha
+
+        self._seq += 1
+        self._front = 1 - self._front
+        self._seq += 1
+
+    def read(self, out: Snapshot) -> Snapshot:
+        while True:
+            seq = self._seq
+            if seq % 2 == 0:
+                out.copy_from(self._buffers[self._front])
+                if self._seq == seq:
+                    return out
+            time.sleep(0)
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+
+class PhysicsWorker(threading.Thread):
+    """
+    Runs the cart model on its own thread at a fixed step of `dt` in wall-clock time, and publishes a snapshot after
+    each batch of steps. The renderer reads the latest snapshot at its own rate, while the NumPy and LAPACK work of the
+    model overlaps with the pygame work of the frame whenever either releases the GIL.
+
+    The worker owns the model state, from the fused state of the cart when it is created, and steps it with
+    `Cart.step_model`, which leaves the cart as it is. The cart, which the renderer reads, is only updated on the render
+    thread by `interpolate_cart`, which also brings its IMUs, costly to update, to the latest snapshot every
+    `sync_interval` seconds of model time.
+    """
+
+    def __init__(self, cart, dt=1.0e-3, max_steps=50, fv=(0.0, 0.0), sync_interval=1.0 / 60.0):
+        super().__init__(daemon=True)
+        self.cart = cart
+        self.timestep = FixedTimestep(dt, max_steps)
+        self.snapshots = SnapshotBuffer()
+        self.fv = list(fv)
+        self.sync_interval = sync_interval
+
+        self._fq = cart.fused_state()
+        self._t = self._t_sync = cart.imu.sglobal.time
+
+        self.steps = 0
+        self.busy = 0.0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        cart = self.cart
+        timestep = self.timestep
+        fq = self._fq
+        t = self._t
+        t_last = time.perf_counter()
+
+        while not self._stop_event.is_set():
+            now = time.perf_counter()
+            n_steps = timestep.advance(now - t_last)
+            t_last = now
+
+            if n_steps > 0:
+                fv = list(self.fv)
+                fq_last, fq = cart.step_model(timestep.dt, fq, fv, n_steps)
+                t += n_steps * timestep.dt
+                self.snapshots.publish(fq_last, fq, fv, t, timestep.alpha)
+                self.steps += n_steps
+                self.busy += time.perf_counter() - now
+
+            # Sleep until the next step is due, which also releases the GIL to the renderer
+            time.sleep(max(timestep.dt - timestep.accumulator, 0.0))
+
+    def interpolate_cart(self, snapshot: Snapshot, profiler=None):
+        """
+        Draw the cart from the latest snapshot, read into `snapshot`, at its step fraction advanced by the wall time
+        since it was published, on the render thread. The IMU update from the snapshot is timed as a stage of the frame
+        profiler, if any.
+        """
+        if self.snapshots.seq == 0:
+            return
+        self.snapshots.read(snapshot)
+        if snapshot.t - self._t_sync >= self.sync_interval:
+            stage = profiler.stage if profiler is not None else lambda name: contextlib.nullcontext()
+            with stage('update_state'):
+                # Copies, as the snapshot is read into again on the next frame
+                self.cart.sync_model(snapshot.t, snapshot.fq_last.copy(), snapshot.fq.copy(), snapshot.fv.tolist())
+                self.cart.update_state('model')
+            self._t_sync = snapshot.t
+        alpha = min(snapshot.alpha + (time.perf_counter() - snapshot.wall) / self.timestep.dt, 1.0)
+        self.cart.interpolate(alpha, (snapshot.fq_last, snapshot.fq, snapshot.fv))
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
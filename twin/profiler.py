@@ -0,0 +1,127 @@
+import contextlib
+import csv
+import json
+import numpy as np
+import time
+
+
+class FrameProfiler:
+    """
+    Per-stage frame timings over a rolling window of the last `window` frames.
+
+    The stages of a frame are timed with `stage`, or recorded from timings measured elsewhere with `record`, and
+    `end_frame` closes the frame. Percentiles are computed over the window on demand, for the HUD overlay or the
+    CSV/JSON export; a stage absent from a frame does not count in its percentiles.
+    """
+
+    STAGES = ('input', 'receiver', 'update_model', 'update_state', 'build', 'transform', 'sort', 'raster', 'background',
+              'flip')
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, window=600, stages=STAGES):
+        self.stages = tuple(stages) + ('frame',)
+        self.window = window
+
+        # Ring buffer of the stage durations in seconds, NaN for the stages absent from a frame
+        self._samples = np.full((window, len(self.stages)), np.nan)
+        self._index = {stage: i for i, stage in enumerate(self.stages)}
+        self._current = np.full(len(self.stages), np.nan)
+        self._frame_start = None
+        self.frames = 0
+
+        # HUD overlay, with its text refreshed at most every `hud_period` seconds to stay readable and cheap
+        self.visible = False
+        self.hud_period = 0.25
+        self._hud = ([], -np.inf)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - t0)
+
+    def record(self, name, seconds):
+        i = self._index[name]
+        self._current[i] = seconds if np.isnan(self._current[i]) else self._current[i] + seconds
+
+    def record_timings(self, timings):
+        # The stages among timings measured elsewhere, such as Screen.timings
+        for name, seconds in timings.items():
+            if name in self._index:
+                self.record(name, seconds)
+
+    def end_frame(self):
+        # The frame time runs from the end of the previous frame, so that it includes the waits of the loop
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._current[self._index['frame']] = now - self._frame_start
+        self._frame_start = now
+
+        self._samples[self.frames % self.window] = self._current
+        self._current[:] = np.nan
+        self.frames += 1
+
+    @property
+    def samples(self):
+        # The frames of the window, oldest first
+        n = min(self.frames, self.window)
+        return np.roll(self._samples, -(self.frames % self.window), axis=0)[self.window - n:]
+
+    def percentiles(self) -> dict[str, dict[str, float]]:
+        samples = self.samples
+        summary = {}
+        for i, stage in enumerate(self.stages):
+            values = samples[:, i]
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                continue
+            p = np.percentile(values, self.PERCENTILES)
+            summary[stage] = {f'p{q}': float(v) for q, v in zip(self.PERCENTILES, p)}
+            summary[stage]['max'] = float(values.max())
+            summary[stage]['count'] = int(values.size)
+        return summary
+
+    def hud_lines(self) -> list[str]:
+        lines = [f"{'stage':<13}{'p50':>8}{'p95':>8}{'p99':>8}  ms"]
+        for stage, p in self.percentiles().items():
+            lines.append(f"{stage:<13}{1.0e3 * p['p50']:8.2f}{1.0e3 * p['p95']:8.2f}{1.0e3 * p['p99']:8.2f}")
+        return lines
+
+    def draw(self, screen, p=(10, 40), line_height=20):
+        if not self.visible:
+            return
+        lines, t = self._hud
+        now = time.perf_counter()
+        if now - t >= self.hud_period:
+            lines = self.hud_lines()
+            self._hud = (lines, now)
+
+        x, y = p
+        for k, line in enumerate(lines):
+            screen.draw_text(line, (x, y + k * line_height), background=(255, 255, 255), font=screen.hud_font)
+
+    def export_csv(self, path):
+        # One row per frame of the window, with the durations in milliseconds
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('index',) + self.stages)
+            first = self.frames - len(self.samples)
+            for k, row in enumerate(self.samples):
+                writer.writerow([first + k] + ['' if np.isnan(v) else f'{1.0e3 * v:.4f}' for v in row])
+
+    def export_json(self, path):
+        # Percentiles in milliseconds over the window
+        summary = {
+            stage: {key: (1.0e3 * value if key != 'count' else value) for key, value in p.items()}
+            for stage, p in self.percentiles().items()
+        }
+        with open(path, 'w') as f:
+            json.dump({'frames': self.frames, 'window': min(self.frames, self.window), 'stages_ms': summary}, f, indent=2)
+
+    def export(self, path):
+        if str(path).endswith('.csv'):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
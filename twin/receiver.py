@@ -1,19 +1,93 @@
 import abc
-import firebase_admin
+import base64
+import http.client
 import json
+import numpy as np
+import selectors
+import socket
+import struct
 import threading
 import time
+import urllib.parse
 
-from firebase_admin import credentials
-from firebase_admin import db
 from imu import ImuData, ImuRawData
 from vec3 import Vec3
 
 
 class Receiver(abc.ABC):
-    @abc.abstractmethod
+    """
+    Source of the cart's IMU samples. The raw samples are kept in a preallocated ring of the last `history` ones, a row
+    of `COLUMNS` each, of which `drain` and `receive_since` return views without copying. The ring is stored twice in a
+    row, so that any run of up to `history` consecutive samples is contiguous.
+
+    A view of L rows starts being overwritten after `history - L` new samples, the oldest of its rows being written
+    again `history` samples after it: a consumer copies the samples it keeps before that many more may arrive, and a
+    full view of `history` rows is only valid until the next sample. Samples not drained within `history` are dropped
+    and counted in `stats`.
+    """
+
+    COLUMNS = ('t', 'ax', 'ay', 'az', 'gx', 'gy', 'gz')
+    _ROW = struct.Struct('7d')
+
+    def __init__(self, history=4096):
+        self._samples = np.zeros((2 * history, len(self.COLUMNS)))
+        self._history = history
+        self._head = 0
+        self._tail = 0
+
+        self._lock = threading.Lock()
+        self.stats = {'received': 0, 'dropped': 0}
+
+    def _append_raw(self, t, xdd, gd):
+        # Called with the lock held, by the receiving thread, writing both copies of the row in place
+        offset = (self._head % self._history) * self._ROW.size
+        self._ROW.pack_into(self._samples, offset, t, *xdd, *gd)
+        self._ROW.pack_into(self._samples, offset + self._history * self._ROW.size, t, *xdd, *gd)
+        self._head += 1
+        self.stats['received'] += 1
+        if self._head - self._tail > self._history:
+            self._tail += 1
+            self.stats['dropped'] += 1
+
+    def _append_rows(self, rows):
+        # Called with the lock held, a block of up to `history` rows of COLUMNS at once, into both copies of the ring
+        n, h = len(rows), self._history
+        i = self._head % h
+        self._samples[i:i + n] = rows
+        split = min(h - i, n)
+        self._samples[i + h:i + h + split] = rows[:split]
+        self._samples[:n - split] = rows[split:]
+        self._head += n
+        self.stats['received'] += n
+        if self._head - self._tail > h:
+            self.stats['dropped'] += self._head - self._tail - h
+            self._tail = self._head - h
+
+    def _window(self, start):
+        # The samples from `start` to the last one, which must all be in the ring
+        i = start % self._history
+        return self._samples[i:i + self._head - start]
+
+    def drain(self) -> np.ndarray:
+        # Every sample received since the last call, oldest first
+        with self._lock:
+            samples = self._window(self._tail)
+            self._tail = self._head
+        return samples
+
+    def receive_since(self, t) -> np.ndarray:
+        # The samples of the ring stamped after t, oldest first, drained or not
+        with self._lock:
+            samples = self._window(max(self._head - self._history, 0))
+        return samples[np.searchsorted(samples[:, 0], t, side='right'):]
+
     def receive_raw(self):
-        return NotImplementedError()
+        # The latest sample
+        with self._lock:
+            if self._head == 0:
+                return None
+            t, ax, ay, az, gx, gy, gz = self._samples[(self._head - 1) % self._history].tolist()
+        return ImuRawData(t, Vec3(ax, ay, az), Vec3(gx, gy, gz))
 
     @abc.abstractmethod
     def receive_imu(self):
@@ -21,48 +95,188 @@ class Receiver(abc.ABC):
 
 
 class ReceiverFirebase(Receiver):
-    def __init__(self, host, auth, poll_interval=0.01, proxies=None):
+    """
+    Listens to the Realtime Database over its REST streaming API, a server-sent events stream of every write under
+    `path`, instead of polling it. Each raw sample, or each frame of a batch written to /batch, joins the history of the
+    receiver as it arrives.
+
+    `auth` is the service account key file, or None for a database, or a stand-in server, without authentication.
+    """
+
+    # Beyond the 30 s between the keep-alive events of the server, a silent stream is dead and is reopened
+    READ_TIMEOUT = 60.0
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, host, auth=None, path="/", history=4096, proxies=None):
+        super().__init__(history)
         self.host = host
-        self._auth = credentials.Certificate(auth)
-        self._proxies = proxies
+        self.path = path
+        self._auth = auth
+        self._credential = None
+        self._proxies = proxies or {}
 
-        # Initialize Firebase app once
-        self._app = firebase_admin.initialize_app(
-            self._auth, options={"databaseURL": self.host}
-        )
+        # Local copy of the listened tree, updated by the put and patch events
+        self._tree = None
 
         # Shared state
-        self._latest_raw = None
         self._latest_imu = None
-        self._lock = threading.Lock()
         self._stop_event = threading.Event()
+        self._socket = None
 
-        # Start polling thread
-        self._thread = threading.Thread(
-            target=self._poll_loop,
-            args=(poll_interval,),
-            daemon=True
-        )
+        # The raw samples and the batches of frames are both followed from the cart's clock, their latency over the
+        # best case; events that do not parse are counted and skipped
+        self.stats.update(reconnects=0, malformed=0)
+        self._tracker = _FrameTracker(self.stats)
+
+        # Start listening thread
+        self._thread = threading.Thread(target=self._listen_loop, daemon=True)
         self._thread.start()
 
-    def _get_content(self, path):
-        ref = db.reference(path, app=self._app)
-        return ref.get()
+    def _access_token(self):
+        if self._auth is None:
+            return None
+        if self._credential is None:
+            # Only the authenticated listener needs firebase_admin
+            from firebase_admin import credentials
+            self._credential = credentials.Certificate(self._auth)
+        return self._credential.get_access_token().access_token
+
+    def _open_stream(self, url):
+        # The socket is kept to be shut down by stop, as the connection lets go of it once a stream is open
+        parts = urllib.parse.urlsplit(url)
+        https = parts.scheme == 'https'
+        proxy = self._proxies.get(parts.scheme)
+        cls = http.client.HTTPSConnection if https else http.client.HTTPConnection
+        if proxy:
+            proxy = urllib.parse.urlsplit(proxy)
+            connection = cls(proxy.hostname, proxy.port, timeout=self.READ_TIMEOUT)
+            connection.set_tunnel(parts.hostname, parts.port)
+        else:
+            connection = cls(parts.hostname, parts.port, timeout=self.READ_TIMEOUT)
+
+        target = parts.path + ('?' + parts.query if parts.query else '')
+        connection.request('GET', target, headers={'Accept': 'text/event-stream'})
+        self._socket = connection.sock
+        return connection.getresponse()
 
-    def _poll_loop(self, poll_interval):
+    def _stream_url(self):
+        # The REST location of the path, e.g. https://<db>.firebaseio.com/raw.json, or /.json for the root
+        url = self.host.rstrip('/') + '/' + self.path.strip('/') + '.json'
+        token = self._access_token()
+        return url + ('?' + urllib.parse.urlencode({'access_token': token}) if token else '')
+
+    def _listen_loop(self):
         while not self._stop_event.is_set():
-            raw_data = self._fetch_raw_blocking()
-            imu_data = self._fetch_imu_blocking()
+            try:
+                url = self._stream_url()
+                # The database redirects a stream to the server that holds the data
+                for _ in range(5):
+                    response = self._open_stream(url)
+                    if response.status not in (301, 302, 307, 308):
+                        break
+                    url = response.getheader('Location')
+                    response.close()
+
+                if response.status != 200:
+                    raise ConnectionError(f"stream refused with HTTP status {response.status}")
+                self._read_events(response)
+            except (OSError, http.client.HTTPException, ValueError):
+                pass
+            finally:
+                if self._socket is not None:
+                    self._socket.close()
+                    self._socket = None
+
+            if not self._stop_event.wait(self.RECONNECT_DELAY):
+                self.stats['reconnects'] += 1
+
+    def _read_events(self, response):
+        event, data = None, []
+        while not self._stop_event.is_set():
+            line = response.readline()
+            if not line:
+                return
+            line = line.decode('utf-8').rstrip('\r\n')
+
+            if line.startswith('event:'):
+                event = line[6:].strip()
+            elif line.startswith('data:'):
+                data.append(line[5:].strip())
+            elif not line:
+                if event is not None:
+                    if not self._on_event(event, '\n'.join(data)):
+                        return
+                event, data = None, []
+
+    def _on_event(self, event, data) -> bool:
+        # Returns False when the stream has to be reopened
+        if event in ('put', 'patch'):
+            try:
+                message = json.loads(data)
+                self._apply(event, message['path'], message['data'])
+            except (ValueError, KeyError, TypeError, AttributeError):
+                # A malformed message is skipped, the stream goes on
+                self.stats['malformed'] += 1
+            return True
+        elif event == 'keep-alive':
+            return True
+        elif event in ('cancel', 'auth_revoked'):
+            return False
+        return True
+
+    def _apply(self, event, path, data):
+        root = [key for key in self.path.split('/') if key]
+        keys = [key for key in path.split('/') if key]
+        if event == 'put':
+            updates = [(keys, data)]
+        else:
+            updates = [(keys + [key for key in child.split('/') if key], value) for child, value in data.items()]
 
-            with self._lock:
-                self._latest_raw = raw_data
-                self._latest_imu = imu_data
+        # The samples under the listened path that the write touched, whole or in part
+        touched = set()
+        for update_keys, value in updates:
+            self._tree = json_tree_set(self._tree, update_keys, value)
+            touched.update((root + update_keys)[:1] or ('raw', 'imu', 'batch'))
 
-            time.sleep(poll_interval)
+        for name, on_data in (('raw', self._on_raw), ('imu', self._on_imu), ('batch', self._on_batch)):
+            if name in touched and root in ([], [name]):
+                on_data(json_tree_get(self._tree, [name][len(root):]))
 
-    def _fetch_raw_blocking(self):
-        data = self._get_content("/raw")
-        if not data:
+    def _on_raw(self, data):
+        raw_data = self._parse_raw(data)
+        if raw_data is None:
+            return
+
+        arrival = time.perf_counter()
+        with self._lock:
+            self._append_raw(raw_data.time, raw_data.xdd.array, raw_data.gd.array)
+            if raw_data.time > 0.0:
+                self._tracker.record(1.0e6 * raw_data.time, arrival)
+
+    def _on_batch(self, data):
+        # A batch uploaded whole by the cart, which a partial write leaves incomplete until the last one
+        try:
+            frames = decode_batch(data)
+        except (KeyError, TypeError, ValueError):
+            return
+
+        arrival = time.perf_counter()
+        with self._lock:
+            columns = (frames[key].tolist() for key in ('seq', 'timestamp_us', 'xdd', 'gd'))
+            for seq, timestamp_us, xdd, gd in zip(*columns):
+                if self._tracker.accept(seq, timestamp_us, arrival):
+                    self._append_raw(1.0e-6 * timestamp_us, xdd, gd)
+
+    def _on_imu(self, data):
+        imu_data = self._parse_imu(data)
+        if imu_data is None:
+            return
+        with self._lock:
+            self._latest_imu = imu_data
+
+    @staticmethod
+    def _parse_raw(data):
+        if not data or not isinstance(data, dict):
             return None
 
         ts = data.get("timestamp", 0) / 1000.0
@@ -75,9 +289,9 @@ class ReceiverFirebase(Receiver):
             Vec3(gd.get('x',0),   gd.get('y',0),   gd.get('z',0))
         )
 
-    def _fetch_imu_blocking(self):
-        data = self._get_content("/imu")
-        if not data:
+    @staticmethod
+    def _parse_imu(data):
+        if not data or not isinstance(data, dict):
             return None
 
         ts = data.get("timestamp", 0) / 1000.0
@@ -94,12 +308,234 @@ class ReceiverFirebase(Receiver):
 
     def stop(self):
         self._stop_event.set()
+        # Unblock the listening thread, which waits on the stream
+        sock = self._socket
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
         self._thread.join()
 
-    def receive_raw(self):
-        with self._lock:
-            return self._latest_raw
-
     def receive_imu(self):
         with self._lock:
             return self._latest_imu
+
+
+def _record_latency(stats, latency, n):
+    # Last, running mean and max of the n latencies so far, this one included
+    stats['latency_last'] = latency
+    stats['latency_mean'] = latency if n == 1 else stats['latency_mean'] + (latency - stats['latency_mean']) / n
+    stats['latency_max'] = latency if n == 1 else max(stats['latency_max'], latency)
+
+
+# One IMU sample of the cart's UDP telemetry, laid out as mb::ImuFrame in esw/include/telemetry.hpp
+IMU_FRAME = np.dtype([
+    ('magic', '<u2'), ('version', 'u1'), ('flags', 'u1'), ('seq', '<u4'), ('timestamp_us', '<u8'),
+    ('xdd', '<f4', (3,)), ('gd', '<f4', (3,)),
+])
+IMU_FRAME_MAGIC = 0x424D
+IMU_FRAME_VERSION = 1
+
+
+def decode_batch(data) -> np.ndarray:
+    """
+    The frames of a batch uploaded by the cart to the database, {"seq", "n", "frames"} with the frames as a base64 block
+    of IMU_FRAME, as an IMU_FRAME array over the decoded bytes.
+    """
+    block = base64.b64decode(data['frames'])
+    if len(block) != data['n'] * IMU_FRAME.itemsize:
+        raise ValueError(f"batch of {data['n']} frames has {len(block)} bytes")
+    frames = np.frombuffer(block, dtype=IMU_FRAME)
+    if np.any(frames['magic'] != IMU_FRAME_MAGIC) or np.any(frames['version'] != IMU_FRAME_VERSION):
+        raise ValueError("batch of unknown frames")
+    return frames
+
+
+class _FrameTracker:
+    """
+    Follows the sequence numbers and timestamps of the cart's frames into `stats`: the gaps in the sequence count as
+    lost frames, and the latency is taken over the best case so far, as the cart's clock runs from its boot. The raw
+    samples, which have no sequence number, only go through `record`.
+    """
+
+    # A frame this far behind the last one is repeated or late, one further behind is from a restarted cart
+    LATE = 4096
+
+    def __init__(self, stats):
+        self._stats = stats
+        self._seq = None
+        self._timestamp_us = None
+        self._offset_min = float('inf')
+        self._latency_count = 0
+        stats.update(lost=0, latency_last=float('nan'), latency_mean=float('nan'), latency_max=float('nan'))
+
+    def accept(self, seq, timestamp_us, arrival) -> bool:
+        # False for a repeated or late frame, which is left out to keep the history in order
+        if self._seq is not None:
+            gap = (seq - self._seq - 1) & 0xFFFFFFFF
+            if gap < 0x80000000:
+                self._stats['lost'] += gap
+            elif (self._seq - seq) & 0xFFFFFFFF < self.LATE:
+                return False
+            else:
+                self._offset_min = float('inf')
+        self._seq = seq
+        self.record(timestamp_us, arrival)
+        return True
+
+    def accept_block(self, seq, timestamp_us, arrival):
+        """
+        `accept` for the arrays of a block of frames arrived together: None when all of them are accepted, else the
+        mask of the accepted ones. A block in order after the last frame, the usual case, is followed with array
+        operations, any other one frame by frame.
+        """
+        # The gaps in the sequence, of which a repeated, late or restarted frame makes one of 2³¹ or more
+        gaps = np.empty(len(seq), dtype=np.uint32)
+        gaps[0] = (int(seq[0]) - self._seq - 1) & 0xFFFFFFFF if self._seq is not None else 0
+        np.subtract(seq[1:], seq[:-1], out=gaps[1:])
+        gaps[1:] -= np.uint32(1)
+        in_order = gaps.max() < 0x80000000 and np.all(timestamp_us[1:] >= timestamp_us[:-1])
+        if self._timestamp_us is not None:
+            in_order = in_order and timestamp_us[0] >= self._timestamp_us
+        if not in_order:
+            return np.array([self.accept(*frame, arrival) for frame in zip(seq.tolist(), timestamp_us.tolist())],
+                            dtype=bool)
+
+        self._stats['lost'] += int(gaps.sum(dtype=np.int64))
+        self._seq = int(seq[-1])
+        self._timestamp_us = int(timestamp_us[-1])
+
+        # The running best case over the block, and the latencies over it
+        offsets = arrival - 1.0e-6 * timestamp_us
+        offsets_min = np.minimum.accumulate(offsets)
+        np.minimum(offsets_min, self._offset_min, out=offsets_min)
+        self._offset_min = float(offsets_min[-1])
+        latencies = offsets - offsets_min
+
+        n = self._latency_count
+        self._latency_count += len(latencies)
+        stats = self._stats
+        total = latencies.sum() + (n * stats['latency_mean'] if n > 0 else 0.0)
+        stats['latency_last'] = float(latencies[-1])
+        stats['latency_mean'] = float(total / self._latency_count)
+        stats['latency_max'] = float(latencies.max() if n == 0 else max(stats['latency_max'], latencies.max()))
+        return None
+
+    def record(self, timestamp_us, arrival):
+        # The latency of a sample stamped by the cart and arrived at `arrival` on the perf_counter clock, from scratch
+        # when the cart's clock went back, as after a reboot
+        if self._timestamp_us is not None and timestamp_us < self._timestamp_us:
+            self._offset_min = float('inf')
+        self._timestamp_us = timestamp_us
+
+        offset = arrival - 1.0e-6 * timestamp_us
+        self._offset_min = min(self._offset_min, offset)
+        self._latency_count += 1
+        _record_latency(self._stats, offset - self._offset_min, self._latency_count)
+
+
+class ReceiverUdp(Receiver):
+    """
+    Receives the cart's IMU frames over UDP on the LAN, one datagram per sample. The datagrams waiting on the socket are
+    read at once into the slots of a preallocated IMU_FRAME block, up to `BLOCK` of them, which then joins the history
+    of the receiver with array operations, without Python objects per sample. The lost frames and the latency are
+    counted in `stats`, as followed by _FrameTracker.
+    """
+
+    BLOCK = 256
+
+    def __init__(self, port=4210, host='0.0.0.0', history=4096):
+        super().__init__(history)
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._sock.bind((host, port))
+        self._sock.setblocking(False)
+
+        # The block of frames, a byte view of each of its slots to receive into, and the rows of the ring they make
+        n = min(self.BLOCK, history)
+        self._frames = np.zeros(n, dtype=IMU_FRAME)
+        block = memoryview(self._frames).cast('B')
+        self._slots = [block[k * IMU_FRAME.itemsize:(k + 1) * IMU_FRAME.itemsize] for k in range(n)]
+        self._rows = np.empty((n, len(self.COLUMNS)))
+
+        self._tracker = _FrameTracker(self.stats)
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._receive_loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self):
+        return self._sock.getsockname()
+
+    def _receive_loop(self):
+        sock, slots = self._sock, self._slots
+        with selectors.DefaultSelector() as selector:
+            selector.register(sock, selectors.EVENT_READ)
+            while not self._stop_event.is_set():
+                if not selector.select(0.1):
+                    continue
+
+                # The datagrams waiting, a frame each, the others being skipped
+                n = 0
+                while n < len(slots):
+                    try:
+                        nbytes = sock.recv_into(slots[n])
+                    except BlockingIOError:
+                        break
+                    except OSError:
+                        return
+                    if nbytes == IMU_FRAME.itemsize:
+                        n += 1
+                if n > 0:
+                    self._on_frames(n, time.perf_counter())
+
+    def _on_frames(self, n, arrival):
+        frames, rows = self._frames[:n], self._rows[:n]
+        valid = (frames['magic'] == IMU_FRAME_MAGIC) & (frames['version'] == IMU_FRAME_VERSION)
+        if not valid.all():
+            frames = frames[valid]
+            rows = rows[:len(frames)]
+            if len(frames) == 0:
+                return
+
+        np.multiply(frames['timestamp_us'], 1.0e-6, out=rows[:, 0])
+        rows[:, 1:4] = frames['xdd']
+        rows[:, 4:7] = frames['gd']
+
+        with self._lock:
+            accepted = self._tracker.accept_block(frames['seq'], frames['timestamp_us'], arrival)
+            self._append_rows(rows if accepted is None else rows[accepted])
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+        self._sock.close()
+
+    def receive_imu(self):
+        # The cart only sends its raw samples over UDP
+        return None
+
+
+def json_tree_get(tree, keys):
+    # The value at the path of keys in a JSON tree, or None
+    for key in keys:
+        if not isinstance(tree, dict):
+            return None
+        tree = tree.get(key)
+    return tree
+
+
+def json_tree_set(tree, keys, value):
+    # Set the value at the path of keys in a JSON tree, where None deletes, as in the database
+    if not keys:
+        return value
+    tree = dict(tree) if isinstance(tree, dict) else {}
+    child = json_tree_set(tree.get(keys[0]), keys[1:], value)
+    if child is None:
+        tree.pop(keys[0], None)
+    else:
+        tree[keys[0]] = child
+    return tree if tree else None
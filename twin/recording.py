@@ -0,0 +1,198 @@
+import numpy as np
+import os
+import struct
+import threading
+import time
+
+from receiver import Receiver
+
+
+# Fixed-size records of a log: the IMU channels in data[:6] for KIND_IMU, the model state fq in data[:10] and the
+# wheel speeds fv in data[10:12] for KIND_STATE
+RECORD = np.dtype([
+    ('source', '<u2'), ('kind', '<u2'), ('reserved', '<u4'), ('t', '<f8'), ('data', '<f8', (12,)),
+])
+KIND_IMU = 1
+KIND_STATE = 2
+
+# Conventional sources: the cart's IMU, and the twin's model
+SOURCE_CART = 0
+SOURCE_MODEL = 1
+
+_HEADER = struct.Struct('<4sHH8x')
+_MAGIC = b'MBLG'
+_VERSION = 1
+
+
+class LogWriter:
+    """
+    Appends records to a binary log, created with its header if new. Records are buffered by the file; a record cut
+    short by a crash is ignored by the reader, and truncated when the log is reopened so that the next records stay
+    aligned.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(_MAGIC, _VERSION, RECORD.itemsize))
+        else:
+            _check_header(path)
+            n = (self._file.tell() - _HEADER.size) // RECORD.itemsize
+            self._file.truncate(_HEADER.size + n * RECORD.itemsize)
+        self._record = np.zeros(1, dtype=RECORD)
+
+    def write_imu(self, source, t, xdd, gd):
+        record = self._record
+        record['source'], record['kind'], record['t'] = source, KIND_IMU, t
+        record['data'][0, :3] = xdd
+        record['data'][0, 3:6] = gd
+        record['data'][0, 6:] = 0.0
+        self._file.write(record)
+
+    def write_imu_samples(self, source, samples):
+        # A block of samples, a row of Receiver.COLUMNS each
+        records = np.zeros(len(samples), dtype=RECORD)
+        records['source'], records['kind'] = source, KIND_IMU
+        records['t'] = samples[:, 0]
+        records['data'][:, :6] = samples[:, 1:7]
+        self._file.write(records)
+
+    def write_state(self, source, t, fq, fv):
+        record = self._record
+        record['source'], record['kind'], record['t'] = source, KIND_STATE, t
+        record['data'][0, :10] = fq
+        record['data'][0, 10:] = fv
+        self._file.write(record)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LogReader:
+    """
+    Memory-mapped view of a binary log: the columns of the records are NumPy arrays over the file, read from disk as
+    they are accessed, so that hours of data open at once. The selections by kind and source are copies.
+    """
+
+    def __init__(self, path):
+        _check_header(path)
+        n = (os.path.getsize(path) - _HEADER.size) // RECORD.itemsize
+        if n > 0:
+            self.records = np.memmap(path, dtype=RECORD, mode='r', offset=_HEADER.size, shape=(n,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def t(self) -> np.ndarray:
+        return self.records['t']
+
+    @property
+    def source(self) -> np.ndarray:
+        return self.records['source']
+
+    @property
+    def kind(self) -> np.ndarray:
+        return self.records['kind']
+
+    def select(self, kind=None, source=None) -> np.ndarray:
+        mask = np.ones(len(self.records), dtype=bool)
+        if kind is not None:
+            mask &= self.records['kind'] == kind
+        if source is not None:
+            mask &= self.records['source'] == source
+        return self.records[mask]
+
+    def imu_samples(self, source=None) -> np.ndarray:
+        # The IMU records as rows of Receiver.COLUMNS
+        records = self.select(KIND_IMU, source)
+        samples = np.empty((len(records), len(Receiver.COLUMNS)))
+        samples[:, 0] = records['t']
+        samples[:, 1:] = records['data'][:, :6]
+        return samples
+
+    def states(self, source=None):
+        # Times, model states and wheel speeds of the state records
+        records = self.select(KIND_STATE, source)
+        return records['t'], records['data'][:, :10], records['data'][:, 10:]
+
+
+def _check_header(path):
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError(f"{path} is not a log: no header")
+    magic, version, record_size = _HEADER.unpack(header)
+    if magic != _MAGIC or version != _VERSION or record_size != RECORD.itemsize:
+        raise ValueError(f"{path} is not a log of version {_VERSION}")
+
+
+class ReceiverReplay(Receiver):
+    """
+    Plays back the IMU records of a log as a receiver: at their recorded pace times `speed`, or as fast as the consumer
+    drains them with `speed=None`, in which case the playback waits for each block to be drained rather than drop
+    samples. `finished` is set once every sample was played.
+    """
+
+    # Samples played at once at most, as fast as possible
+    CHUNK = 1024
+
+    def __init__(self, path, speed=1.0, source=SOURCE_CART, history=4096):
+        super().__init__(history)
+        self.speed = speed
+        self._log = LogReader(path).imu_samples(source)
+        self.finished = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._replay_loop, daemon=True)
+        self._thread.start()
+
+    def _replay_loop(self):
+        samples = self._log
+        n = len(samples)
+        i = 0
+        if n > 0:
+            t0_log, t0_wall = samples[0, 0], time.perf_counter()
+
+        while i < n and not self._stop_event.is_set():
+            if self.speed is None:
+                # The next block once the last one was drained, into the other half of the ring than the view returned
+                # by that drain, which then stays valid until the next one
+                with self._lock:
+                    drained = self._head == self._tail
+                if not drained:
+                    self._stop_event.wait(1.0e-4)
+                    continue
+                j = min(i + self.CHUNK, i + self._history // 2, n)
+            else:
+                # The samples due by now, or else a sleep until the next one
+                t_log = t0_log + (time.perf_counter() - t0_wall) * self.speed
+                j = int(np.searchsorted(samples[:, 0], t_log, side='right'))
+                if j <= i:
+                    self._stop_event.wait(min((samples[i, 0] - t_log) / self.speed, 0.1))
+                    continue
+                j = min(j, i + self._history)
+
+            with self._lock:
+                self._append_rows(samples[i:j])
+            i = j
+
+        self.finished.set()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+    def receive_imu(self):
+        # A log holds the raw samples
+        return None
@@ -1,23 +1,45 @@
 from __future__ import annotations
 
 import abc
+import functools
 import numpy as np
 import numpy.typing as npt
 import pygame
-import queue
+import time
 
 from vec3 import Vec3
 
 
 class Screen:
-    def __init__(self, width, height):
+    def __init__(self, width, height, headless=False):
         self._width = width
         self._height = height
 
-        self._pg_screen = pygame.display.set_mode((self.width, self.height))
+        # A headless screen renders to an off-screen surface, exported with save_frame or frame_bytes
+        self.headless = headless
+        if headless:
+            self._pg_screen = pygame.Surface((self.width, self.height))
+        else:
+            self._pg_screen = pygame.display.set_mode((self.width, self.height))
         self.font = pygame.font.SysFont(None, 28)
+        self.hud_font = pygame.font.SysFont('monospace', 18)
+
+        # Frame-level draw lists of the static and dynamic objects and of the HUD texts
+        self._draw_list = []
+        self._static_list = []
+        self._text_list = []
+        self._text_cache = {}
+        # Timings of the last frame, summed over the static and the dynamic objects
+        self.timings = {'background': 0.0, 'transform': 0.0, 'sort': 0.0, 'raster': 0.0, 'draw_calls': 0, 'culled_objects': 0,
+                        'culled_faces': 0}
+
+        # Static layer, rasterized again only when the camera, the background or the static objects change, and the
+        # screen areas drawn over it in the last frame, which are all that has to be restored and updated
+        self._static_surface = pygame.Surface((self.width, self.height))
+        self._static_key = None
+        self._last_rects = []
+        self.dirty_rects = []
 
-        self._obj_queue = queue.PriorityQueue()
         self._clock = pygame.time.Clock()
         self._running = True
 
@@ -32,133 +54,221 @@ class Screen:
     def fill(self, color=(0, 0, 0)):
         self._pg_screen.fill(color)
 
-    def _draw_objects(self, camera):
-        while not self._obj_queue.empty():
-            _, obj = self._obj_queue.get()
-            proj = [camera.project(v) for v in obj.vertices]
-
-            if isinstance(obj, LineSO):
-                # Get the 3D points relative to camera before projection
-                v1, v2 = obj.vertices
-                p1 = v1 - camera.target
-                p2 = v2 - camera.target
-
-                # Transform points to camera space
-                p1_cam = Vec3.rotate_cam(p1, camera.pitch_adj, camera.yaw_adj)
-                p2_cam = Vec3.rotate_cam(p2, camera.pitch_adj, camera.yaw_adj)
-
-                # Near plane clipping (a small offset from camera)
-                near_plane = -camera.distance + 0.1
-
-                # If both points are behind near plane, skip
-                if p1_cam.z <= near_plane and p2_cam.z <= near_plane:
+    @staticmethod
+    def _sort_draw_list(depths, is_face):
+        # Painter's order: lines first, then faces from the farthest to the nearest
+        return np.lexsort((-depths, is_face))
+
+    def _draw_static(self, camera, objs, bg_color) -> bool:
+        """
+        Restore the static layer under the last frame's drawings, or everywhere if it had to be rasterized again, in
+        which case True is returned. The background stage is the fill and the blits, the rasterization of the static
+        objects counting in the stages of `_draw_objects`.
+        """
+        t0 = time.perf_counter()
+        key = (camera.state, bg_color, tuple(objs))
+        redrawn = key != self._static_key
+        if redrawn:
+            self._static_surface.fill(bg_color)
+            t1 = time.perf_counter()
+            self._draw_objects(camera, objs, self._static_surface)
+            t0 += time.perf_counter() - t1
+            self._static_key = key
+            self._pg_screen.blit(self._static_surface, (0, 0))
+        else:
+            for rect in self._last_rects:
+                self._pg_screen.blit(self._static_surface, rect, rect)
+        self.timings['background'] = time.perf_counter() - t0
+        return redrawn
+
+    def _draw_objects(self, camera, objs, surface) -> list[pygame.Rect]:
+        """
+        Draw the objects onto the surface, and return the screen area covered by each of them. Their timings add to
+        those of the frame.
+        """
+        if not objs:
+            return []
+
+        t0 = time.perf_counter()
+        lines = [obj for obj in objs if isinstance(obj, (LineSO, LineBatchSO))]
+        meshes = [obj for obj in objs if not isinstance(obj, (LineSO, LineBatchSO))]
+
+        # Cull the meshes whose bounding sphere is outside the view frustum, and pick the level of detail of the others
+        n_meshes = len(meshes)
+        if meshes:
+            centers_cam = camera.to_camera(np.array([mesh.center.array for mesh in meshes]))
+            radii = np.array([mesh.bounding_radius for mesh in meshes])
+            visible = camera.spheres_visible(centers_cam, radii)
+            radii_px = camera.project_radius(centers_cam, radii)
+            meshes = [mesh for mesh, v in zip(meshes, visible.tolist()) if v]
+            for mesh, r in zip(meshes, radii_px[visible].tolist()):
+                mesh.level_of_detail(camera, r)
+
+        # Gather the segments of the lines, then the points of the meshes and their triangles with indices into the points
+        seg_blocks = [np.empty((0, 2, 3))] + [line.segments for line in lines]
+        seg_line = np.repeat(np.arange(len(lines)), [len(block) for block in seg_blocks[1:]])
+        n_segs = seg_line.size
+
+        point_blocks = [np.concatenate(seg_blocks).reshape(-1, 3)]
+        tri_blocks = [np.empty((0, 3), dtype=int)]
+        normal_blocks = [np.empty((0, 3))]
+        offset = 2 * n_segs
+        for mesh in meshes:
+            points, tris, normals = mesh.points, mesh.triangles, mesh.normals
+            point_blocks.append(points)
+            tri_blocks.append(tris + offset)
+            # Two-sided objects get null normals, which are never culled
+            normal_blocks.append(np.zeros((len(tris), 3)) if normals is None else normals)
+            offset += len(points)
+        tris = np.concatenate(tri_blocks)
+        face_mesh = np.repeat(np.arange(len(meshes)), [len(block) for block in tri_blocks[1:]])
+
+        # Transform all the points at once, then cull the faces turned away from the eye, at (0, 0, -distance)
+        points_cam = camera.to_camera(np.concatenate(point_blocks))
+        normals_cam = np.concatenate(normal_blocks) @ camera.view_matrix.T
+        eye_cam = np.array([0.0, 0.0, -camera.distance])
+        facing = np.sum(normals_cam * (eye_cam - points_cam[tris[:, 0]]), axis=1)
+        front = (facing > 0.0) | np.all(normals_cam == 0.0, axis=1)
+        n_faces = tris.shape[0]
+        tris, face_mesh = tris[front], face_mesh[front]
+
+        proj_tris = camera.project_camera(points_cam)[tris].tolist()
+        colors = [meshes[i].color for i in face_mesh.tolist()]
+
+        # Clip all the segments at once, and drop the invisible ones
+        seg_visible, seg_screen = self._clip_lines_cam(camera, points_cam[0:2 * n_segs:2], points_cam[1:2 * n_segs:2])
+        seg_depths = (points_cam[0:2 * n_segs:2, 2] + points_cam[1:2 * n_segs:2, 2]) / 2.0
+        seg_line, seg_depths, seg_screen = seg_line[seg_visible], seg_depths[seg_visible], seg_screen[seg_visible].tolist()
+        n_segs = seg_line.size
+        seg_line = seg_line.tolist()
+        styles = [(lines[i].color, lines[i].width) for i in seg_line]
+
+        # Mean camera-space depth of each line and face
+        depths = np.concatenate([seg_depths, np.mean(points_cam[tris, 2], axis=1)])
+        is_face = np.arange(depths.size) >= n_segs
+
+        t1 = time.perf_counter()
+        order = self._sort_draw_list(depths, is_face)
+
+        # Covered area of each line (negative keys) and mesh, merged from the areas pygame reports for each draw call
+        t2 = time.perf_counter()
+        face_mesh = face_mesh.tolist()
+        rects = {}
+        for k in order.tolist():
+            if k < n_segs:
+                (color, width), (p1, p2) = styles[k], seg_screen[k]
+                try:
+                    rect = pygame.draw.line(surface, color, p1, p2, width)
+                except pygame.error:
                     continue
-
-                # Clip against near plane if needed
-                if p1_cam.z <= near_plane or p2_cam.z <= near_plane:
-                    t = (near_plane - p1_cam.z) / (p2_cam.z - p1_cam.z)
-                    if p1_cam.z <= near_plane:
-                        p1_cam = p1_cam + (p2_cam - p1_cam) * t
-                    else:
-                        p2_cam = p1_cam + (p2_cam - p1_cam) * t
-
-                # Project points with corrected perspective
-                def project_point(p_cam):
-                    z_adj = camera.distance + p_cam.z
-                    if z_adj <= 0.1:  # Prevent division by very small numbers
-                        z_adj = 0.1
-                    fov = camera.fov / z_adj
-                    x = int(self.width / 2 + p_cam.x * fov)
-                    y = int(self.height / 2 + p_cam.y * fov)
-                    return x, y
-
-                x1, y1 = project_point(p1_cam)
-                x2, y2 = project_point(p2_cam)
-
-                # Screen-space clipping
-                def clip_line_to_screen(x1, y1, x2, y2):
-                    # Cohen-Sutherland algorithm
-                    INSIDE = 0
-                    LEFT = 1
-                    RIGHT = 2
-                    BOTTOM = 4
-                    TOP = 8
-
-                    def compute_code(x, y):
-                        code = INSIDE
-                        if x < 0:
-                            code |= LEFT
-                        elif x >= self.width:
-                            code |= RIGHT
-                        if y < 0:
-                            code |= BOTTOM
-                        elif y >= self.height:
-                            code |= TOP
-                        return code
-
-                    code1 = compute_code(x1, y1)
-                    code2 = compute_code(x2, y2)
-
-                    while True:
-                        if code1 == 0 and code2 == 0:
-                            return True, (x1, y1), (x2, y2)
-                        if code1 & code2 != 0:
-                            return False, None, None
-
-                        code = code1 if code1 != 0 else code2
-                        x, y = 0, 0
-
-                        if code & TOP:
-                            x = x1 + (x2 - x1) * (self.height - 1 - y1) / (y2 - y1)
-                            y = self.height - 1
-                        elif code & BOTTOM:
-                            x = x1 + (x2 - x1) * (0 - y1) / (y2 - y1)
-                            y = 0
-                        elif code & RIGHT:
-                            y = y1 + (y2 - y1) * (self.width - 1 - x1) / (x2 - x1)
-                            x = self.width - 1
-                        elif code & LEFT:
-                            y = y1 + (y2 - y1) * (0 - x1) / (x2 - x1)
-                            x = 0
-
-                        if code == code1:
-                            x1, y1 = x, y
-                            code1 = compute_code(x1, y1)
-                        else:
-                            x2, y2 = x, y
-                            code2 = compute_code(x2, y2)
-
-                visible, p1_screen, p2_screen = clip_line_to_screen(x1, y1, x2, y2)
-                if visible:
-                    try:
-                        pygame.draw.line(self._pg_screen, obj.color, p1_screen, p2_screen, obj.width)
-                    except pygame.error:
-                        pass
-
-
-            elif isinstance(obj, TriangleSO):
-                pygame.draw.polygon(self._pg_screen, obj.color, proj)
+                key = -1 - seg_line[k]
             else:
-                raise RuntimeError(f"Unknown object type: {type(obj)}")
-
-    def draw_text(self, text, p, color=(0, 0, 0)):
-        text_surface = self.font.render(text, True, color)
-        self._pg_screen.blit(text_surface, p)
-
-    def draw_line(self, camera, line: LineSO):
-        ScreenObject.bind_camera(camera)
-        key = -float('inf')
-        self._obj_queue.put((key, line))
-
-    def draw_object(self, camera, obj: ScreenObject):
-        ScreenObject.bind_camera(camera)
-        for face in obj.faces:
-            key = -face.cam_depth(camera)
-            self._obj_queue.put((key, face))
-
-    def render_frame(self, camera, bg_color=(240, 240, 240)):
-        self.fill(bg_color)
-        self._draw_objects(camera)
+                rect = pygame.draw.polygon(surface, colors[k - n_segs], proj_tris[k - n_segs])
+                key = face_mesh[k - n_segs]
+            if key in rects:
+                rects[key].union_ip(rect)
+            else:
+                rects[key] = rect
+
+        t3 = time.perf_counter()
+        timings = self.timings
+        timings['transform'] += t1 - t0
+        timings['sort'] += t2 - t1
+        timings['raster'] += t3 - t2
+        timings['draw_calls'] += int(depths.size)
+        timings['culled_objects'] += n_meshes - len(meshes)
+        timings['culled_faces'] += n_faces - tris.shape[0]
+        return list(rects.values())
+
+    def _clip_lines_cam(self, camera, p1_cam, p2_cam, near=0.1):
+        """
+        Clip `(N, 3)` camera-space segments against the near plane, a small offset from the camera, then project them
+        and clip them to the screen (Liang-Barsky). Returns the visibility mask `(N,)` and the screen endpoints
+        `(N, 2, 2)`.
+        """
+        near_plane = -camera.distance + near
+        behind_1 = p1_cam[:, 2] <= near_plane
+        behind_2 = p2_cam[:, 2] <= near_plane
+        visible = ~(behind_1 & behind_2)
+
+        # Move the endpoint behind the near plane onto it
+        dz = p2_cam[:, 2] - p1_cam[:, 2]
+        t = (near_plane - p1_cam[:, 2]) / np.where(dz == 0.0, 1.0, dz)
+        p_near = p1_cam + (p2_cam - p1_cam) * t[:, None]
+        p1_cam = np.where(behind_1[:, None], p_near, p1_cam)
+        p2_cam = np.where((behind_2 & ~behind_1)[:, None], p_near, p2_cam)
+
+        # Perspective projection, with the depth bounded away from zero
+        def project(p_cam):
+            fov = camera.fov / np.maximum(camera.distance + p_cam[:, 2], near)
+            return np.trunc(self.width / 2 + p_cam[:, 0] * fov), np.trunc(self.height / 2 + p_cam[:, 1] * fov)
+
+        x1, y1 = project(p1_cam)
+        x2, y2 = project(p2_cam)
+
+        # Screen-space clipping of the parametric segment to [t_in, t_out]
+        dx, dy = x2 - x1, y2 - y1
+        t_in, t_out = np.zeros_like(x1), np.ones_like(x1)
+        for p, q in ((-dx, x1), (dx, self.width - 1 - x1), (-dy, y1), (dy, self.height - 1 - y1)):
+            parallel = p == 0.0
+            visible &= ~(parallel & (q < 0.0))
+            r = q / np.where(parallel, 1.0, p)
+            t_in = np.where(p < 0.0, np.maximum(t_in, r), t_in)
+            t_out = np.where(p > 0.0, np.minimum(t_out, r), t_out)
+        visible &= t_in <= t_out
+
+        screen = np.stack([
+            np.stack([x1 + t_in * dx, y1 + t_in * dy], axis=1),
+            np.stack([x1 + t_out * dx, y1 + t_out * dy], axis=1),
+        ], axis=1)
+        return visible, screen
+
+    def draw_text(self, text, p, color=(0, 0, 0), background=None, font=None):
+        # HUD text, drawn over the frame by render_frame, on an optional background panel
+        font = font if font is not None else self.font
+        key = (text, color, background, font)
+        if key not in self._text_cache:
+            if len(self._text_cache) > 256:
+                self._text_cache.clear()
+            self._text_cache[key] = font.render(text, True, color, background)
+        self._text_list.append((self._text_cache[key], p))
+
+    def draw_line(self, camera, line: LineSO | LineBatchSO, static=False):
+        (self._static_list if static else self._draw_list).append(line)
+
+    def draw_object(self, camera, obj: ScreenObject, static=False):
+        # Static objects go to a cached layer under the others, kept as long as the camera stays still and the same
+        # objects are drawn every frame: see the slack of Camera.follow
+        (self._static_list if static else self._draw_list).append(obj)
+
+    def render_frame(self, camera, bg_color=(240, 240, 240)) -> list[pygame.Rect]:
+        """
+        Composite the frame over the static layer, and return the dirty rectangles for `pygame.display.update`: the
+        whole screen when the static layer changed, otherwise the areas drawn in this frame and in the previous one.
+        """
+        objs, static, texts = self._draw_list, self._static_list, self._text_list
+        self._draw_list, self._static_list, self._text_list = [], [], []
+        self.timings = dict.fromkeys(self.timings, 0)
+
+        redrawn = self._draw_static(camera, static, bg_color)
+        rects = self._draw_objects(camera, objs, self._pg_screen)
+        rects += [self._pg_screen.blit(surface, p) for surface, p in texts]
+
+        self.dirty_rects = [self._pg_screen.get_rect()] if redrawn else self._last_rects + rects
+        self._last_rects = rects
+        return self.dirty_rects
+
+    def update_display(self):
+        if not self.headless:
+            pygame.display.update(self.dirty_rects)
+
+    def save_frame(self, path):
+        # The format follows the extension, e.g. PNG
+        pygame.image.save(self._pg_screen, path)
+
+    def frame_bytes(self) -> bytes:
+        # Packed RGB24 pixels, row by row, as for a raw video stream
+        return pygame.image.tobytes(self._pg_screen, 'RGB')
 
 
 class Camera:
@@ -179,19 +289,69 @@ class Camera:
     def yaw_adj(self):
         return -self.angle_yaw - np.pi / 2.0
 
+    @property
+    def state(self) -> tuple:
+        # Everything the projection depends on, to detect camera changes
+        return (*self.target.array.tolist(), self.distance, self.fov, self.angle_yaw, self.angle_pitch,
+                self._screen.width, self._screen.height)
+
+    def follow(self, point: Vec3, slack=0.0):
+        """
+        Center on a moving point. With `slack` > 0, only once it drifts further from the target than `slack` times
+        the viewing distance, about `slack * fov` pixels: the camera, and with it the static layer of the screen, then
+        stays still in between, where moving the target every frame rasterizes that layer and updates the whole screen
+        each time, at the cost of the view recentering in visible jumps. The layer cannot be shifted instead, as the
+        perspective moves its points by different amounts.
+        """
+        if np.linalg.norm((point - self.target).array) > slack * self.distance:
+            self.target = point
+
     @property
     def pos(self):
         return self.target + Vec3.rotate(Vec3(0, 0, self.distance), self.angle_pitch, self.angle_yaw)
 
-    def project(self, point: Vec3):
-        p = point - self.target
-        p_rot = Vec3.rotate_cam(p, self.pitch_adj, self.yaw_adj)
+    @property
+    def view_matrix(self) -> npt.NDArray[float]:
+        return Vec3.rotate_cam_matrix(self.pitch_adj, self.yaw_adj)
+
+    def to_camera(self, points: npt.NDArray[float]) -> npt.NDArray[float]:
+        """
+        Transform `(N, 3)` world points into camera space, with the view matrix built once for all of them.
+        """
+        return (points - self.target.array) @ self.view_matrix.T
+
+    def project_camera(self, points_cam: npt.NDArray[float]) -> npt.NDArray[int]:
+        """
+        Perspective projection of `(N, 3)` camera-space points into `(N, 2)` pixel coordinates.
+        """
+        fov = self.fov / (self.distance + points_cam[:, 2] + 1.0e-8)
+        proj = np.empty((points_cam.shape[0], 2), dtype=int)
+        proj[:, 0] = self._screen.width / 2 + points_cam[:, 0] * fov
+        proj[:, 1] = self._screen.height / 2 + points_cam[:, 1] * fov
+        return proj
+
+    def spheres_visible(self, centers_cam: npt.NDArray[float], radii: npt.NDArray[float], near=0.1) -> npt.NDArray[bool]:
+        """
+        View frustum test of `(N, 3)` camera-space bounding spheres of radii `(N,)`: a sphere is culled when it lies
+        entirely behind the near plane or outside one of the four side planes through the eye.
+        """
+        z_adj = self.distance + centers_cam[:, 2]
+        visible = z_adj + radii > near
+        for half, coord in ((self._screen.width / 2, centers_cam[:, 0]), (self._screen.height / 2, centers_cam[:, 1])):
+            visible &= (np.abs(coord) * self.fov - half * z_adj) / np.hypot(self.fov, half) < radii
+        return visible
+
+    def project_radius(self, centers_cam: npt.NDArray[float], radii: npt.NDArray[float], near=0.1) -> npt.NDArray[float]:
+        """
+        On-screen radius in pixels of `(N, 3)` camera-space spheres of radii `(N,)`.
+        """
+        return self.fov * radii / np.maximum(self.distance + centers_cam[:, 2], near)
+
+    def project_points(self, points: npt.NDArray[float]) -> npt.NDArray[int]:
+        return self.project_camera(self.to_camera(points))
 
-        # Perspective projection
-        fov = self.fov / (self.distance + p_rot.z + 1.0e-8)
-        px = int(self._screen.width / 2 + p_rot.x * fov)
-        py = int(self._screen.height / 2 + p_rot.y * fov)
-        return np.array([px, py])
+    def project(self, point: Vec3):
+        return self.project_points(point.array[None, :])[0]
 
     def invproject_xy(self, px, py):
         # Inverse perspective projection
@@ -218,20 +378,6 @@ class Camera:
 
 
 class ScreenObject(abc.ABC):
-    _current_camera: Camera | None = None
-
-    @classmethod
-    def bind_camera(cls, cam: Camera):
-        cls._current_camera = cam
-
-    def __lt__(self, other: ScreenObject) -> bool:
-        cam = ScreenObject._current_camera
-        if cam is None:
-            raise RuntimeError("No camera bound for ScreenObject comparison")
-
-        # Use -depth => closer to the camera
-        return self.cam_depth(cam) > other.cam_depth(cam)
-
     @property
     @abc.abstractmethod
     def color(self) -> tuple[int, int, int]:
@@ -244,27 +390,44 @@ class ScreenObject(abc.ABC):
 
     @property
     @abc.abstractmethod
-    def vertices(self) -> npt.NDArray[Vec3]:
+    def points(self) -> npt.NDArray[float]:
         return NotImplementedError()
 
     @property
-    @abc.abstractmethod
+    def triangles(self) -> npt.NDArray[int]:
+        return np.empty((0, 3), dtype=int)
+
+    @property
+    def vertices(self) -> npt.NDArray[Vec3]:
+        vertices = np.empty(len(self.points), dtype=Vec3)
+        vertices[:] = [Vec3(p) for p in self.points]
+        return vertices
+
+    @property
     def faces(self) -> npt.NDArray[TriangleSO]:
-        return NotImplementedError()
+        faces = np.empty(len(self.triangles), dtype=TriangleSO)
+        faces[:] = [TriangleSO(self.vertices[tri], self.color) for tri in self.triangles]
+        return faces
 
     @property
-    @abc.abstractmethod
-    def cam_visible(self) -> bool:
-        return NotImplementedError()
+    def normals(self) -> npt.NDArray[float] | None:
+        # Outward face normals for back-face culling, None for two-sided objects
+        return None
+
+    @property
+    def bounding_radius(self) -> float:
+        return float(np.max(np.linalg.norm(self.points - self.center.array, axis=1)))
+
+    def cam_visible(self, camera) -> bool:
+        center_cam = camera.to_camera(self.center.array[None, :])
+        return bool(camera.spheres_visible(center_cam, np.array([self.bounding_radius]))[0])
+
+    def level_of_detail(self, camera, radius_px: float):
+        pass
 
     def cam_depth(self, camera):
         # project each vertex into camera space (before perspective)
-        zs = np.zeros(len(self.vertices))
-        for i, v in enumerate(self.vertices):
-            p = v - camera.target
-            p_rot = Vec3.rotate_cam(p, camera.pitch_adj, camera.yaw_adj)
-            zs[i] = p_rot.z
-        return np.mean(zs)
+        return np.mean(camera.to_camera(self.points)[:, 2])
 
 
 class LineSO(ScreenObject):
@@ -282,6 +445,14 @@ class LineSO(ScreenObject):
     def center(self) -> Vec3:
         return (self._p1 + self._p2) / 2
 
+    @property
+    def points(self) -> npt.NDArray[float]:
+        return np.array([self._p1.array, self._p2.array])
+
+    @property
+    def segments(self) -> npt.NDArray[float]:
+        return self.points[None, :, :]
+
     @property
     def vertices(self) -> npt.NDArray[Vec3]:
         return np.array([self._p1, self._p2])
@@ -290,9 +461,38 @@ class LineSO(ScreenObject):
     def faces(self):
         return self
 
+
+class LineBatchSO(ScreenObject):
+    """
+    Set of `(N, 2, 3)` segments sharing a color and a width, transformed and clipped together. The segments are
+    read-only, so that a batch can be built once and drawn every frame.
+    """
+
+    def __init__(self, segments: npt.NDArray[float], color=(0, 0, 0), width=1):
+        self._segments = np.array(segments, dtype=float).reshape(-1, 2, 3)
+        self._segments.setflags(write=False)
+        self._color = color
+        self.width = width
+
     @property
-    def cam_visible(self) -> bool:
-        return True
+    def color(self) -> tuple[int, int, int]:
+        return self._color
+
+    @property
+    def center(self) -> Vec3:
+        return Vec3(np.mean(self.points, axis=0))
+
+    @property
+    def points(self) -> npt.NDArray[float]:
+        return self._segments.reshape(-1, 3)
+
+    @property
+    def segments(self) -> npt.NDArray[float]:
+        return self._segments
+
+    @property
+    def faces(self):
+        return self
 
 
 class TriangleSO(ScreenObject):
@@ -306,7 +506,15 @@ class TriangleSO(ScreenObject):
 
     @property
     def center(self) -> Vec3:
-        return Vec3(np.sum(self.vertices, axis=0) / 3.0)
+        return Vec3(np.sum(self.points, axis=0) / 3.0)
+
+    @property
+    def points(self) -> npt.NDArray[float]:
+        return np.array([v.array for v in self._vertices], dtype=float)
+
+    @property
+    def triangles(self) -> npt.NDArray[int]:
+        return np.array([[0, 1, 2]])
 
     @property
     def vertices(self) -> npt.NDArray[Vec3]:
@@ -316,69 +524,137 @@ class TriangleSO(ScreenObject):
     def faces(self):
         return self
 
-    @property
-    def cam_visible(self) -> bool:
-        return True
 
-
-class BoxSO(ScreenObject):
-    def __init__(self, center: Vec3, width: float, height: float, depth: float, theta: float = 0, phi: float = 0, color=(0, 0, 0)):
+def _outward_normals(vertices: npt.NDArray[float], triangles: npt.NDArray[int]) -> npt.NDArray[float]:
+    # Unit normals of the faces of a convex mesh around the origin, oriented away from it whatever the winding
+    p0, p1, p2 = (vertices[triangles[:, k]] for k in range(3))
+    normals = np.cross(p1 - p0, p2 - p0)
+    normals *= np.sign(np.sum(normals * (p0 + p1 + p2), axis=1))[:, None]
+    return normals / np.linalg.norm(normals, axis=1)[:, None]
+
+
+@functools.lru_cache(maxsize=None)
+def box_mesh(width: float, height: float, depth: float) -> tuple[npt.NDArray[float], npt.NDArray[int], npt.NDArray[float]]:
+    """
+    Local vertices `(8, 3)`, triangles `(12, 3)` and outward normals `(12, 3)` of a box centered on the origin, with the
+    depth along x, the width along y and the height along z. The arrays are cached per geometry and shared, so they
+    are read-only.
+    """
+    half_w = width / 2
+    half_h = height / 2
+    half_d = depth / 2
+
+    vertices = np.array([
+        [-half_d, -half_w, -half_h],
+        [+half_d, -half_w, -half_h],
+        [+half_d, +half_w, -half_h],
+        [-half_d, +half_w, -half_h],
+        [-half_d, -half_w, +half_h],
+        [+half_d, -half_w, +half_h],
+        [+half_d, +half_w, +half_h],
+        [-half_d, +half_w, +half_h],
+    ])
+    triangles = np.array([
+        [0, 1, 2], [2, 3, 0],
+        [0, 1, 4], [1, 4, 5],
+        [1, 2, 5], [2, 5, 6],
+        [2, 3, 6], [3, 6, 7],
+        [3, 0, 7], [0, 7, 4],
+        [4, 5, 6], [6, 7, 4],
+    ])
+
+    normals = _outward_normals(vertices, triangles)
+
+    for arr in (vertices, triangles, normals):
+        arr.setflags(write=False)
+    return vertices, triangles, normals
+
+
+@functools.lru_cache(maxsize=None)
+def disk_mesh(radius: float, thickness: float, steps: int) -> tuple[npt.NDArray[float], npt.NDArray[int], npt.NDArray[float]]:
+    """
+    Local vertices `(2 * steps + 2, 3)`, triangles `(4 * steps, 3)` and outward normals `(4 * steps, 3)` of a disk
+    centered on the origin with its axis along x. The rim vertices alternate front (+x) and back (-x), followed by the
+    front and back centers. The arrays are cached per geometry and shared, so they are read-only.
+    """
+    half_th = thickness / 2
+    ang = 2.0 * np.pi * np.arange(steps) / steps
+
+    vertices = np.empty((2 * steps + 2, 3))
+    vertices[0:2 * steps:2, 0] = +half_th
+    vertices[1:2 * steps:2, 0] = -half_th
+    vertices[0:2 * steps, 1] = np.repeat(radius * np.cos(ang), 2)
+    vertices[0:2 * steps, 2] = np.repeat(radius * np.sin(ang), 2)
+    vertices[2 * steps] = [+half_th, 0.0, 0.0]
+    vertices[2 * steps + 1] = [-half_th, 0.0, 0.0]
+
+    i = np.arange(steps)
+    j = (i + 1) % steps
+    front_i, back_i, front_j, back_j = 2 * i, 2 * i + 1, 2 * j, 2 * j + 1
+    front_c = np.full(steps, 2 * steps)
+    back_c = np.full(steps, 2 * steps + 1)
+
+    triangles = np.empty((steps, 4, 3), dtype=int)
+    triangles[:, 0] = np.stack([front_c, front_i, front_j], axis=1)  # Front face (fan)
+    triangles[:, 1] = np.stack([back_c, back_j, back_i], axis=1)  # Back face (reverse winding)
+    triangles[:, 2] = np.stack([front_i, back_i, back_j], axis=1)  # Side faces (connect front and back rims)
+    triangles[:, 3] = np.stack([front_i, back_j, front_j], axis=1)
+    triangles = triangles.reshape(4 * steps, 3)
+
+    normals = _outward_normals(vertices, triangles)
+
+    for arr in (vertices, triangles, normals):
+        arr.setflags(write=False)
+    return vertices, triangles, normals
+
+
+class MeshSO(ScreenObject):
+    """
+    Rigid body drawn from a local convex mesh: the mesh only depends on the geometry and is shared through the mesh
+    cache, while a change of pose (center, theta, phi) only re-transforms its vertices and normals.
+    """
+
+    def __init__(self, center: Vec3, theta: float = 0, phi: float = 0, color=(0, 0, 0)):
         self._center = center
-        self._width = width
-        self._height = height
-        self._depth = depth
         self._theta = theta
         self._phi = phi
         self._color = color
 
-        self._is_vertices_updated = False
-        self._vertices_buffer = None
-        self._is_faces_updated = False
-        self._faces_buffer = None
+        self._mesh = None
+        self._is_points_updated = False
+        self._points_buffer = None
+        self._normals_buffer = None
 
-    @property
-    def color(self) -> tuple[int, int, int]:
-        return self._color
+    @abc.abstractmethod
+    def _build_mesh(self) -> tuple[npt.NDArray[float], npt.NDArray[int], npt.NDArray[float]]:
+        return NotImplementedError()
 
-    @property
-    def center(self) -> Vec3:
-        return self._center
+    def _set_geometry(self, name, value):
+        setattr(self, name, value)
+        self._mesh = None
+        self._is_points_updated = False
 
-    @center.setter
-    def center(self, value: float):
-        self._center = value
-        self._is_vertices_updated = False
-        self._is_faces_updated = False
+    def _set_pose(self, name, value):
+        setattr(self, name, value)
+        self._is_points_updated = False
 
     @property
-    def width(self) -> float:
-        return self._width
-
-    @width.setter
-    def width(self, value: float):
-        self._width = value
-        self._is_vertices_updated = False
-        self._is_faces_updated = False
+    def mesh(self) -> tuple[npt.NDArray[float], npt.NDArray[int], npt.NDArray[float]]:
+        if self._mesh is None:
+            self._mesh = self._build_mesh()
+        return self._mesh
 
     @property
-    def height(self) -> float:
-        return self._height
-
-    @height.setter
-    def height(self, value: float):
-        self._height = value
-        self._is_vertices_updated = False
-        self._is_faces_updated = False
+    def color(self) -> tuple[int, int, int]:
+        return self._color
 
     @property
-    def depth(self) -> float:
-        return self._depth
+    def center(self) -> Vec3:
+        return self._center
 
-    @depth.setter
-    def depth(self, value: float):
-        self._depth = value
-        self._is_vertices_updated = False
-        self._is_faces_updated = False
+    @center.setter
+    def center(self, value: Vec3):
+        self._set_pose('_center', value)
 
     @property
     def theta(self) -> float:
@@ -386,9 +662,7 @@ class BoxSO(ScreenObject):
 
     @theta.setter
     def theta(self, value: float):
-        self._theta = value
-        self._is_vertices_updated = False
-        self._is_faces_updated = False
+        self._set_pose('_theta', value)
 
     @property
     def phi(self) -> float:
@@ -396,100 +670,90 @@ class BoxSO(ScreenObject):
 
     @phi.setter
     def phi(self, value: float):
-        self._phi = value
-        self._is_vertices_updated = False
-        self._is_faces_updated = False
+        self._set_pose('_phi', value)
 
-    @property
-    def vertices(self) -> npt.NDArray[Vec3]:
-        if self._is_vertices_updated:
-            return self._vertices_buffer
-
-        center = self._center
-        half_w = self._width / 2
-        half_h = self._height / 2
-        half_d = self._depth / 2
-
-        vertices = np.array([
-            Vec3(-half_d, -half_w, -half_h),
-            Vec3(+half_d, -half_w, -half_h),
-            Vec3(+half_d, +half_w, -half_h),
-            Vec3(-half_d, +half_w, -half_h),
-            Vec3(-half_d, -half_w, +half_h),
-            Vec3(+half_d, -half_w, +half_h),
-            Vec3(+half_d, +half_w, +half_h),
-            Vec3(-half_d, +half_w, +half_h),
-        ])
+    def _update_points(self):
+        if self._is_points_updated:
+            return
 
-        self._vertices_buffer = np.array([Vec3.rotate(v, self.theta, self.phi) + center for v in vertices], dtype=Vec3)
-        self._is_vertices_updated = True
+        local, _, normals = self.mesh
+        rot = Vec3.rotate_matrix(self._theta, self._phi)
+        self._points_buffer = local @ rot.T + self._center.array
+        self._normals_buffer = normals @ rot.T
+        self._is_points_updated = True
 
-        return self._vertices_buffer
+    @property
+    def points(self) -> npt.NDArray[float]:
+        self._update_points()
+        return self._points_buffer
 
     @property
-    def faces(self):
-        if self._is_faces_updated:
-            return self._faces_buffer
+    def triangles(self) -> npt.NDArray[int]:
+        return self.mesh[1]
 
-        self._faces_buffer = np.array([
-            TriangleSO(self.vertices[[0, 1, 2]], self.color),
-            TriangleSO(self.vertices[[2, 3, 0]], self.color),
+    @property
+    def normals(self) -> npt.NDArray[float]:
+        self._update_points()
+        return self._normals_buffer
 
-            TriangleSO(self.vertices[[0, 1, 4]], self.color),
-            TriangleSO(self.vertices[[1, 4, 5]], self.color),
 
-            TriangleSO(self.vertices[[1, 2, 5]], self.color),
-            TriangleSO(self.vertices[[2, 5, 6]], self.color),
+class BoxSO(MeshSO):
+    def __init__(self, center: Vec3, width: float, height: float, depth: float, theta: float = 0, phi: float = 0, color=(0, 0, 0)):
+        super().__init__(center, theta, phi, color)
+        self._width = width
+        self._height = height
+        self._depth = depth
 
-            TriangleSO(self.vertices[[2, 3, 6]], self.color),
-            TriangleSO(self.vertices[[3, 6, 7]], self.color),
+    def _build_mesh(self):
+        return box_mesh(self._width, self._height, self._depth)
 
-            TriangleSO(self.vertices[[3, 0, 7]], self.color),
-            TriangleSO(self.vertices[[0, 7, 4]], self.color),
+    @property
+    def width(self) -> float:
+        return self._width
 
-            TriangleSO(self.vertices[[4, 5, 6]], self.color),
-            TriangleSO(self.vertices[[6, 7, 4]], self.color),
-        ], dtype=ScreenObject)
+    @width.setter
+    def width(self, value: float):
+        self._set_geometry('_width', value)
 
-        self._is_faces_updated = True
+    @property
+    def height(self) -> float:
+        return self._height
 
-        return self._faces_buffer
+    @height.setter
+    def height(self, value: float):
+        self._set_geometry('_height', value)
 
     @property
-    def cam_visible(self) -> bool:
-        return True
+    def depth(self) -> float:
+        return self._depth
 
+    @depth.setter
+    def depth(self, value: float):
+        self._set_geometry('_depth', value)
 
-class DiskSO(ScreenObject):
-    def __init__(self, center: Vec3, radius: float, thickness: float, theta: float, phi: float, color=(0, 0, 0), steps: int = 1000):
-        self._center = center
-        self._radius = radius
-        self._thickness = thickness
-        self._theta = theta
-        self._phi = phi
-        self._steps = steps
-        self._normal = Vec3(1, 0, 0)
-        self._color = color
+    @property
+    def bounding_radius(self) -> float:
+        return float(np.sqrt(self._width ** 2 + self._height ** 2 + self._depth ** 2) / 2)
 
-        self._is_vertices_updated = False
-        self._vertices_buffer = None
 
-        self._is_faces_updated = False
-        self._faces_buffer = None
+class DiskSO(MeshSO):
+    """
+    Disk with its axis along the local x. With `steps=None` the number of rim segments follows the on-screen radius,
+    from `LOD_STEPS[0]` to `LOD_STEPS[1]` in powers of two, for rim edges of about `LOD_EDGE_PX` pixels.
+    """
 
-    @property
-    def color(self) -> tuple[int, int, int]:
-        return self._color
+    LOD_EDGE_PX = 6.0
+    LOD_STEPS = (8, 512)
 
-    @property
-    def center(self) -> Vec3:
-        return self._center
+    def __init__(self, center: Vec3, radius: float, thickness: float, theta: float, phi: float, color=(0, 0, 0), steps: int | None = None):
+        super().__init__(center, theta, phi, color)
+        self._radius = radius
+        self._thickness = thickness
+        self._steps = steps
+        self._lod_steps = self.LOD_STEPS[0]
 
-    @center.setter
-    def center(self, value: float):
-        self._center = value
-        self._is_vertices_updated = False
-        self._is_faces_updated = False
+    def _build_mesh(self):
+        return disk_mesh(self._radius, self._thickness, self.steps)
 
     @property
     def radius(self) -> float:
@@ -497,9 +761,7 @@ class DiskSO(ScreenObject):
 
     @radius.setter
     def radius(self, value: float):
-        self._radius = value
-        self._is_vertices_updated = False
-        self._is_faces_updated = False
+        self._set_geometry('_radius', value)
 
     @property
     def thickness(self) -> float:
@@ -507,95 +769,25 @@ class DiskSO(ScreenObject):
 
     @thickness.setter
     def thickness(self, value: float):
-        self._thickness = value
-        self._is_vertices_updated = False
-        self._is_faces_updated = False
+        self._set_geometry('_thickness', value)
 
     @property
-    def theta(self) -> float:
-        return self._theta
+    def steps(self) -> int:
+        return self._lod_steps if self._steps is None else self._steps
 
-    @theta.setter
-    def theta(self, value: float):
-        self._theta = value
-        self._is_vertices_updated = False
-        self._is_faces_updated = False
+    @steps.setter
+    def steps(self, value: int | None):
+        self._set_geometry('_steps', value)
 
     @property
-    def phi(self) -> float:
-        return self._phi
+    def bounding_radius(self) -> float:
+        return float(np.hypot(self._radius, self._thickness / 2))
 
-    @phi.setter
-    def phi(self, value: float):
-        self._phi = value
-        self._is_vertices_updated = False
-        self._is_faces_updated = False
+    def level_of_detail(self, camera, radius_px: float):
+        if self._steps is not None:
+            return
 
-    @property
-    def vertices(self) -> npt.NDArray[Vec3]:
-        if self._is_vertices_updated:
-            return self._vertices_buffer
-
-        self._normal = Vec3.rotate(Vec3(1, 0, 0), self.theta, 0.0)
-        vec_v = Vec3.rotate(Vec3(0, 1, 0), self.theta, 0.0)
-        vec_w = Vec3.rotate(Vec3(0, 0, 1), self.theta, 0.0)
-
-        half_th = self.thickness / 2
-        vertices = np.empty(2 * self._steps, dtype=Vec3)
-        for i in range(self._steps):
-            ang_step = 2.0 * np.pi * i / self._steps
-            rim_offset = vec_v * np.cos(ang_step) + vec_w * np.sin(ang_step)
-
-            vec_w_a = vec_w.array
-            rim_offset_a = rim_offset.array
-            c, s = np.cos(self.phi), np.sin(self.phi)
-            rim_spun = Vec3(vec_w_a * (vec_w_a.dot(rim_offset_a)) * (1 - c) + rim_offset_a * c + np.cross(vec_w_a, rim_offset_a) * s)
-
-            vertices[2 * i + 0] = self.center + rim_spun * self.radius + self._normal * half_th
-            vertices[2 * i + 1] = self.center + rim_spun * self.radius - self._normal * half_th
-
-        self._vertices_buffer = vertices
-        self._is_vertices_updated = True
-
-        return self._vertices_buffer
-
-    @property
-    def faces(self):
-        if self._is_faces_updated:
-            return self._faces_buffer
-
-        steps = self._steps
-        half_th = self.thickness / 2
-
-        self._normal = Vec3.rotate(Vec3(0, 0, 1), self.theta, 0.0)
-
-        front_center = self.center + self._normal * half_th
-        back_center = self.center - self._normal * half_th
-
-        vertices = self.vertices
-        faces = np.empty(4 * steps, dtype=TriangleSO)
-        for i in range(steps):
-            j = (i + 1) % steps
-            rim_front_i = vertices[2 * i + 0]
-            rim_back_i = vertices[2 * i + 1]
-            rim_front_j = vertices[2 * j + 0]
-            rim_back_j = vertices[2 * j + 1]
-
-            # Front face (fan)
-            faces[4 * i + 0] = TriangleSO(np.array([front_center, rim_front_i, rim_front_j]), self.color)
-
-            # Back face (reverse winding)
-            faces[4 * i + 1] = TriangleSO(np.array([back_center, rim_back_j, rim_back_i]), self.color)
-
-            # Side faces (connect front and back rims)
-            faces[4 * i + 2] = TriangleSO(np.array([rim_front_i, rim_back_i, rim_back_j]), self.color)
-            faces[4 * i + 3] = TriangleSO(np.array([rim_front_i, rim_back_j, rim_front_j]), self.color)
-
-        self._faces_buffer = faces
-        self._is_faces_updated = True
-
-        return self._faces_buffer
-
-    @property
-    def cam_visible(self) -> bool:
-        return True
+        steps = 2 ** int(np.ceil(np.log2(max(2.0 * np.pi * radius_px / self.LOD_EDGE_PX, 1.0))))
+        steps = int(np.clip(steps, *self.LOD_STEPS))
+        if steps != self._lod_steps:
+            self._set_geometry('_lod_steps', steps)
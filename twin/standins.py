@@ -0,0 +1,278 @@
+import base64
+import http.client
+import http.server
+import json
+import numpy as np
+import queue
+import socket
+import threading
+import time
+import urllib.parse
+
+from receiver import IMU_FRAME, IMU_FRAME_MAGIC, IMU_FRAME_VERSION, json_tree_get, json_tree_set
+
+
+class RtdbStandIn:
+    """
+    Local stand-in for the Realtime Database REST API, to test and benchmark the receivers without the cart or the
+    cloud: a JSON tree written by PUT and PATCH requests, read by GET requests, and streamed as server-sent events to
+    the clients that ask for `text/event-stream`, as the database does. There is no authentication.
+
+    The writes are answered after `round_trip` seconds, for the round trips of TLS and of the cloud.
+    """
+
+    KEEP_ALIVE = 30.0
+
+    def __init__(self, host='127.0.0.1', port=0, round_trip=0.0):
+        self.round_trip = round_trip
+        self._tree = None
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+        standin = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _keys(self):
+                path = self.path.split('?', 1)[0]
+                path = path[:-len('.json')] if path.endswith('.json') else path
+                return [key for key in path.split('/') if key]
+
+            def _reply(self, status, body=b''):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if 'text/event-stream' in self.headers.get('Accept', ''):
+                    standin._stream(self, self._keys())
+                else:
+                    self._reply(200, json.dumps(standin.get(self._keys())).encode())
+
+            def _write(self, event):
+                length = int(self.headers.get('Content-Length', 0))
+                data = json.loads(self.rfile.read(length)) if length else None
+                if event == 'patch' and not isinstance(data, dict):
+                    self._reply(400)
+                    return
+                time.sleep(standin.round_trip)
+                standin.write(self._keys(), data, event)
+                self._reply(200, json.dumps(data).encode())
+
+            def do_PUT(self):
+                self._write('put')
+
+            def do_PATCH(self):
+                self._write('patch')
+
+        self._server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            for subscriber, _ in self._subscribers:
+                subscriber.put(None)
+        self._server.shutdown()
+        self._server.server_close()
+
+    def get(self, keys):
+        with self._lock:
+            return json_tree_get(self._tree, keys)
+
+    def write(self, keys, data, event='put'):
+        """
+        Write the data at the path of keys, replacing it for a put, or its children for a patch, and notify the
+        streams under the path, or above it.
+        """
+        with self._lock:
+            if event == 'put':
+                updates = [(keys, data)]
+            else:
+                updates = [(keys + [key for key in child.split('/') if key], value) for child, value in data.items()]
+            for update_keys, value in updates:
+                self._tree = json_tree_set(self._tree, update_keys, value)
+
+            for subscriber, stream_keys in self._subscribers:
+                n = len(stream_keys)
+                if not any(u[:n] == stream_keys or stream_keys[:len(u)] == u for u, _ in updates):
+                    continue
+                if keys[:n] == stream_keys:
+                    subscriber.put((event, {'path': '/' + '/'.join(keys[n:]), 'data': data}))
+                elif stream_keys[:len(keys)] == keys:
+                    subscriber.put(('put', {'path': '/', 'data': json_tree_get(self._tree, stream_keys)}))
+
+    def send_event(self, event, message):
+        # An event as is to every stream, well-formed or not, to test the listeners
+        with self._lock:
+            for subscriber, _ in self._subscribers:
+                subscriber.put((event, message))
+
+    def _stream(self, handler, keys):
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'text/event-stream')
+        handler.send_header('Cache-Control', 'no-cache')
+        handler.send_header('Connection', 'close')
+        handler.end_headers()
+        handler.close_connection = True
+
+        # The first event holds the whole tree under the path, the next ones its changes
+        subscriber = queue.Queue()
+        with self._lock:
+            subscriber.put(('put', {'path': '/', 'data': json_tree_get(self._tree, keys)}))
+            self._subscribers.append((subscriber, keys))
+        try:
+            while True:
+                try:
+                    item = subscriber.get(timeout=self.KEEP_ALIVE)
+                except queue.Empty:
+                    item = ('keep-alive', None)
+                if item is None:
+                    return
+                event, message = item
+                handler.wfile.write(f"event: {event}\ndata: {json.dumps(message)}\n\n".encode())
+                handler.wfile.flush()
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._subscribers.remove((subscriber, keys))
+
+
+class UdpImuSender:
+    """
+    Stand-in for the cart's UDP telemetry, sending IMU frames as mb::Telemetry does, timestamped from the host's clock.
+    """
+
+    def __init__(self, host='127.0.0.1', port=4210):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._address = (host, port)
+        self._frame = np.zeros(1, dtype=IMU_FRAME)
+        self._frame['magic'] = IMU_FRAME_MAGIC
+        self._frame['version'] = IMU_FRAME_VERSION
+        self.seq = 0
+
+    def send(self, xdd=(0.0, 0.0, 9.81), gd=(0.0, 0.0, 0.0), timestamp_us=None):
+        frame = self._frame
+        frame['seq'] = self.seq
+        frame['timestamp_us'] = int(1.0e6 * time.perf_counter()) if timestamp_us is None else timestamp_us
+        frame['xdd'] = xdd
+        frame['gd'] = gd
+        self._sock.sendto(frame, self._address)
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+
+    def stream(self, n_samples, rate=None):
+        # Samples at the given rate, or as fast as possible
+        t_next = time.perf_counter()
+        for i in range(n_samples):
+            self.send(gd=(0.0, 0.0, 1.0e-3 * i))
+            if rate is not None:
+                t_next += 1.0 / rate
+                time.sleep(max(t_next - time.perf_counter(), 0.0))
+
+    def close(self):
+        self._sock.close()
+
+
+class BatchUploader:
+    """
+    Stand-in for the cart's sampler and uploader tasks. The samples are taken at a fixed rate, timestamped from the
+    host's clock, into a queue of `queue_length`; an uploader thread puts them to /batch in batches of up to
+    `batch_size`, or of what arrived within `max_delay` of the first one, over one kept-alive connection to the
+    database at `url`. The samples that find the queue full are dropped, leaving a gap in the sequence numbers.
+    """
+
+    def __init__(self, url, batch_size=25, max_delay=0.1, queue_length=256):
+        parts = urllib.parse.urlsplit(url)
+        self._connection = http.client.HTTPConnection(parts.hostname, parts.port)
+        self._queue = queue.Queue(queue_length)
+        self._frames = np.zeros(batch_size, dtype=IMU_FRAME)
+        self._frames['magic'] = IMU_FRAME_MAGIC
+        self._frames['version'] = IMU_FRAME_VERSION
+        self.max_delay = max_delay
+
+        self.seq = 0
+        self.requests = 0
+        self.dropped = 0
+
+    def stream(self, n_samples, rate):
+        uploader = threading.Thread(target=self._upload_loop)
+        uploader.start()
+
+        t_next = time.perf_counter()
+        for i in range(n_samples):
+            try:
+                self._queue.put_nowait((self.seq, int(1.0e6 * time.perf_counter()), 1.0e-3 * i))
+            except queue.Full:
+                self.dropped += 1
+            self.seq = (self.seq + 1) & 0xFFFFFFFF
+
+            t_next += 1.0 / rate
+            time.sleep(max(t_next - time.perf_counter(), 0.0))
+
+        self._queue.put(None)
+        uploader.join()
+
+    def _upload_loop(self):
+        frames = self._frames
+        done = False
+        while not done:
+            # The first sample of a batch is awaited without limit, the next ones up to the batch deadline
+            sample = self._queue.get()
+            if sample is None:
+                return
+            n = 0
+            deadline = time.perf_counter() + self.max_delay
+            while sample is not None:
+                frames['seq'][n], frames['timestamp_us'][n], gz = sample
+                frames['xdd'][n] = (0.0, 0.0, 9.81)
+                frames['gd'][n] = (0.0, 0.0, gz)
+                n += 1
+                if n == frames.size:
+                    break
+                try:
+                    sample = self._queue.get(timeout=max(deadline - time.perf_counter(), 0.0))
+                except queue.Empty:
+                    break
+                done = sample is None
+
+            self._connection.request('PUT', '/batch.json', json.dumps(encode_batch(frames[:n])))
+            self._connection.getresponse().read()
+            self.requests += 1
+
+    def close(self):
+        self._connection.close()
+
+
+def encode_batch(frames) -> dict:
+    # A batch of IMU_FRAME as the cart uploads it, the counterpart of receiver.decode_batch
+    return {
+        'seq': int(frames['seq'][0]),
+        'n': int(frames.size),
+        'frames': base64.b64encode(frames.tobytes()).decode('ascii'),
+    }
+
+
+def raw_sample_json(t, xdd=(0.0, 0.0, 9.81), gd=(0.0, 0.0, 0.0)) -> dict:
+    # A raw sample as the cart writes it, with its timestamp in milliseconds
+    return {
+        'timestamp': t * 1000.0,
+        'xdd': dict(zip('xyz', xdd)),
+        'gd': dict(zip('xyz', gd)),
+    }
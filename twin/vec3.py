@@ -144,7 +144,7 @@ class Vec3:
         ])
 
     @staticmethod
-    def rotate(vec: Vec3, theta: float, phi: float) -> Vec3:
+    def rotate_matrix(theta: float, phi: float) -> npt.NDArray[float]:
         ct = np.cos(theta)
         st = np.sin(theta)
         cp = np.cos(phi)
@@ -159,7 +159,11 @@ class Vec3:
             [sp, cp, 0],
             [0, 0, 1],
         ])
-        return Vec3(rot_mat_z @ (rot_mat_y @ vec.array))
+        return rot_mat_z @ rot_mat_y
+
+    @staticmethod
+    def rotate(vec: Vec3, theta: float, phi: float) -> Vec3:
+        return Vec3(Vec3.rotate_matrix(theta, phi) @ vec.array)
 
     def _instance_rotate(self, theta: float, phi: float) -> Vec3:
         self.array = Vec3.rotate(self, theta, phi).array
@@ -188,7 +192,7 @@ class Vec3:
         return self
 
     @staticmethod
-    def rotate_cam(vec: Vec3, theta: float, phi: float) -> Vec3:
+    def rotate_cam_matrix(theta: float, phi: float) -> npt.NDArray[float]:
         ct = np.cos(theta)
         st = np.sin(theta)
         cp = np.cos(phi)
@@ -203,7 +207,11 @@ class Vec3:
             [sp, cp, 0],
             [0, 0, 1],
         ])
-        return Vec3(rot_mat_x @ (rot_mat_z @ vec.array))
+        return rot_mat_x @ rot_mat_z
+
+    @staticmethod
+    def rotate_cam(vec: Vec3, theta: float, phi: float) -> Vec3:
+        return Vec3(Vec3.rotate_cam_matrix(theta, phi) @ vec.array)
 
     def _instance_rotate_cam(self, theta: float, phi: float) -> Vec3:
         self.array = Vec3.rotate_cam(self, theta, phi).array